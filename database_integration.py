@@ -3,185 +3,329 @@ Football Data Pipeline - Database Integration
 Speichert API-Daten strukturiert für Trend-Analyse
 """
 
+import hashlib
 import json
 import sqlite3
 try:
     import psycopg2 # type: ignore
 except ImportError:
     psycopg2 = None
-from datetime import datetime, timedelta
+try:
+    import aiosqlite # type: ignore
+except ImportError:
+    aiosqlite = None
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 import os
-from typing import Dict, List, Optional, Any
+import sys
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any, Iterable
 import logging
+try:
+    from ciso8601 import parse_datetime # type: ignore
+except ImportError:
+    def parse_datetime(value: str) -> datetime:
+        """Parse ISO-8601 timestamps with the stdlib (fromisoformat accepts 'Z' since 3.11)"""
+        if sys.version_info < (3, 11) and value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class FootballDatabase:
-    def __init__(self, db_type='sqlite', connection_params=None):
-        """
-        Initialize database connection
-        
-        Args:
-            db_type: 'sqlite' or 'postgresql'
-            connection_params: Dict with connection details
-        """
-        self.db_type = db_type
-        self.connection_params = connection_params or {}
-        self.connection = None
-        self.connect()
+# SQLite-Tuning für den schreiblastigen Ingest (WAL, weniger fsyncs, größerer Page-Cache).
+# WAL legt neben der Datenbank die Dateien *.db-wal und *.db-shm an.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -64000,       # 64 MB
+    'mmap_size': 268435456,     # 256 MB
+}
+
+# Schema einmal beim Import laden (SQLite-Dialekt)
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database_schema.sql')
+try:
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as _schema_file:
+        _SCHEMA_SQL = _schema_file.read()
+except OSError:
+    _SCHEMA_SQL = None
+
+# Naive UTC mit Sekunden, identisch zu SQLite's datetime('now') / CURRENT_TIMESTAMP
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Ingest- und Analyse-Statements an einer Stelle: identischer SQL-Text trifft den Statement-Cache.
+# UPSERTs aktualisieren bestehende Zeilen, statt sie wie INSERT OR REPLACE zu löschen und neu anzulegen.
+_SQL = SimpleNamespace(
+    upsert_team="""
+INSERT INTO teams (id, name, country, updated_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    country = excluded.country,
+    updated_at = excluded.updated_at
+""",
+
+    insert_league="""
+INSERT INTO leagues (id, name, country, season)
+VALUES (?, ?, ?, ?)
+ON CONFLICT DO NOTHING
+""",
+
+    insert_fixture="""
+INSERT INTO fixtures
+    (id, league_id, season, home_team_id, away_team_id, kickoff_utc, venue_name)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO NOTHING
+""",
+
+    # Schreibt eine Odds-Zeile nur, wenn ihr Fingerprint (?13) vom zuletzt gespeicherten abweicht.
+    # Läuft vor upsert_odds_latest, der danach den neuen Fingerprint übernimmt.
+    insert_odds_changed="""
+INSERT INTO odds_history
+    (fixture_id, bookmaker, market_type, home_odds, draw_odds, away_odds,
+     over_odds, under_odds, handicap, total_points, collected_at, collection_phase)
+SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12
+WHERE NOT EXISTS (
+    SELECT 1 FROM odds_history_latest
+    WHERE fixture_id = ?1 AND bookmaker = ?2 AND market_type = ?3 AND fingerprint = ?13
+)
+""",
+
+    # Letzter Fingerprint je (fixture, bookmaker, market); collected_at nur bei Änderung neu
+    upsert_odds_latest="""
+INSERT INTO odds_history_latest (fixture_id, bookmaker, market_type, fingerprint, collected_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(fixture_id, bookmaker, market_type) DO UPDATE SET
+    fingerprint = excluded.fingerprint,
+    collected_at = excluded.collected_at
+WHERE odds_history_latest.fingerprint != excluded.fingerprint
+""",
+
+    upsert_team_stats="""
+INSERT INTO team_statistics
+    (team_id, league_id, season, collection_date, matches_played, wins, draws, losses,
+     goals_for, goals_against, win_percentage)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(team_id, league_id, season, collection_date) DO UPDATE SET
+    matches_played = excluded.matches_played,
+    wins = excluded.wins,
+    draws = excluded.draws,
+    losses = excluded.losses,
+    goals_for = excluded.goals_for,
+    goals_against = excluded.goals_against,
+    win_percentage = excluded.win_percentage
+""",
+
+    insert_h2h="""
+INSERT OR IGNORE INTO head_to_head
+    (home_team_id, away_team_id, fixture_id, home_score, away_score, match_date, league_id)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+""",
+
+    insert_player="""
+INSERT OR IGNORE INTO players (id, name, team_id, position)
+VALUES (?, ?, ?, ?)
+""",
+
+    upsert_lineup="""
+INSERT INTO lineups
+    (fixture_id, team_id, formation, player_id, position, is_starter, is_captain)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fixture_id, team_id, player_id) DO UPDATE SET
+    formation = excluded.formation,
+    position = excluded.position,
+    is_starter = excluded.is_starter,
+    is_captain = excluded.is_captain,
+    collected_at = CURRENT_TIMESTAMP
+""",
+
+    odds_trends="""
+SELECT market_type, collection_phase, home_odds, draw_odds, away_odds,
+       collected_at, bookmaker
+FROM odds_history
+WHERE fixture_id = ?
+ORDER BY market_type, collected_at
+""",
+
+    team_latest_stats="""
+SELECT * FROM team_statistics
+WHERE team_id = ? AND collection_date >= ?
+ORDER BY collection_date DESC LIMIT 1
+""",
     
-    def connect(self):
-        """Establish database connection"""
-        try:
-            if self.db_type == 'sqlite':
-                db_path = self.connection_params.get('database', 'football_data.db')
-                self.connection = sqlite3.connect(db_path)
-                self.connection.row_factory = sqlite3.Row
-                logger.info(f"Connected to SQLite database: {db_path}")
-                
-            elif self.db_type == 'postgresql':
-                if not psycopg2:
-                    raise ImportError("psycopg2 is required for PostgreSQL connections")
-                self.connection = psycopg2.connect(**self.connection_params)
-                logger.info("Connected to PostgreSQL database")
-                
-        except Exception as e:
-            logger.error(f"Database connection failed: {e}")
-            raise
+    # UNION ALL statt OR, damit beide Hälften ihren (team_id, kickoff_utc)-Index nutzen
+    team_recent_fixtures="""
+SELECT f.*, ht.name as home_team, at.name as away_team
+FROM fixtures f
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+WHERE f.home_team_id = ? AND f.kickoff_utc >= ?
+UNION ALL
+SELECT f.*, ht.name as home_team, at.name as away_team
+FROM fixtures f
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+WHERE f.away_team_id = ? AND f.kickoff_utc >= ?
+ORDER BY kickoff_utc DESC
+LIMIT 50
+""",
     
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
-        """Execute query and return results"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            
-            if query.strip().upper().startswith('SELECT'):
-                if self.db_type == 'sqlite':
-                    return [dict(row) for row in cursor.fetchall()]
-                else:
-                    columns = [desc[0] for desc in cursor.description]
-                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
-            else:
-                self.connection.commit()
-                return []
-                
-        except Exception as e:
-            logger.error(f"Query execution failed: {e}")
-            self.connection.rollback()
-            raise
+    team_recent_events="""
+SELECT * FROM team_events
+WHERE team_id = ? AND start_date >= date('now', '-30 days')
+ORDER BY start_date DESC
+""",
     
-    def store_fixture_data(self, fixture_data: Dict, collection_type: str):
+    team_odds_near_date="""
+SELECT oh.*, f.kickoff_utc
+FROM odds_history oh
+JOIN fixtures f ON oh.fixture_id = f.id
+WHERE (f.home_team_id = ? OR f.away_team_id = ?)
+AND date(f.kickoff_utc) BETWEEN date(?) AND date(?, '+7 days')
+""",
+)
+
+def _odds_fingerprint(row: tuple) -> str:
+    """Hash the price/line columns (home_odds .. total_points) and collection_phase of an odds_history row"""
+    # Mit Phase: jede Collection-Phase schreibt mindestens eine Zeile (Dashboard zählt Zeilen je Phase)
+    return hashlib.blake2b(json.dumps(row[3:10] + row[11:12]).encode(), digest_size=8).hexdigest()
+
+class _FixtureIngest:
+    """
+    Turns one collected fixture into the list of (sql, rows) writes shared by
+    FootballDatabase and AsyncFootballDatabase. The _store_* helpers only queue
+    statements; executing and committing them is up to the concrete class.
+    """
+    
+    def _init_ingest_state(self):
+        # Bereits geschriebene Stammdaten dieses Laufs (Teams/Ligen wiederholen sich pro Fixture)
+        self._seen_teams: set = set()
+        self._seen_leagues: set = set()
+    
+    def _forget_seen(self):
+        """Drop cached team/league keys (after rollback or close)"""
+        self._seen_teams.clear()
+        self._seen_leagues.clear()
+    
+    def _mark_seen(self, seen: SimpleNamespace):
+        """Remember the team/league keys of a committed fixture"""
+        self._seen_teams |= seen.teams
+        self._seen_leagues |= seen.leagues
+    
+    def _prepare_fixture_writes(self, fixture_data: Dict, collection_type: str):
         """
-        Store complete fixture data including odds trends
+        Collect all writes for one fixture; returns (fixture_id, [(sql, rows), ...], seen).
+        seen holds the queued team/league keys; pass it to _mark_seen once the writes are committed.
         """
-        try:
-            fixture_info = fixture_data['game_info']
-            api_data = fixture_data['data']
-            
-            # 1. Store/Update Teams
-            home_team_id = self._store_team(fixture_info, 'home')
-            away_team_id = self._store_team(fixture_info, 'away')
-            
-            # 2. Store/Update League
-            league_id = self._store_league(fixture_info)
-            
-            # 3. Store/Update Fixture
-            fixture_id = self._store_fixture(fixture_info, league_id, home_team_id, away_team_id)
-            
-            # 4. Store Odds History
-            if 'odds_early' in api_data or 'odds_team_news' in api_data or 'odds_final' in api_data:
-                self._store_odds_history(fixture_id, api_data, collection_type)
-            
-            # 5. Store Team Statistics  
-            if 'home_team_stats' in api_data:
-                self._store_team_statistics(home_team_id, league_id, api_data['home_team_stats'])
-            if 'away_team_stats' in api_data:
-                self._store_team_statistics(away_team_id, league_id, api_data['away_team_stats'])
-            
-            # 6. Store H2H Data
-            if 'head_to_head' in api_data:
-                self._store_head_to_head(home_team_id, away_team_id, api_data['head_to_head'])
-            
-            # 7. Store Lineups (wenn verfügbar)
-            if 'lineups' in api_data:
-                self._store_lineups(fixture_id, api_data['lineups'])
-            
-            # 8. Detect and store team events (injuries, suspensions)
-            self._detect_team_events(fixture_info, api_data)
-            
-            logger.info(f"✅ Stored {collection_type} data for fixture {fixture_id}")
-            return fixture_id
-            
-        except Exception as e:
-            logger.error(f"❌ Error storing fixture data: {e}")
-            raise
+        fixture_info = fixture_data['game_info']
+        api_data = fixture_data['data']
+        writes: List[tuple] = []
+        seen = SimpleNamespace(teams=set(), leagues=set())
+        
+        # Zeitstempel und Saison einmal pro Fixture bestimmen; now_iso wird direkt als TEXT gebunden
+        now = datetime.now(timezone.utc)
+        now_iso = now.strftime(TIMESTAMP_FORMAT)
+        season = now.year if now.month >= 8 else now.year - 1
+        today = now.date()
+        
+        # 1. Store/Update Teams
+        home_team_id = self._store_team(writes, seen, fixture_info, 'home', now_iso)
+        away_team_id = self._store_team(writes, seen, fixture_info, 'away', now_iso)
+        
+        # 2. Store/Update League
+        league_id = self._store_league(writes, seen, fixture_info, season)
+        
+        # 3. Store/Update Fixture
+        fixture_id = self._store_fixture(writes, fixture_info, league_id, home_team_id, away_team_id, season)
+        
+        # 4. Store Odds History
+        if 'odds_early' in api_data or 'odds_team_news' in api_data or 'odds_final' in api_data:
+            self._store_odds_history(writes, fixture_id, api_data, collection_type, now_iso)
+        
+        # 5. Store Team Statistics  
+        if 'home_team_stats' in api_data:
+            self._store_team_statistics(writes, home_team_id, league_id, api_data['home_team_stats'], season, today)
+        if 'away_team_stats' in api_data:
+            self._store_team_statistics(writes, away_team_id, league_id, api_data['away_team_stats'], season, today)
+        
+        # 6. Store H2H Data
+        if 'head_to_head' in api_data:
+            self._store_head_to_head(writes, home_team_id, away_team_id, api_data['head_to_head'])
+        
+        # 7. Store Lineups (wenn verfügbar)
+        if 'lineups' in api_data:
+            self._store_lineups(writes, fixture_id, api_data['lineups'])
+        
+        # 8. Detect and store team events (injuries, suspensions)
+        self._detect_team_events(fixture_info, api_data)
+        
+        return fixture_id, writes, seen
     
-    def _store_team(self, fixture_info: Dict, team_type: str) -> int:
+    def _store_team(self, writes: list, seen: SimpleNamespace, fixture_info: Dict, team_type: str,
+                    now_iso: str) -> int:
         """Store or update team information"""
         team_id = fixture_info[f'{team_type}_team_id']
         team_name = fixture_info[f'{team_type}_team']
         country = fixture_info.get('country', 'Unknown')
         
-        self.execute_query("""
-            INSERT OR REPLACE INTO teams (id, name, country, updated_at) 
-            VALUES (?, ?, ?, ?)
-        """, (team_id, team_name, country, datetime.now()))
+        # Name/Land sind Teil des Schlüssels, damit Änderungen weiterhin geschrieben werden
+        team_key = (team_id, team_name, country)
+        if team_key in self._seen_teams or team_key in seen.teams:
+            return team_id
+        
+        writes.append((_SQL.upsert_team, [(team_id, team_name, country, now_iso)]))
+        seen.teams.add(team_key)
         
         return team_id
     
-    def _store_league(self, fixture_info: Dict) -> int:
+    def _store_league(self, writes: list, seen: SimpleNamespace, fixture_info: Dict, season: int) -> int:
         """Store or update league information"""
         league_id = fixture_info['league_id']
         league_name = fixture_info['league']
-        season = datetime.now().year if datetime.now().month >= 8 else datetime.now().year - 1
         
-        existing = self.execute_query(
-            "SELECT id FROM leagues WHERE id = ? AND season = ?",
-            (league_id, season)
-        )
+        league_key = (league_id, season)
+        if league_key in self._seen_leagues or league_key in seen.leagues:
+            return league_id
         
-        if not existing:
-            self.execute_query(
-                """INSERT INTO leagues (id, name, country, season) 
-                   VALUES (?, ?, ?, ?)""",
-                (league_id, league_name, fixture_info.get('country', 'Unknown'), season)
-            )
+        # leagues.id ist PRIMARY KEY und (id, season) UNIQUE -> Konflikt ohne Ziel abfangen
+        writes.append((
+            _SQL.insert_league,
+            [(league_id, league_name, fixture_info.get('country', 'Unknown'), season)]
+        ))
+        seen.leagues.add(league_key)
         
         return league_id
     
-    def _store_fixture(self, fixture_info: Dict, league_id: int, home_id: int, away_id: int) -> int:
+    def _store_fixture(self, writes: list, fixture_info: Dict, league_id: int, home_id: int, away_id: int,
+                       season: int) -> int:
         """Store or update fixture"""
         fixture_id = fixture_info['fixture_id']
-        kickoff = datetime.fromisoformat(fixture_info['kickoff_utc'].replace('Z', '+00:00'))
-        season = datetime.now().year if datetime.now().month >= 8 else datetime.now().year - 1
-        
-        existing = self.execute_query(
-            "SELECT id FROM fixtures WHERE id = ?",
-            (fixture_id,)
-        )
+        kickoff = parse_datetime(fixture_info['kickoff_utc'])
         
-        if not existing:
-            self.execute_query(
-                """INSERT INTO fixtures 
-                   (id, league_id, season, home_team_id, away_team_id, kickoff_utc, venue_name)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (fixture_id, league_id, season, home_id, away_id, kickoff, 
-                 fixture_info.get('venue', 'Unknown'))
-            )
+        writes.append((
+            _SQL.insert_fixture,
+            [(fixture_id, league_id, season, home_id, away_id, kickoff, 
+              fixture_info.get('venue', 'Unknown'))]
+        ))
         
         return fixture_id
     
-    def _store_odds_history(self, fixture_id: int, api_data: Dict, collection_type: str):
+    def _store_odds_history(self, writes: list, fixture_id: int, api_data: Dict, collection_type: str, now_iso: str):
         """Store odds with historical tracking"""
+        rows = []
+        bookmaker_count = 0
         odds_keys = [k for k in api_data.keys() if k.startswith('odds_')]
         for odds_key in odds_keys:
             odds_data = api_data[odds_key]
             if not odds_data or 'bookmakers' not in odds_data:
-                logger.warning(f"No odds or bookmakers for key {odds_key} in fixture {fixture_id}")
+                logger.warning("No odds or bookmakers for key %s in fixture %s", odds_key, fixture_id)
                 continue
-            logger.info(f"Odds-Team-Mapping: {odds_data.get('home_team')} vs {odds_data.get('away_team')} (Fixture {fixture_id})")
+            logger.info("Odds-Team-Mapping: %s vs %s (Fixture %s)",
+                        odds_data.get('home_team'), odds_data.get('away_team'), fixture_id)
+            bookmaker_count += len(odds_data['bookmakers'])
             for bookmaker_data in odds_data['bookmakers']:
                 bookmaker = bookmaker_data['title']
                 for market in bookmaker_data.get('markets', []):
@@ -195,72 +339,80 @@ class FootballDatabase:
                         home_odds = outcomes.get(odds_data.get('home_team'))
                         away_odds = outcomes.get(odds_data.get('away_team'))
                         draw_odds = outcomes.get('Draw')
-                        logger.info(f"Storing odds for fixture {fixture_id}, bookmaker {bookmaker}, market {market_type}: home={home_odds}, draw={draw_odds}, away={away_odds}")
+                        logger.debug("Storing odds for fixture %s, bookmaker %s, market %s: home=%s, draw=%s, away=%s",
+                                     fixture_id, bookmaker, market_type, home_odds, draw_odds, away_odds)
                         if home_odds is None or away_odds is None:
-                            logger.warning(f"No odds found for teams: {odds_data.get('home_team')} vs {odds_data.get('away_team')} in fixture {fixture_id} (bookmaker: {bookmaker})")
+                            logger.warning("No odds found for teams: %s vs %s in fixture %s (bookmaker: %s)",
+                                           odds_data.get('home_team'), odds_data.get('away_team'), fixture_id, bookmaker)
                         
                     elif market_type == 'spreads':
-                        for outcome in market['outcomes']:
-                            if outcome['name'] == odds_data['home_team']:
-                                home_odds = outcome['price']
-                                handicap = outcome.get('point')
-                            elif outcome['name'] == odds_data['away_team']:
-                                away_odds = outcome['price']
+                        outcomes = {o['name']: o for o in market['outcomes']}
+                        home = outcomes.get(odds_data['home_team'])
+                        away = outcomes.get(odds_data['away_team'])
+                        if home:
+                            home_odds = home['price']
+                            handicap = home.get('point')
+                        if away:
+                            away_odds = away['price']
                                 
                     elif market_type == 'totals':
-                        for outcome in market['outcomes']:
-                            if outcome['name'] == 'Over':
-                                over_odds = outcome['price']
-                                total_points = outcome.get('point')
-                            elif outcome['name'] == 'Under':
-                                under_odds = outcome['price']
+                        outcomes = {o['name']: o for o in market['outcomes']}
+                        over = outcomes.get('Over')
+                        under = outcomes.get('Under')
+                        if over:
+                            over_odds = over['price']
+                            total_points = over.get('point')
+                        if under:
+                            under_odds = under['price']
                     
-                    # Store in database
-                    self.execute_query(
-                        """INSERT INTO odds_history 
-                           (fixture_id, bookmaker, market_type, home_odds, draw_odds, away_odds,
-                            over_odds, under_odds, handicap, total_points, collected_at, collection_phase)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (fixture_id, bookmaker, market_type, home_odds, draw_odds, away_odds,
-                         over_odds, under_odds, handicap, total_points, datetime.now(), collection_type)
-                    )
-    
-    def _store_team_statistics(self, team_id: int, league_id: int, stats_data: Dict):
+                    rows.append((fixture_id, bookmaker, market_type, home_odds, draw_odds, away_odds,
+                                 over_odds, under_odds, handicap, total_points, now_iso, collection_type))
+        
+        # Unveränderte Quoten zwischen den Collection-Phasen nicht erneut schreiben
+        fingerprints = [_odds_fingerprint(row) for row in rows]
+        
+        # Store in database (single executemany instead of one INSERT per market)
+        writes.append((_SQL.insert_odds_changed, [row + (fp,) for row, fp in zip(rows, fingerprints)]))
+        writes.append((_SQL.upsert_odds_latest,
+                       [row[:3] + (fp, now_iso) for row, fp in zip(rows, fingerprints)]))
+        logger.info("Collected %d odds rows from %d bookmakers for fixture %s",
+                    len(rows), bookmaker_count, fixture_id)
+    
+    def _store_team_statistics(self, writes: list, team_id: int, league_id: int, stats_data: Dict,
+                               season: int, collection_date):
         """Store team statistics with time series"""
         if not stats_data or 'response' not in stats_data:
             return
             
         stats = stats_data['response']
-        season = datetime.now().year if datetime.now().month >= 8 else datetime.now().year - 1
-        collection_date = datetime.now().date()
         
         # Extract relevant statistics
-        fixtures = stats.get('fixtures', {})
-        goals = stats.get('goals', {})
-        
-        self.execute_query(
-            """INSERT OR REPLACE INTO team_statistics
-               (team_id, league_id, season, collection_date, matches_played, wins, draws, losses,
-                goals_for, goals_against, win_percentage)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (team_id, league_id, season, collection_date,
-             fixtures.get('played', {}).get('total', 0),
-             fixtures.get('wins', {}).get('total', 0), 
-             fixtures.get('draws', {}).get('total', 0),
-             fixtures.get('loses', {}).get('total', 0),
-             goals.get('for', {}).get('total', {}).get('total', 0),
-             goals.get('against', {}).get('total', {}).get('total', 0),
-             round((fixtures.get('wins', {}).get('total', 0) / max(fixtures.get('played', {}).get('total', 1), 1)) * 100, 2))
-        )
+        fixtures = stats.get('fixtures') or {}
+        goals = stats.get('goals') or {}
+        
+        played = (fixtures.get('played') or {}).get('total', 0)
+        wins = (fixtures.get('wins') or {}).get('total', 0)
+        draws = (fixtures.get('draws') or {}).get('total', 0)
+        losses = (fixtures.get('loses') or {}).get('total', 0)
+        goals_for = ((goals.get('for') or {}).get('total') or {}).get('total', 0)
+        goals_against = ((goals.get('against') or {}).get('total') or {}).get('total', 0)
+        win_percentage = round(wins / max(played, 1) * 100, 2)
+        
+        writes.append((
+            _SQL.upsert_team_stats,
+            [(team_id, league_id, season, collection_date, played, wins, draws, losses,
+              goals_for, goals_against, win_percentage)]
+        ))
     
-    def _store_head_to_head(self, home_team_id: int, away_team_id: int, h2h_data: Dict):
+    def _store_head_to_head(self, writes: list, home_team_id: int, away_team_id: int, h2h_data: Dict):
         """Store head-to-head history data"""
         if not h2h_data or 'response' not in h2h_data:
             return
             
+        rows = []
         for fixture in h2h_data['response']:
             fixture_id = fixture['fixture']['id']
-            match_date = datetime.fromisoformat(fixture['fixture']['date'][:10])
+            match_date = parse_datetime(fixture['fixture']['date'][:10])
             
             # Get score if available
             home_score = fixture.get('goals', {}).get('home')
@@ -270,66 +422,45 @@ class FootballDatabase:
             historical_home_id = fixture['teams']['home']['id'] 
             historical_away_id = fixture['teams']['away']['id']
             
-            self.execute_query(
-                """INSERT OR IGNORE INTO head_to_head 
-                   (home_team_id, away_team_id, fixture_id, home_score, away_score, 
-                    match_date, league_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (historical_home_id, historical_away_id, fixture_id, 
-                 home_score, away_score, match_date, fixture.get('league', {}).get('id'))
-            )
+            rows.append((historical_home_id, historical_away_id, fixture_id, 
+                         home_score, away_score, match_date, fixture.get('league', {}).get('id')))
+        
+        writes.append((_SQL.insert_h2h, rows))
     
-    def _store_lineups(self, fixture_id: int, lineup_data: Dict):
+    def _store_lineups(self, writes: list, fixture_id: int, lineup_data: Dict):
         """Store lineup information"""
-        if not lineup_data or 'response' not in lineup_data:
+        if not lineup_data or not lineup_data.get('response'):
             return
-            
+        
+        player_rows = []
+        lineup_rows = []
         for lineup in lineup_data['response']:
             team_id = lineup['team']['id']
             formation = lineup.get('formation', 'Unknown')
             
-            # Store starting XI
-            for player in lineup.get('startXI', []):
-                player_id = player['player']['id']
-                player_name = player['player']['name']
-                position = player.get('player', {}).get('pos', 'Unknown')
-                
-                # Store player if not exists
-                self.execute_query(
-                    """INSERT OR IGNORE INTO players (id, name, team_id, position)
-                       VALUES (?, ?, ?, ?)""",
-                    (player_id, player_name, team_id, position)
-                )
-                
-                # Store lineup entry
-                self.execute_query(
-                    """INSERT OR REPLACE INTO lineups 
-                       (fixture_id, team_id, formation, player_id, position, is_starter, is_captain)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (fixture_id, team_id, formation, player_id, position, 1, 
-                     player.get('player', {}).get('captain', False))
-                )
-            
-            # Store substitutes
-            for player in lineup.get('substitutes', []):
-                player_id = player['player']['id']
-                player_name = player['player']['name']
-                position = player.get('player', {}).get('pos', 'Unknown')
-                
-                # Store player if not exists
-                self.execute_query(
-                    """INSERT OR IGNORE INTO players (id, name, team_id, position)
-                       VALUES (?, ?, ?, ?)""",
-                    (player_id, player_name, team_id, position)
-                )
-                
-                # Store lineup entry
-                self.execute_query(
-                    """INSERT OR REPLACE INTO lineups 
-                       (fixture_id, team_id, formation, player_id, position, is_starter)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (fixture_id, team_id, formation, player_id, position, 0)
-                )
+            # Starting XI (is_starter=1) und Ersatzspieler (is_starter=0)
+            for players, is_starter in ((lineup.get('startXI') or [], 1),
+                                        (lineup.get('substitutes') or [], 0)):
+                for player in players:
+                    p = player.get('player') or {}
+                    player_id = p.get('id')
+                    if player_id is None:
+                        continue
+                    position = p.get('pos', 'Unknown')
+                    captain = p.get('captain', False) if is_starter else False
+                    
+                    player_rows.append((player_id, p.get('name'), team_id, position))
+                    lineup_rows.append((fixture_id, team_id, formation, player_id, position,
+                                        is_starter, captain))
+        
+        if not player_rows:
+            return
+        
+        # Store players if not exists
+        writes.append((_SQL.insert_player, player_rows))
+        
+        # Store lineup entries
+        writes.append((_SQL.upsert_lineup, lineup_rows))
     
     def _detect_team_events(self, fixture_info: Dict, api_data: Dict):
         """Detect injuries, suspensions from data changes"""
@@ -354,15 +485,147 @@ class FootballDatabase:
         # - Comparison with previous lineups
         # - Integration with external injury databases
         pass
+
+class FootballDatabase(_FixtureIngest):
+    def __init__(self, db_type='sqlite', connection_params=None, pragmas: Optional[Dict[str, Any]] = None):
+        """
+        Initialize database connection
+        
+        Args:
+            db_type: 'sqlite' or 'postgresql'
+            connection_params: Dict with connection details
+            pragmas: SQLite PRAGMA overrides, merged over SQLITE_PRAGMAS
+        """
+        self.db_type = db_type
+        self.connection_params = connection_params or {}
+        self.pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+        self.connection = None
+        self._in_transaction = False
+        self._cursor = None
+        self._schema_ready = False
+        self._init_ingest_state()
+        self.connect()
+    
+    def connect(self):
+        """Establish database connection"""
+        try:
+            if self.db_type == 'sqlite':
+                db_path = self.connection_params.get('database', 'football_data.db')
+                self.connection = sqlite3.connect(db_path, cached_statements=512)
+                self.connection.row_factory = sqlite3.Row
+                self.connection.executescript(
+                    ''.join(f"PRAGMA {name}={value};" for name, value in self.pragmas.items())
+                )
+                logger.info(f"Connected to SQLite database: {db_path}")
+                
+            elif self.db_type == 'postgresql':
+                if not psycopg2:
+                    raise ImportError("psycopg2 is required for PostgreSQL connections")
+                self.connection = psycopg2.connect(**self.connection_params)
+                logger.info("Connected to PostgreSQL database")
+            
+            # Ein Cursor für alle Statements dieser Verbindung
+            self._cursor = self.connection.cursor()
+            self._schema_ready = False
+                
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            raise
+    
+    def ensure_schema(self):
+        """
+        Create tables, views and indexes from database_schema.sql (once per connection).
+        The schema file is SQLite-only; for PostgreSQL this is a no-op and the schema
+        has to be created separately.
+        """
+        if self._schema_ready:
+            return self
+        if self.db_type != 'sqlite':
+            logger.warning("ensure_schema skipped: database_schema.sql uses the SQLite dialect")
+            return self
+        if _SCHEMA_SQL is None:
+            raise FileNotFoundError(f"Schema file not found: {SCHEMA_PATH}")
+        
+        self.connection.executescript(_SCHEMA_SQL)
+        self._schema_ready = True
+        return self
+    
+    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
+        """Execute query and return results"""
+        try:
+            cursor = self._cursor
+            cursor.execute(query, params or ())
+            
+            if query.strip().upper().startswith('SELECT'):
+                if self.db_type == 'sqlite':
+                    return [dict(row) for row in cursor.fetchall()]
+                else:
+                    columns = [desc[0] for desc in cursor.description]
+                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            else:
+                if not self._in_transaction:
+                    self.connection.commit()
+                return []
+                
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            self.connection.rollback()
+            raise
+    
+    def execute_many(self, query: str, rows: Iterable[tuple]):
+        """Execute a write statement for many parameter rows without committing"""
+        rows = list(rows)
+        if not rows:
+            return
+        
+        # Statements sind SQLite-Dialekt (?-Platzhalter, INSERT OR IGNORE, INSERT ... SELECT)
+        self._cursor.executemany(query, rows)
+    
+    @contextmanager
+    def transaction(self):
+        """Group writes into a single transaction (one commit instead of one per statement)"""
+        if self._in_transaction:
+            yield
+            return
+        
+        self._in_transaction = True
+        try:
+            yield
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            # Zurückgerollte Stammdaten dürfen nicht als geschrieben gelten
+            # (auch Keys aus bereits abgeschlossenen store_fixture_data-Aufrufen einer äußeren Transaktion)
+            self._forget_seen()
+            raise
+        finally:
+            self._in_transaction = False
+    
+    def store_fixture_data(self, fixture_data: Dict, collection_type: str):
+        """
+        Store complete fixture data including odds trends
+        """
+        try:
+            fixture_id, writes, seen = self._prepare_fixture_writes(fixture_data, collection_type)
+            
+            # Ein Commit pro Fixture statt pro Statement
+            with self.transaction():
+                for query, rows in writes:
+                    self.execute_many(query, rows)
+            # Erst nach dem Commit als geschrieben merken
+            self._mark_seen(seen)
+            
+            logger.info(f"✅ Stored {collection_type} data for fixture {fixture_id}")
+            return fixture_id
+            
+        except Exception as e:
+            logger.error(f"❌ Error storing fixture data: {e}")
+            raise
     
     def get_odds_trends(self, fixture_id: int) -> List[Dict]:
         """Get odds movement for a specific fixture"""
         return self.execute_query(
-            """SELECT market_type, collection_phase, home_odds, draw_odds, away_odds, 
-                      collected_at, bookmaker
-               FROM odds_history 
-               WHERE fixture_id = ? 
-               ORDER BY market_type, collected_at""",
+            _SQL.odds_trends,
             (fixture_id,)
         )
     
@@ -371,21 +634,13 @@ class FootballDatabase:
         cutoff_date = datetime.now().date() - timedelta(days=days)
         
         stats = self.execute_query(
-            """SELECT * FROM team_statistics 
-               WHERE team_id = ? AND collection_date >= ?
-               ORDER BY collection_date DESC LIMIT 1""",
+            _SQL.team_latest_stats,
             (team_id, cutoff_date)
         )
         
         recent_fixtures = self.execute_query(
-            """SELECT f.*, ht.name as home_team, at.name as away_team
-               FROM fixtures f
-               JOIN teams ht ON f.home_team_id = ht.id
-               JOIN teams at ON f.away_team_id = at.id  
-               WHERE (f.home_team_id = ? OR f.away_team_id = ?) 
-               AND f.kickoff_utc >= ?
-               ORDER BY f.kickoff_utc DESC""",
-            (team_id, team_id, cutoff_date)
+            _SQL.team_recent_fixtures,
+            (team_id, cutoff_date, team_id, cutoff_date)
         )
         
         return {
@@ -397,9 +652,7 @@ class FootballDatabase:
     def get_event_impact_analysis(self, team_id: int) -> Dict:
         """Analyze how team events correlate with odds movements"""
         events = self.execute_query(
-            """SELECT * FROM team_events 
-               WHERE team_id = ? AND start_date >= date('now', '-30 days')
-               ORDER BY start_date DESC""",
+            _SQL.team_recent_events,
             (team_id,)
         )
         
@@ -407,11 +660,7 @@ class FootballDatabase:
         impact_analysis = []
         for event in events:
             nearby_odds = self.execute_query(
-                """SELECT oh.*, f.kickoff_utc
-                   FROM odds_history oh
-                   JOIN fixtures f ON oh.fixture_id = f.id  
-                   WHERE (f.home_team_id = ? OR f.away_team_id = ?)
-                   AND date(f.kickoff_utc) BETWEEN date(?) AND date(?, '+7 days')""",
+                _SQL.team_odds_near_date,
                 (team_id, team_id, event['start_date'], event['start_date'])
             )
             
@@ -427,10 +676,104 @@ class FootballDatabase:
     
     def close(self):
         """Close database connection"""
+        self._forget_seen()
         if self.connection:
             self.connection.close()
             logger.info("Database connection closed")
 
+class AsyncFootballDatabase(_FixtureIngest):
+    """
+    asyncio variant of the SQLite ingest path on one shared aiosqlite connection.
+    Commits run off the event loop, so callers can overlap them with API fetches.
+    The synchronous FootballDatabase stays the default for GitHub Actions.
+    """
+    
+    def __init__(self, connection_params=None, pragmas: Optional[Dict[str, Any]] = None):
+        if not aiosqlite:
+            raise ImportError("aiosqlite is required for AsyncFootballDatabase")
+        self.connection_params = connection_params or {}
+        self.pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+        self.connection = None
+        # SQLite erlaubt nur einen Schreiber: Transaktionen auf der geteilten Verbindung serialisieren
+        self._write_lock = asyncio.Lock()
+        self._schema_ready = False
+        self._init_ingest_state()
+    
+    async def connect(self):
+        """Open the shared aiosqlite connection"""
+        db_path = self.connection_params.get('database', 'football_data.db')
+        self.connection = await aiosqlite.connect(db_path, cached_statements=512)
+        self.connection.row_factory = sqlite3.Row
+        await self.connection.executescript(
+            ''.join(f"PRAGMA {name}={value};" for name, value in self.pragmas.items())
+        )
+        logger.info(f"Connected to SQLite database (async): {db_path}")
+        return self
+    
+    async def ensure_schema(self):
+        """Create tables, views and indexes from database_schema.sql (once per connection)"""
+        if self._schema_ready:
+            return self
+        if _SCHEMA_SQL is None:
+            raise FileNotFoundError(f"Schema file not found: {SCHEMA_PATH}")
+        
+        await self.connection.executescript(_SCHEMA_SQL)
+        self._schema_ready = True
+        return self
+    
+    async def __aenter__(self):
+        return await self.connect()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
+        """Execute a read query and return results"""
+        async with self.connection.execute(query, params or ()) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+    
+    async def store_fixture_data(self, fixture_data: Dict, collection_type: str):
+        """
+        Store complete fixture data including odds trends (one transaction per fixture)
+        """
+        try:
+            # Vorbereiten und Schreiben unter demselben Lock: nebenläufige Tasks sehen den
+            # _seen_*-Cache nur mit Keys, deren Transaktion bereits committed ist
+            async with self._write_lock:
+                fixture_id, writes, seen = self._prepare_fixture_writes(fixture_data, collection_type)
+                try:
+                    for query, rows in writes:
+                        if rows:
+                            await self.connection.executemany(query, rows)
+                    await self.connection.commit()
+                except Exception:
+                    await self.connection.rollback()
+                    raise
+                # Erst nach dem Commit als geschrieben merken
+                self._mark_seen(seen)
+            
+            logger.info(f"✅ Stored {collection_type} data for fixture {fixture_id}")
+            return fixture_id
+            
+        except Exception as e:
+            logger.error(f"❌ Error storing fixture data: {e}")
+            raise
+    
+    async def get_odds_trends(self, fixture_id: int) -> List[Dict]:
+        """Get odds movement for a specific fixture"""
+        return await self.execute_query(
+            _SQL.odds_trends,
+            (fixture_id,)
+        )
+    
+    async def close(self):
+        """Close database connection"""
+        self._forget_seen()
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+            logger.info("Database connection closed")
+
 # Integration in GitHub Actions Workflow
 def integrate_with_workflow():
     """
@@ -449,7 +792,7 @@ def integrate_with_workflow():
         # 'password': os.getenv('DB_PASSWORD')
     }
     
-    db = FootballDatabase('sqlite', db_config)
+    db = FootballDatabase('sqlite', db_config).ensure_schema()
     
     try:
         # Store in database
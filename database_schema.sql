@@ -60,6 +60,17 @@ CREATE TABLE IF NOT EXISTS odds_history (
     FOREIGN KEY (fixture_id) REFERENCES fixtures(id)
 );
 
+-- Letzter Quoten-Fingerprint je Fixture/Bookmaker/Markt (verhindert doppelte odds_history-Zeilen)
+CREATE TABLE IF NOT EXISTS odds_history_latest (
+    fixture_id INTEGER NOT NULL,
+    bookmaker TEXT NOT NULL,
+    market_type TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    collected_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (fixture_id, bookmaker, market_type),
+    FOREIGN KEY (fixture_id) REFERENCES fixtures(id)
+);
+
 -- Team Statistics (für Performance-Analyse)
 CREATE TABLE IF NOT EXISTS team_statistics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -176,4 +187,129 @@ CREATE INDEX IF NOT EXISTS idx_odds_collection_phase ON odds_history(collection_
 CREATE INDEX IF NOT EXISTS idx_team_stats_date ON team_statistics(collection_date);
 CREATE INDEX IF NOT EXISTS idx_team_events ON team_events(team_id, event_type, start_date);
 CREATE INDEX IF NOT EXISTS idx_events_detected ON team_events(detected_at);
-CREATE INDEX IF NOT EXISTS idx_h2h ON head_to_head(home_team_id, away_team_id, match_date);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_h2h ON head_to_head(home_team_id, away_team_id, match_date);
+
+-- Indizes für die Analyse-Abfragen (get_odds_trends nutzt idx_odds_fixture)
+CREATE INDEX IF NOT EXISTS idx_team_stats_team_date ON team_statistics(team_id, collection_date DESC);
+CREATE INDEX IF NOT EXISTS idx_fixtures_home_kickoff ON fixtures(home_team_id, kickoff_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_fixtures_away_kickoff ON fixtures(away_team_id, kickoff_utc DESC);
+-- Dashboard: Teams/Spiele je Liga (get_teams, get_leagues)
+CREATE INDEX IF NOT EXISTS idx_fixtures_league ON fixtures(league_id);
+CREATE INDEX IF NOT EXISTS idx_team_events_start ON team_events(team_id, start_date DESC);
+-- Dashboard Event Impact: event_type = ? AND detected_at >= ... ORDER BY detected_at DESC
+CREATE INDEX IF NOT EXISTS idx_team_events_type_detected ON team_events(event_type, detected_at DESC);
+
+-- Quotenbewegungen (Discord-Bot): GROUP BY fixture/bookmaker/markt und die Erst-/Letzt-Quote
+-- per Gleichheitssuche, ohne temporären B-Tree
+CREATE INDEX IF NOT EXISTS idx_odds_fixture_bookmaker ON odds_history(fixture_id, bookmaker, market_type, collected_at);
+
+-- Präfix-Suche nach Teamnamen (LIKE 'foo%' ist case-insensitive und nutzt nur einen NOCASE-Index)
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name COLLATE NOCASE);
+
+-- Volltext-Index über Teamnamen (Discord-Bot: !fb odds/trends/form per Präfix-Token-Suche).
+-- External Content: Trigger halten teams_fts synchron, Bestandsdaten übernimmt Migration 3
+CREATE VIRTUAL TABLE IF NOT EXISTS teams_fts USING fts5(
+    name, content='teams', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS teams_fts_insert AFTER INSERT ON teams BEGIN
+    INSERT INTO teams_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS teams_fts_delete AFTER DELETE ON teams BEGIN
+    INSERT INTO teams_fts(teams_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+-- Team-UPSERTs setzen name bei jedem Lauf; nur echte Umbenennungen neu indexieren
+CREATE TRIGGER IF NOT EXISTS teams_fts_update AFTER UPDATE OF name ON teams
+WHEN old.name IS NOT new.name BEGIN
+    INSERT INTO teams_fts(teams_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO teams_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+-- Letzte Statistik je Team (Dashboard: Live Games, Team Analysis): ein PK-Lookup statt
+-- ORDER BY collection_date DESC LIMIT 1. Trigger auf den Stats-UPSERT halten die Tabelle aktuell
+CREATE TABLE IF NOT EXISTS team_latest_stats (
+    team_id INTEGER PRIMARY KEY,
+    collection_date DATE NOT NULL,
+    matches_played INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    win_percentage REAL,
+    FOREIGN KEY (team_id) REFERENCES teams(id)
+);
+CREATE TRIGGER IF NOT EXISTS team_latest_stats_insert AFTER INSERT ON team_statistics BEGIN
+    INSERT INTO team_latest_stats
+        (team_id, collection_date, matches_played, goals_for, goals_against, win_percentage)
+    VALUES (new.team_id, new.collection_date, new.matches_played, new.goals_for,
+            new.goals_against, new.win_percentage)
+    ON CONFLICT(team_id) DO UPDATE SET
+        collection_date = excluded.collection_date,
+        matches_played = excluded.matches_played,
+        goals_for = excluded.goals_for,
+        goals_against = excluded.goals_against,
+        win_percentage = excluded.win_percentage
+    WHERE excluded.collection_date >= team_latest_stats.collection_date;
+END;
+CREATE TRIGGER IF NOT EXISTS team_latest_stats_update AFTER UPDATE ON team_statistics BEGIN
+    INSERT INTO team_latest_stats
+        (team_id, collection_date, matches_played, goals_for, goals_against, win_percentage)
+    VALUES (new.team_id, new.collection_date, new.matches_played, new.goals_for,
+            new.goals_against, new.win_percentage)
+    ON CONFLICT(team_id) DO UPDATE SET
+        collection_date = excluded.collection_date,
+        matches_played = excluded.matches_played,
+        goals_for = excluded.goals_for,
+        goals_against = excluded.goals_against,
+        win_percentage = excluded.win_percentage
+    WHERE excluded.collection_date >= team_latest_stats.collection_date;
+END;
+-- Bestandsdaten einmalig übernehmen (danach ist die Tabelle nie leer, solange es Stats gibt)
+INSERT INTO team_latest_stats
+    (team_id, collection_date, matches_played, goals_for, goals_against, win_percentage)
+SELECT team_id, collection_date, matches_played, goals_for, goals_against, win_percentage
+FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY collection_date DESC) as rn
+    FROM team_statistics
+)
+WHERE rn = 1 AND NOT EXISTS (SELECT 1 FROM team_latest_stats);
+
+-- Einmalige Datenmigrationen: das Schema läuft bei jedem Workflow-Lauf und in ensure_schema,
+-- PRAGMA user_version merkt sich den erreichten Stand (siehe Dateiende). Die Versionsbedingung
+-- ist konstant und wird vor dem Tabellen-Scan geprüft, erledigte Migrationen kosten nichts.
+
+-- Migration 1: ältere Läufe (INSERT OR REPLACE ohne Schlüssel) haben Lineups pro Phase doppelt
+-- gespeichert; jeweils nur die zuletzt geschriebene Zeile behalten, sonst schlägt der
+-- UNIQUE-Index unten fehl
+DELETE FROM lineups
+WHERE (SELECT user_version FROM pragma_user_version) < 1
+AND rowid NOT IN (
+    SELECT MAX(rowid) FROM lineups
+    GROUP BY fixture_id, team_id, player_id
+)
+AND player_id IS NOT NULL;
+
+-- Migration 2: Zeitstempel auf ein Format bringen, naive UTC mit Sekunden wie CURRENT_TIMESTAMP.
+-- Ältere Ingests schrieben Mikrosekunden (naive Zeit des UTC-Runners) bzw. '+00:00'-Offsets
+UPDATE odds_history SET collected_at = datetime(collected_at)
+WHERE (SELECT user_version FROM pragma_user_version) < 2
+AND collected_at GLOB '*[.+T]*' AND datetime(collected_at) IS NOT NULL;
+UPDATE odds_history_latest SET collected_at = datetime(collected_at)
+WHERE (SELECT user_version FROM pragma_user_version) < 2
+AND collected_at GLOB '*[.+T]*' AND datetime(collected_at) IS NOT NULL;
+UPDATE teams SET updated_at = datetime(updated_at)
+WHERE (SELECT user_version FROM pragma_user_version) < 2
+AND updated_at GLOB '*[.+T]*' AND datetime(updated_at) IS NOT NULL;
+
+-- Migration 3: teams_fts einmalig aus teams füllen (danach halten die Trigger den Index aktuell)
+INSERT INTO teams_fts(teams_fts)
+SELECT 'rebuild' WHERE (SELECT user_version FROM pragma_user_version) < 3;
+
+-- Konfliktziel für Lineup-UPSERTs (ON CONFLICT(fixture_id, team_id, player_id))
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lineups_player ON lineups(fixture_id, team_id, player_id);
+
+-- Statistiken für den Query-Planer aktualisieren: optimize analysiert nur Tabellen, deren
+-- Statistik fehlt oder veraltet ist (nicht bei jedem Lauf die ganze Datenbank wie ANALYZE),
+-- analysis_limit begrenzt die Stichprobe je Index
+PRAGMA analysis_limit = 400;
+PRAGMA optimize;
+
+-- Stand der einmaligen Migrationen (bei einer neuen Migration erhöhen)
+PRAGMA user_version = 3;
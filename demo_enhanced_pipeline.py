@@ -6,24 +6,21 @@ Demonstrates the improved API mapping and database integration
 
 import os
 import json
-import sqlite3
+import asyncio
 from datetime import datetime
 from enhanced_mapping import EnhancedTeamMapper, collect_odds_data_enhanced
-from database_integration import FootballDatabase
+from database_integration import FootballDatabase, AsyncFootballDatabase
 
 def setup_demo_database():
     """Initialize demo database with schema"""
     print("🔧 Setting up demo database...")
     
     os.makedirs('data', exist_ok=True)
-    conn = sqlite3.connect('data/demo_football.db')
     
-    # Load and execute schema
-    with open('database_schema.sql', 'r') as f:
-        schema = f.read()
-    
-    conn.executescript(schema)
-    conn.close()
+    # Schema is loaded once by database_integration at import time
+    db = FootballDatabase('sqlite', {'database': 'data/demo_football.db'})
+    db.ensure_schema()
+    db.close()
     print("✅ Demo database initialized")
 
 def demo_enhanced_mapping():
@@ -67,19 +64,12 @@ def demo_enhanced_mapping():
     
     return mapper
 
-def demo_database_integration():
-    """Demonstrate database integration capabilities"""
-    print("\n💾 Database Integration Demo")
-    print("=" * 50)
-    
-    # Initialize database
-    db = FootballDatabase('sqlite', {'database': 'data/demo_football.db'})
-    
-    # Create sample fixture data
-    sample_fixture = {
-        'fixture_id': 999999,
+def build_sample_fixture(fixture_id: int = 999999):
+    """Sample collected fixture (Manchester United vs Liverpool) for the demos"""
+    return {
+        'fixture_id': fixture_id,
         'game_info': {
-            'fixture_id': 999999,
+            'fixture_id': fixture_id,
             'home_team': 'Manchester United',
             'away_team': 'Liverpool',
             'home_team_id': 33,
@@ -112,6 +102,17 @@ def demo_database_integration():
             }
         }
     }
+
+def demo_database_integration():
+    """Demonstrate database integration capabilities"""
+    print("\n💾 Database Integration Demo")
+    print("=" * 50)
+    
+    # Initialize database
+    db = FootballDatabase('sqlite', {'database': 'data/demo_football.db'})
+    
+    # Create sample fixture data
+    sample_fixture = build_sample_fixture()
     
     # Store fixture data
     fixture_id = db.store_fixture_data(sample_fixture, 'demo_data')
@@ -128,6 +129,34 @@ def demo_database_integration():
     db.close()
     return fixture_id
 
+async def demo_async_database_integration(fixture_count: int = 20):
+    """Demonstrate concurrent ingest on one shared aiosqlite connection"""
+    print("\n⚡ Async Database Integration Demo")
+    print("=" * 50)
+    
+    # AsyncFootballDatabase meldet fehlendes aiosqlite selbst per ImportError
+    try:
+        async_db = AsyncFootballDatabase({'database': 'data/demo_football.db'})
+    except ImportError as e:
+        print(f"ℹ️ {e} - skipping async demo")
+        return
+    
+    # Begrenzte Parallelität: API-Fetches überlappen, Commits laufen seriell
+    semaphore = asyncio.Semaphore(8)
+    
+    async with async_db as db:
+        async def fetch_and_store(fixture_id):
+            async with semaphore:
+                # In production the API fetch for this fixture would be awaited here
+                return await db.store_fixture_data(build_sample_fixture(fixture_id), 'demo_data')
+        
+        fixture_ids = range(900000, 900000 + fixture_count)
+        results = await asyncio.gather(*(fetch_and_store(f) for f in fixture_ids),
+                                       return_exceptions=True)
+    
+    stored = [r for r in results if not isinstance(r, Exception)]
+    print(f"✅ Stored {len(stored)}/{fixture_count} demo fixtures concurrently")
+
 def demo_mapping_reports(mapper):
     """Demonstrate mapping performance reporting"""
     print("\n📋 Mapping Performance Report")
@@ -208,6 +237,7 @@ def main():
     
     # Demo database integration
     fixture_id = demo_database_integration()
+    asyncio.run(demo_async_database_integration())
     
     # Demo reporting
     demo_mapping_reports(mapper)
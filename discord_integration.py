@@ -14,18 +14,218 @@ except ImportError:
     commands = None
     tasks = None
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List
 import sqlite3
 try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    PLOTTING_AVAILABLE = True
+    import aiosqlite
 except ImportError:
-    PLOTTING_AVAILABLE = False
+    aiosqlite = None
+import importlib.util
+# matplotlib/numpy erst beim ersten Chart laden (Import kostet ~300ms und viel RSS)
+PLOTTING_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
 import io
+import json
 import os
+from pathlib import Path
+import queue
+import threading
+import time
+from types import MappingProxyType, SimpleNamespace
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Der Bot liest nur (Verbindungen mit mode=ro): WAL-Modus und synchronous setzt die Pipeline
+# (database_integration.SQLITE_PRAGMAS), hier nur die Lese-PRAGMAs
+SQLITE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY; PRAGMA cache_size=-64000; PRAGMA mmap_size=268435456;"
+)
+
+# Team-Suche: Token-Präfixe über den FTS5-Index teams_fts, LIKE über teams als Fallback
+_TEAM_IDS_FTS = "SELECT rowid FROM teams_fts WHERE teams_fts MATCH ?1"
+_TEAM_IDS_LIKE = "SELECT id FROM teams WHERE name LIKE ?1"
+
+def _team_search(template: str) -> SimpleNamespace:
+    """FTS and LIKE variants of a query whose {team_ids} subquery selects the searched teams"""
+    return SimpleNamespace(fts=template.format(team_ids=_TEAM_IDS_FTS),
+                           like=template.format(team_ids=_TEAM_IDS_LIKE))
+
+def _fts_query(team_name: str) -> str:
+    """FTS5 expression: every word of the input must start a word of the team name"""
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in team_name.split())
+
+# Feste SQL-Texte der Bot-Abfragen (sqlite3 cached das vorbereitete Statement je Text)
+_SQL = SimpleNamespace(
+    games_starting_soon="""
+SELECT f.*, CAST(strftime('%s', f.kickoff_utc) AS INTEGER) AS kickoff_ts,
+       ht.name as home_team, at.name as away_team, l.name as league
+FROM fixtures f
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+JOIN leagues l ON f.league_id = l.id
+WHERE f.kickoff_utc BETWEEN datetime('now', '+90 minutes')
+                        AND datetime('now', '+120 minutes')
+AND f.kickoff_utc >= datetime('now')
+ORDER BY f.kickoff_utc ASC
+""",
+
+    latest_h2h_odds="""
+SELECT * FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY fixture_id ORDER BY collected_at DESC) AS rn
+    FROM odds_history
+    WHERE fixture_id IN (SELECT value FROM json_each(?)) AND market_type = 'h2h'
+) WHERE rn = 1
+""",
+
+    upcoming_games="""
+SELECT f.*, CAST(strftime('%s', f.kickoff_utc) AS INTEGER) AS kickoff_ts,
+       ht.name as home_team, at.name as away_team, l.name as league
+FROM fixtures f
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+JOIN leagues l ON f.league_id = l.id
+WHERE f.kickoff_utc BETWEEN datetime('now') AND datetime('now', ?)
+ORDER BY f.kickoff_utc
+LIMIT 10
+""",
+
+    next_game_odds=_team_search("""
+WITH g AS (
+    SELECT f.*, CAST(strftime('%s', f.kickoff_utc) AS INTEGER) AS kickoff_ts,
+           ht.name as home_team, at.name as away_team, l.name as league
+    FROM fixtures f
+    JOIN teams ht ON f.home_team_id = ht.id
+    JOIN teams at ON f.away_team_id = at.id
+    JOIN leagues l ON f.league_id = l.id
+    WHERE (f.home_team_id IN ({team_ids}) OR f.away_team_id IN ({team_ids}))
+    AND f.kickoff_utc > datetime('now')
+    ORDER BY f.kickoff_utc
+    LIMIT 1
+)
+SELECT g.*, oh.bookmaker, oh.collection_phase, oh.market_type,
+       oh.home_odds, oh.draw_odds, oh.away_odds
+FROM g
+LEFT JOIN odds_history oh ON oh.fixture_id = g.id AND oh.market_type = 'h2h'
+ORDER BY oh.collected_at DESC
+LIMIT 3
+"""),
+
+    next_game_odds_series=_team_search("""
+WITH g AS (
+    SELECT f.*, ht.name as home_team, at.name as away_team
+    FROM fixtures f
+    JOIN teams ht ON f.home_team_id = ht.id
+    JOIN teams at ON f.away_team_id = at.id
+    WHERE (f.home_team_id IN ({team_ids}) OR f.away_team_id IN ({team_ids}))
+    AND f.kickoff_utc > datetime('now')
+    ORDER BY f.kickoff_utc LIMIT 1
+)
+SELECT g.*, strftime('%Y-%m-%dT%H:%M:%S', oh.collected_at) AS ts,
+       oh.home_odds, oh.away_odds, oh.bookmaker
+FROM g
+LEFT JOIN odds_history oh ON oh.fixture_id = g.id AND oh.market_type = 'h2h'
+                         AND oh.home_odds IS NOT NULL
+ORDER BY oh.collected_at
+"""),
+
+    odds_movements="""
+WITH recent_keys AS (
+    SELECT DISTINCT fixture_id, bookmaker, market_type
+    FROM odds_history
+    WHERE fixture_id IN (SELECT id FROM fixtures WHERE kickoff_utc > datetime('now'))
+    AND collected_at >= datetime('now', '-1 hour')
+),
+-- odds_history bekommt nur bei Änderungen eine Zeile: die Reihe beginnt deshalb mit der
+-- letzten Zeile vor dem Fenster, damit auch ein älterer Vorpreis verglichen wird
+series AS (
+    SELECT oh.id, oh.fixture_id, oh.bookmaker, oh.market_type,
+           oh.home_odds, oh.draw_odds, oh.away_odds, oh.collection_phase, oh.collected_at,
+           LAG(oh.home_odds) OVER w AS prev_home_odds,
+           LAG(oh.away_odds) OVER w AS prev_away_odds
+    FROM recent_keys k
+    JOIN odds_history oh ON oh.fixture_id = k.fixture_id AND oh.bookmaker = k.bookmaker
+                        AND oh.market_type = k.market_type
+    WHERE oh.collected_at >= COALESCE(
+        (SELECT MAX(h.collected_at) FROM odds_history h
+         WHERE h.fixture_id = k.fixture_id AND h.bookmaker = k.bookmaker
+         AND h.market_type = k.market_type AND h.collected_at < datetime('now', '-1 hour')),
+        datetime('now', '-1 hour'))
+    -- Aufeinanderfolgende Zeilen vergleichen (wie zuvor LAG): auch eine innerhalb der Stunde
+    -- zurückgenommene Spitze löst einen Alert aus; doppelte Zeilen eines Batches ergeben 0 %
+    WINDOW w AS (PARTITION BY oh.fixture_id, oh.bookmaker, oh.market_type
+                 ORDER BY oh.collected_at, oh.id)
+),
+moves AS (
+    SELECT *,
+           (home_odds - prev_home_odds) * 100.0 / NULLIF(prev_home_odds, 0) AS home_change,
+           (away_odds - prev_away_odds) * 100.0 / NULLIF(prev_away_odds, 0) AS away_change
+    FROM series
+    WHERE collected_at >= datetime('now', '-1 hour')
+    -- Nur Zeilen nach dem letzten Alert-Stand (?1) bis zum aktuellen Stand (?2) melden
+    AND id > ?1 AND id <= ?2
+)
+SELECT m.*, f.kickoff_utc, ht.name as home_team, at.name as away_team
+FROM moves m
+JOIN fixtures f ON m.fixture_id = f.id
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+WHERE ABS(m.home_change) > 10 OR ABS(m.away_change) > 10
+ORDER BY m.collected_at DESC
+LIMIT 10
+""",
+
+    # Alert-Stand: Zeilen bis zu dieser ID gelten als gemeldet
+    max_odds_id="SELECT COALESCE(MAX(id), 0) AS max_id FROM odds_history",
+
+    team_with_stats=_team_search("""
+SELECT t.id, t.name, s.team_id AS stats_id, s.matches_played, s.win_percentage,
+       s.goals_for, s.goals_against
+FROM teams t
+LEFT JOIN team_latest_stats s ON s.team_id = t.id
+WHERE t.id IN ({team_ids}) LIMIT 1
+"""),
+
+    # Nur die Spalten, die der Form-String braucht
+    team_recent_fixtures="""
+SELECT ht.name as home_team, at.name as away_team,
+    CASE
+        WHEN f.home_team_id = ? THEN 'home'
+        ELSE 'away'
+    END as venue
+FROM fixtures f
+JOIN teams ht ON f.home_team_id = ht.id
+JOIN teams at ON f.away_team_id = at.id
+WHERE (f.home_team_id = ? OR f.away_team_id = ?)
+AND f.kickoff_utc <= datetime('now')
+AND f.status != 'scheduled'
+ORDER BY f.kickoff_utc DESC LIMIT 5
+"""
+)
+
+# Offene sqlite3-Verbindungen für Abfragen, wenn aiosqlite fehlt
+DB_POOL_SIZE = 4
+
+# Team-Form ändert sich nur wenige Male am Tag
+FORM_CACHE_TTL = 300  # Sekunden
+FORM_CACHE_SIZE = 128
+
+# Gleichzeitige channel.send-Aufrufe (Discord: global 50 Requests/Sekunde)
+BROADCAST_CONCURRENCY = 10
+
+# Embed-Konstanten einmal auf Modulebene statt pro Alert
+INJURY_SEVERITY_COLORS = MappingProxyType({
+    'minor': 0xffff00,
+    'major': 0xff9900,
+    'season_ending': 0xff0000
+})
 
 if DISCORD_AVAILABLE:
     class FootballDiscordBot(commands.Bot):
@@ -34,52 +234,314 @@ if DISCORD_AVAILABLE:
             intents.message_content = True
             super().__init__(command_prefix='!fb ', intents=intents)
             self.database_path = database_path
-            self.notification_channels = {}
-            self.user_subscriptions = {}
+            # Nur-Lese-URI: keine Schreibsperren gegen die Pipeline, kein leeres DB-File bei falschem Pfad
+            self.database_uri = Path(database_path).resolve().as_uri() + '?mode=ro'
+            # Kanal-Konfiguration überlebt Neustarts (liegt neben der Datenbank)
+            self.channels_path = os.path.join(os.path.dirname(database_path), 'notification_channels.json')
+            self.notification_channels = self._load_notification_channels()
+            self._channel_snapshot = {}
+            # user_id -> frozenset der Präferenzen (O(1) für 'odds' in prefs)
+            self.subscriptions_path = os.path.join(os.path.dirname(database_path), 'user_subscriptions.json')
+            self.user_subscriptions = self._load_user_subscriptions()
+            self.db = None
+            self._odds_data_version = None
+            # Höchste bereits gemeldete odds_history.id (None bis zum ersten Tick)
+            self._odds_alerted_id = None
+            self.http_session = None
+            self.conn = None
+            self._conn_lock = threading.Lock()
+            # Verbindungs-Pool für Abfragen ohne aiosqlite (Verbindungen werden bei Bedarf geöffnet)
+            self._pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+            self._pool_opened = 0
+            self._pool_lock = threading.Lock()
+            # Eigene Worker für Abfragen: so viele Threads wie Pool-Verbindungen, damit kein
+            # Thread auf eine freie Verbindung wartet und Chart-Rendering nicht blockiert
+            self._db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix='fb-db')
+            # team_id -> (monotonic timestamp, embed.to_dict()) für !fb form
+            self._form_cache: Dict[int, tuple] = {}
+            # Begrenzt den Fan-out aller Alerts zusammen, nicht pro Alert
+            self._send_semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+        def _load_notification_channels(self) -> Dict[int, Dict[str, int]]:
+            """Load the guild -> {alert_type: channel_id} map saved by !fb setup"""
+            try:
+                with open(self.channels_path, 'r', encoding='utf-8') as f:
+                    return {int(guild_id): channels for guild_id, channels in json.load(f).items()}
+            except FileNotFoundError:
+                return {}
+            except (OSError, ValueError) as e:
+                print(f"Could not load notification channels: {e}")
+                return {}
+
+        def _save_notification_channels(self):
+            with open(self.channels_path, 'w', encoding='utf-8') as f:
+                json.dump(self.notification_channels, f, indent=2)
+
+        def _load_user_subscriptions(self) -> Dict[int, frozenset]:
+            """Load the user -> preferences map saved by !fb subscribe"""
+            try:
+                with open(self.subscriptions_path, 'r', encoding='utf-8') as f:
+                    return {int(user_id): frozenset(prefs) for user_id, prefs in json.load(f).items()}
+            except FileNotFoundError:
+                return {}
+            except (OSError, ValueError) as e:
+                print(f"Could not load user subscriptions: {e}")
+                return {}
+
+        def _save_user_subscriptions(self):
+            with open(self.subscriptions_path, 'w', encoding='utf-8') as f:
+                json.dump({user_id: sorted(prefs) for user_id, prefs in self.user_subscriptions.items()},
+                          f, indent=2)
+
+        def _refresh_channel_snapshot(self):
+            """Resolve configured channel ids once into per-alert-type tuples of channel objects"""
+            snapshot = {}
+            for channels in self.notification_channels.values():
+                for alert_type, channel_id in channels.items():
+                    channel = self.get_channel(channel_id)
+                    if channel:
+                        snapshot.setdefault(alert_type, []).append(channel)
+            self._channel_snapshot = {alert_type: tuple(chs) for alert_type, chs in snapshot.items()}
+
+        def _has_channels(self, alert_type: str) -> bool:
+            """True if at least one guild channel is configured for alert_type"""
+            return bool(self._channel_snapshot.get(alert_type))
+
+        async def connect_database(self):
+            """Open the shared aiosqlite connection used by all tasks and commands"""
+            if self.db is not None or not aiosqlite:
+                return
+            try:
+                self.db = await aiosqlite.connect(self.database_uri, uri=True)
+            except sqlite3.OperationalError as e:
+                # z.B. Pipeline hat noch keine Datenbank angelegt; Abfragen öffnen später neu
+                print(f"Could not open database {self.database_path}: {e}")
+                return
+            self.db.row_factory = aiosqlite.Row
+            await self.db.executescript(SQLITE_PRAGMAS)
+
+        def _open_connection(self) -> sqlite3.Connection:
+            conn = sqlite3.connect(self.database_uri, uri=True, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(SQLITE_PRAGMAS)
+            return conn
+
+        def _sync_connection(self) -> sqlite3.Connection:
+            """Dedicated sqlite3 connection for PRAGMA data_version (the counter is per connection)"""
+            if self.conn is None:
+                self.conn = self._open_connection()
+            return self.conn
+
+        @contextmanager
+        def _pooled_connection(self):
+            """Borrow a connection from the pool, opening up to DB_POOL_SIZE on demand"""
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                with self._pool_lock:
+                    can_open = self._pool_opened < DB_POOL_SIZE
+                    if can_open:
+                        self._pool_opened += 1
+                if can_open:
+                    try:
+                        conn = self._open_connection()
+                    except Exception:
+                        with self._pool_lock:
+                            self._pool_opened -= 1
+                        raise
+                else:
+                    conn = self._pool.get()
+            try:
+                yield conn
+            finally:
+                self._pool.put(conn)
+
+        def _run_query(self, sql: str, params: tuple):
+            """Blocking SELECT on a pooled sqlite3 connection (runs in a worker thread)"""
+            with self._pooled_connection() as conn:
+                return conn.execute(sql, params).fetchall()
+
+        def _run_data_version(self) -> int:
+            with self._conn_lock:
+                return self._sync_connection().execute("PRAGMA data_version").fetchone()[0]
+
+        async def _fetchall(self, sql: str, params: tuple = ()):
+            """Run a SELECT and return all rows without blocking the event loop"""
+            if self.db is None:
+                # Ohne aiosqlite: sqlite3 in eigenen Worker-Threads, damit Gateway-Heartbeats weiterlaufen
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._db_executor, self._run_query, sql, params)
+            async with self.db.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+
+        async def _fetchone(self, sql: str, params: tuple = ()):
+            """Run a SELECT and return the first row (or None)"""
+            rows = await self._fetchall(sql, params)
+            return rows[0] if rows else None
+
+        async def _fetch_by_team_name(self, query: SimpleNamespace, team_name: str,
+                                      prefix_first: bool = False):
+            """Rows of a team-name search: FTS5 token match, then substring LIKE as fallback"""
+            if prefix_first:
+                # Präfix des vollen Namens über idx_teams_name (NOCASE)
+                rows = await self._fetchall(query.like, (f'{team_name}%',))
+                if rows:
+                    return rows
+            try:
+                rows = await self._fetchall(query.fts, (_fts_query(team_name),))
+            except sqlite3.OperationalError:
+                # teams_fts fehlt (Schema noch nicht eingespielt) oder kein gültiger FTS-Ausdruck
+                rows = []
+            if not rows:
+                # Teilstring irgendwo im Namen (z.B. 'gladbach'): Scan über teams
+                rows = await self._fetchall(query.like, (f'%{team_name}%',))
+            return rows
+
+        async def _data_version(self) -> int:
+            """SQLite's data_version: changes whenever another connection (the pipeline) commits"""
+            if self.db is None:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._db_executor, self._run_data_version)
+            row = await self._fetchone("PRAGMA data_version")
+            return row[0]
+
+        async def close(self):
+            if self.http_session is not None:
+                await self.http_session.close()
+                self.http_session = None
+            if self.db is not None:
+                await self.db.close()
+                self.db = None
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                self._pool_opened -= 1
+            self._db_executor.shutdown(wait=False)
+            await super().close()
 
         @tasks.loop(minutes=30)
         async def check_upcoming_games(self):
             """Notify about games starting in next 2 hours"""
+            if not self._has_channels("previews"):
+                return
             try:
-                conn = sqlite3.connect(self.database_path)
-                conn.row_factory = sqlite3.Row
-                upcoming = conn.execute("""
-                    SELECT f.*, ht.name as home_team, at.name as away_team, l.name as league
-                    FROM fixtures f
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    JOIN leagues l ON f.league_id = l.id
-                    WHERE f.kickoff_utc BETWEEN datetime('now', '+90 minutes') 
-                                            AND datetime('now', '+120 minutes')
-                    AND f.kickoff_utc >= datetime('now')
-                    ORDER BY f.kickoff_utc ASC
-                """).fetchall()
-                for game in upcoming:
-                    await self.send_game_preview(game)
+                upcoming = await self._fetchall(_SQL.games_starting_soon)
+                if not upcoming:
+                    return
+                
+                # Neueste h2h-Quoten aller Spiele in einer Abfrage statt einer pro Spiel
+                # IDs als JSON-Array: gleicher SQL-Text unabhängig von der Anzahl der Spiele
+                fixture_ids = json.dumps([game['id'] for game in upcoming])
+                latest_odds = await self._fetchall(_SQL.latest_h2h_odds, (fixture_ids,))
+                odds_by_fixture = {row['fixture_id']: row for row in latest_odds}
+                
+                await asyncio.gather(*(self.send_game_preview(game, odds_by_fixture.get(game['id']))
+                                       for game in upcoming))
             except Exception as e:
                 print(f"Error in check_upcoming_games: {e}")
 
+        @tasks.loop(minutes=15)
+        async def odds_movement_alerts(self):
+            """Alert on significant odds movements (>10% change)"""
+            # Kein Kanal konfiguriert -> keine SQL-Abfragen
+            if not self._has_channels("odds"):
+                return []
+            try:
+                # Pipeline hat seit dem letzten Tick nichts geschrieben -> keine neuen Bewegungen
+                data_version = await self._data_version()
+                if data_version == self._odds_data_version:
+                    return []
+                self._odds_data_version = data_version
+
+                # Jede Bewegung nur einmal melden: data_version zeigt nur, dass irgendetwas
+                # geschrieben wurde. Beim Start gilt der Bestand als gemeldet (kein Nachsenden
+                # der letzten Stunde nach einem Neustart)
+                max_id = (await self._fetchone(_SQL.max_odds_id))['max_id']
+                if self._odds_alerted_id is None:
+                    self._odds_alerted_id = max_id
+                    return []
+
+                # Find recent significant odds changes
+                # Nur Quoten anstehender Spiele aus der letzten Stunde (idx_fixtures_kickoff ->
+                # idx_odds_fixture_bookmaker); aufeinanderfolgende Quoten je Fixture/Bookmaker/Markt
+                # vergleichen, Teamnamen nur für die verbleibenden Bewegungen auflösen
+                movements = await self._fetchall(_SQL.odds_movements, (self._odds_alerted_id, max_id))
+                self._odds_alerted_id = max_id
+
+                await asyncio.gather(*(self.send_odds_alert(movement) for movement in movements))
+                return movements
+
+            except Exception as e:
+                print(f"Error getting odds movements: {e}")
+                return []
+
         async def on_ready(self):
             print(f'🤖 {self.user} is connected to Discord!')
+            self._refresh_channel_snapshot()
+            await self.connect_database()
+            if aiohttp and self.http_session is None:
+                self.http_session = aiohttp.ClientSession()
             await self.setup_scheduled_tasks()
 
         async def setup_scheduled_tasks(self):
-            """Start background tasks"""
-            self.check_upcoming_games.start()
-            # self.odds_movement_alerts.start()
+            """Start background tasks (on_ready fires again after reconnects)"""
+            for task in (self.check_upcoming_games, self.odds_movement_alerts):
+                if not task.is_running():
+                    task.start()
             # self.injury_notifications.start()
 
+        async def send_game_preview(self, game, latest_odds=None):
+            """Preview for a game starting soon, with the latest h2h odds if available"""
+            if not self._has_channels("previews"):
+                return
+            embed = discord.Embed(
+                title=f"⚽ {game['home_team']} vs {game['away_team']}",
+                description=f"**{game['league']}** - Kickoff <t:{game['kickoff_ts']}:R>",
+                color=0x0099ff
+            )
+            if latest_odds:
+                embed.add_field(
+                    name=f"🎲 Odds ({latest_odds['bookmaker']})",
+                    value=f"**{game['home_team']}**: {latest_odds['home_odds']}\n"
+                          f"Draw: {latest_odds['draw_odds']}\n"
+                          f"**{game['away_team']}**: {latest_odds['away_odds']}",
+                    inline=False
+                )
+            await self._broadcast("previews", embed)
+
+        async def send_odds_alert(self, movement):
+            """Alert on a significant odds movement (percentages come precomputed from SQL)"""
+            if not self._has_channels("odds"):
+                return
+            embed = discord.Embed(
+                title=f"📉 Odds Movement: {movement['home_team']} vs {movement['away_team']}",
+                description=f"**{movement['bookmaker']}** ({movement['market_type']})",
+                color=0xff9900
+            )
+            for side, team in (('home', movement['home_team']), ('away', movement['away_team'])):
+                change = movement[f'{side}_change']
+                if change is not None:
+                    embed.add_field(
+                        name=f"{'🏠' if side == 'home' else '✈️'} {team}",
+                        value=f"{movement[f'prev_{side}_odds']} → {movement[f'{side}_odds']} ({change:+.1f}%)",
+                        inline=True
+                    )
+            await self._broadcast("odds", embed)
+
         async def send_injury_alert(self, event):
             """Alert on new injuries/suspensions"""
-            severity_colors = {
-                'minor': 0xffff00,
-                'major': 0xff9900, 
-                'season_ending': 0xff0000
-            }
+            if not self._has_channels("injuries"):
+                return
             embed = discord.Embed(
                 title=f"🚑 {event['event_type'].title()} Alert",
                 description=f"**{event['team_name']}**",
-                color=severity_colors.get(event['severity'], 0x808080)
+                color=INJURY_SEVERITY_COLORS.get(event['severity'], 0x808080)
             )
             if event['player_name']:
                 embed.add_field(name="👤 Player", value=event['player_name'], inline=True)
@@ -87,32 +549,30 @@ if DISCORD_AVAILABLE:
             embed.add_field(name="⚠️ Severity", value=event['severity'] or 'Unknown', inline=True)
             if event['end_date']:
                 embed.add_field(name="📅 Expected Return", value=event['end_date'], inline=True)
-            for guild_id, channels in self.notification_channels.items():
-                channel_id = channels.get("injuries")
-                if channel_id:
-                    try:
-                        channel = self.get_channel(channel_id)
-                        if channel:
-                            await channel.send(embed=embed)
-                    except Exception as e:
-                        print(f"Error sending injury alert: {e}")
+            await self._broadcast("injuries", embed)
+
+        async def _broadcast(self, alert_type: str, embed):
+            """Send an embed to every guild channel configured for alert_type, concurrently"""
+            async def send(channel):
+                async with self._send_semaphore:
+                    await channel.send(embed=embed)
+            
+            channels = self._channel_snapshot.get(alert_type, ())
+            results = await asyncio.gather(*(send(channel) for channel in channels),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error sending {alert_type} alert: {result}")
 
         @commands.command(name='games')
         async def upcoming_games_command(self, ctx, hours: int = 24):
             """Show games in next X hours"""
+            if not 0 < hours <= 168:
+                await ctx.send("Please choose between 1 and 168 hours.")
+                return
             try:
-                conn = sqlite3.connect(self.database_path)
-                conn.row_factory = sqlite3.Row
-                games = conn.execute("""
-                    SELECT f.*, ht.name as home_team, at.name as away_team, l.name as league
-                    FROM fixtures f
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    JOIN leagues l ON f.league_id = l.id  
-                    WHERE f.kickoff_utc BETWEEN datetime('now') AND datetime('now', '+{} hours')
-                    ORDER BY f.kickoff_utc
-                    LIMIT 10
-                """.format(hours)).fetchall()
+                # Zeitfenster als Parameter: ein fester SQL-Text für den Statement-Cache, keine Injection
+                games = await self._fetchall(_SQL.upcoming_games, (f'+{int(hours)} hours',))
                 if not games:
                     await ctx.send(f"No games found in the next {hours} hours.")
                     return
@@ -121,11 +581,10 @@ if DISCORD_AVAILABLE:
                     color=0x0099ff
                 )
                 for game in games:
-                    kickoff_timestamp = int(datetime.fromisoformat(game['kickoff_utc'].replace(' ', 'T')).timestamp())
                     embed.add_field(
                         name=f"{game['league']}", 
                         value=f"**{game['home_team']}** vs **{game['away_team']}**\n"
-                                f"<t:{kickoff_timestamp}:R>",
+                                f"<t:{game['kickoff_ts']}:R>",
                         inline=False
                     )
                 await ctx.send(embed=embed)
@@ -136,35 +595,19 @@ if DISCORD_AVAILABLE:
         async def odds_command(self, ctx, *, team_name: str):
             """Get latest odds for team's next game"""
             try:
-                conn = sqlite3.connect(self.database_path)
-                conn.row_factory = sqlite3.Row
-                game = conn.execute("""
-                    SELECT f.*, ht.name as home_team, at.name as away_team, l.name as league
-                    FROM fixtures f
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    JOIN leagues l ON f.league_id = l.id
-                    WHERE (ht.name LIKE ? OR at.name LIKE ?) 
-                    AND f.kickoff_utc > datetime('now')
-                    ORDER BY f.kickoff_utc
-                    LIMIT 1
-                """, (f'%{team_name}%', f'%{team_name}%')).fetchone()
-                if not game:
+                # Nächstes Spiel und seine letzten h2h-Quoten in einer Abfrage
+                rows = await self._fetch_by_team_name(_SQL.next_game_odds, team_name)
+                if not rows:
                     await ctx.send(f"No upcoming games found for '{team_name}'")
                     return
-                odds = conn.execute("""
-                    SELECT * FROM odds_history 
-                    WHERE fixture_id = ? AND market_type = 'h2h'
-                    ORDER BY collected_at DESC
-                    LIMIT 3
-                """, (game['id'],)).fetchall()
+                game = rows[0]
+                odds = [row for row in rows if row['bookmaker'] is not None]
                 embed = discord.Embed(
                     title=f"🎲 Odds: {game['home_team']} vs {game['away_team']}",
                     description=f"**{game['league']}**",
                     color=0x00ff00
                 )
-                kickoff_timestamp = int(datetime.fromisoformat(game['kickoff_utc'].replace(' ', 'T')).timestamp())
-                embed.add_field(name="⏰ Kickoff", value=f"<t:{kickoff_timestamp}:F>", inline=False)
+                embed.add_field(name="⏰ Kickoff", value=f"<t:{game['kickoff_ts']}:F>", inline=False)
                 for odd in odds:
                     embed.add_field(
                         name=f"📊 {odd['bookmaker']} ({odd['collection_phase']})",
@@ -176,39 +619,25 @@ if DISCORD_AVAILABLE:
                 await ctx.send(embed=embed)
             except Exception as e:
                 await ctx.send(f"Error fetching odds: {e}")
-            inline=True
-    
-            await ctx.send(embed=embed)
-    
+
         @commands.command(name='trends')
         async def odds_trends_command(self, ctx, *, team_name: str):
             """Generate odds trend chart for team's next game"""
+            # matplotlib wird erst beim Rendern importiert; ohne Paket gar nicht erst abfragen
+            if not PLOTTING_AVAILABLE:
+                await ctx.send("Trend charts require matplotlib")
+                return
             try:
-                conn = sqlite3.connect(self.database_path)
-                conn.row_factory = sqlite3.Row
-                
-                # Find team and game
-                game = conn.execute("""
-                    SELECT f.*, ht.name as home_team, at.name as away_team
-                    FROM fixtures f
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    WHERE (ht.name LIKE ? OR at.name LIKE ?)
-                    AND f.kickoff_utc > datetime('now')
-                    ORDER BY f.kickoff_utc LIMIT 1
-                """, (f'%{team_name}%', f'%{team_name}%')).fetchone()
+                # Nächstes Spiel und seine h2h-Quotenreihe in einer Abfrage (eine Zeile je Quote,
+                # bzw. eine Zeile mit ts = NULL ohne Quoten); ts normalisiert gemischte
+                # Zeitstempel-Formate (mit/ohne Offset) auf UTC-ISO
+                rows = await self._fetch_by_team_name(_SQL.next_game_odds_series, team_name)
                 
-                if not game:
+                if not rows:
                     await ctx.send(f"No upcoming games found for '{team_name}'")
                     return
-                
-                # Get odds history
-                odds_history = conn.execute("""
-                    SELECT collected_at, home_odds, away_odds, bookmaker
-                    FROM odds_history 
-                    WHERE fixture_id = ? AND market_type = 'h2h' AND home_odds IS NOT NULL
-                    ORDER BY collected_at
-                """, (game['id'],)).fetchall()
+                game = rows[0]
+                odds_history = [row for row in rows if row['ts'] is not None]
                 
                 if len(odds_history) < 2:
                     await ctx.send("Not enough odds data for trend analysis")
@@ -233,40 +662,26 @@ if DISCORD_AVAILABLE:
         async def team_form_command(self, ctx, *, team_name: str):
             """Show team's recent form and statistics"""
             try:
-                conn = sqlite3.connect(self.database_path)
-                conn.row_factory = sqlite3.Row
-                
-                # Find team
-                team = conn.execute("""
-                    SELECT * FROM teams WHERE name LIKE ? LIMIT 1
-                """, (f'%{team_name}%',)).fetchone()
+                # Team samt neuesten Stats in einer Abfrage; Präfix-Treffer über idx_teams_name,
+                # dann Wort-Präfixe über teams_fts, sonst Teilstring-Suche
+                rows = await self._fetch_by_team_name(_SQL.team_with_stats, team_name, prefix_first=True)
+                team = rows[0] if rows else None
                 
                 if not team:
                     await ctx.send(f"Team '{team_name}' not found")
                     return
                 
-                # Get latest stats
-                stats = conn.execute("""
-                    SELECT * FROM team_statistics 
-                    WHERE team_id = ?
-                    ORDER BY collection_date DESC LIMIT 1
-                """, (team['id'],)).fetchone()
+                entry = self._form_cache.pop(team['id'], None)
+                if entry and time.monotonic() - entry[0] < FORM_CACHE_TTL:
+                    # LRU: Treffer wieder ans Ende hängen
+                    self._form_cache[team['id']] = entry
+                    await ctx.send(embed=discord.Embed.from_dict(entry[1]))
+                    return
+                stats = team if team['stats_id'] is not None else None
                 
                 # Get recent fixtures
-                recent_fixtures = conn.execute("""
-                    SELECT f.*, ht.name as home_team, at.name as away_team,
-                        CASE 
-                            WHEN f.home_team_id = ? THEN 'home'
-                            ELSE 'away' 
-                        END as venue
-                    FROM fixtures f
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    WHERE (f.home_team_id = ? OR f.away_team_id = ?)
-                    AND f.kickoff_utc <= datetime('now')
-                    AND f.status != 'scheduled'
-                    ORDER BY f.kickoff_utc DESC LIMIT 5
-                """, (team['id'], team['id'], team['id'])).fetchall()
+                recent_fixtures = await self._fetchall(_SQL.team_recent_fixtures,
+                                                       (team['id'], team['id'], team['id']))
                 
                 embed = discord.Embed(
                     title=f"📊 {team['name']} - Team Form",
@@ -283,14 +698,17 @@ if DISCORD_AVAILABLE:
                     )
                 
                 if recent_fixtures:
-                    form_string = ""
-                    for fixture in recent_fixtures:
-                        venue_icon = "🏠" if fixture['venue'] == 'home' else "✈️"
-                        opponent = fixture['away_team'] if fixture['venue'] == 'home' else fixture['home_team']
-                        form_string += f"{venue_icon} vs {opponent}\n"
+                    form_string = "\n".join(
+                        f"🏠 vs {fixture['away_team']}" if fixture['venue'] == 'home'
+                        else f"✈️ vs {fixture['home_team']}"
+                        for fixture in recent_fixtures
+                    )
                     
                     embed.add_field(name="🏃 Recent Games", value=form_string, inline=True)
                 
+                self._form_cache[team['id']] = (time.monotonic(), embed.to_dict())
+                if len(self._form_cache) > FORM_CACHE_SIZE:
+                    self._form_cache.pop(next(iter(self._form_cache)))
                 await ctx.send(embed=embed)
                 
             except Exception as e:
@@ -300,107 +718,200 @@ if DISCORD_AVAILABLE:
 # ADMIN COMMANDS
 # =============================================================================
 
-    @commands.command(name='setup')
-    @commands.has_permissions(administrator=True)
-    async def setup_notifications(self, ctx, alert_type: str = None):
-        """Setup notification channel for this server and alert type
-        Usage: !fb setup <alert_type> (odds, injuries, previews)
-        """
-        valid_types = {"odds", "injuries", "previews"}
-        if not alert_type or alert_type not in valid_types:
-            await ctx.send(f"Please specify alert type: {'/'.join(valid_types)}\nExample: !fb setup odds")
-            return
-        if ctx.guild.id not in self.notification_channels:
-            self.notification_channels[ctx.guild.id] = {}
-        self.notification_channels[ctx.guild.id][alert_type] = ctx.channel.id
-        await ctx.send(f"✅ {alert_type.capitalize()} notifications will be sent to {ctx.channel.mention}")
-    
-    @commands.command(name='subscribe')
-    async def subscribe_user(self, ctx, *preferences):
-        """Subscribe to specific notifications (e.g. injuries, odds, games)"""
-        valid_prefs = {'injuries', 'odds', 'games', 'all'}
-        user_prefs = set(preferences) if preferences else {'all'}
-        
-        if not user_prefs.issubset(valid_prefs):
-            await ctx.send(f"Valid preferences: {', '.join(valid_prefs)}")
-            return
-        
-        self.user_subscriptions[ctx.author.id] = list(user_prefs)
-        await ctx.send(f"✅ Subscribed to: {', '.join(user_prefs)}")
+        @commands.command(name='setup')
+        @commands.has_permissions(administrator=True)
+        async def setup_notifications(self, ctx, alert_type: str = None):
+            """Setup notification channel for this server and alert type
+            Usage: !fb setup <alert_type> (odds, injuries, previews)
+            """
+            valid_types = {"odds", "injuries", "previews"}
+            if not alert_type or alert_type not in valid_types:
+                await ctx.send(f"Please specify alert type: {'/'.join(valid_types)}\nExample: !fb setup odds")
+                return
+            if ctx.guild.id not in self.notification_channels:
+                self.notification_channels[ctx.guild.id] = {}
+            self.notification_channels[ctx.guild.id][alert_type] = ctx.channel.id
+            self._save_notification_channels()
+            self._refresh_channel_snapshot()
+            await ctx.send(f"✅ {alert_type.capitalize()} notifications will be sent to {ctx.channel.mention}")
+
+        @commands.command(name='subscribe')
+        async def subscribe_user(self, ctx, *preferences):
+            """Subscribe to specific notifications (e.g. injuries, odds, games)"""
+            valid_prefs = {'injuries', 'odds', 'games', 'all'}
+            user_prefs = set(preferences) if preferences else {'all'}
+
+            if not user_prefs.issubset(valid_prefs):
+                await ctx.send(f"Valid preferences: {', '.join(valid_prefs)}")
+                return
+
+            self.user_subscriptions[ctx.author.id] = frozenset(user_prefs)
+            self._save_user_subscriptions()
+            await ctx.send(f"✅ Subscribed to: {', '.join(user_prefs)}")
 
 # =============================================================================
 # UTILITY METHODS
 # =============================================================================
 
-    async def create_league_bar_chart(self, teams, league_name):
-            import matplotlib.pyplot as plt
-            import io
-            names = [team['name'] for team in teams]
-            win_rates = [team['win_percentage'] for team in teams]
-            plt.figure(figsize=(8, 4))
-            bars = plt.barh(names, win_rates, color='skyblue')
-            plt.xlabel('Win Rate (%)')
-            plt.title(f'Top Teams in {league_name}')
-            plt.xlim(0, 100)
-            for bar, rate in zip(bars, win_rates):
-                plt.text(bar.get_width()+1, bar.get_y()+bar.get_height()/2, f'{rate:.1f}%', va='center')
-            plt.tight_layout()
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png')
-            buf.seek(0)
-            plt.close()
-            return buf
+        async def create_league_bar_chart(self, teams, league_name):
+            """Create win-rate bar chart for a league's top teams"""
+            return io.BytesIO(await asyncio.to_thread(_render_league_bar_chart, teams, league_name))
+
+        async def create_odds_chart(self, odds_history, game):
+            """Create odds trend visualization"""
+            # Gleiches Spiel ohne neue Quoten -> gleiches Bild
+            key = (game['id'], len(odds_history), odds_history[-1]['ts'])
+            png = _CHART_CACHE.get(key)
+            if png is None:
+                # Rendering dauert 100ms+, daher im Worker-Thread statt auf dem Event-Loop
+                png = await asyncio.to_thread(_render_odds_chart, odds_history, game)
+                _CHART_CACHE[key] = png
+                if len(_CHART_CACHE) > CHART_CACHE_SIZE:
+                    _CHART_CACHE.pop(next(iter(_CHART_CACHE)))
+            return io.BytesIO(png)
+
+# Gerenderte Trend-Charts: (fixture_id, Anzahl Quoten, letzter Zeitstempel) -> PNG
+CHART_CACHE_SIZE = 32
+_CHART_CACHE: Dict[tuple, bytes] = {}
+
+# Eine wiederverwendete Figure (ohne pyplot-Zustand, damit thread-sicher) für alle Trend-Charts
+_CHART_FIGURE = None
+_CHART_LOCK = threading.Lock()
+
+def _render_odds_chart(odds_history, game) -> bytes:
+    """Render the odds trend chart to PNG bytes (blocking)"""
+    global _CHART_FIGURE
+    from matplotlib.figure import Figure
+    import numpy as np
     
-    async def create_odds_chart(self, odds_history, game):
-        """Create odds trend visualization"""
-        plt.figure(figsize=(10, 6))
-        
-        timestamps = [datetime.fromisoformat(row['collected_at'].replace(' ', 'T')) for row in odds_history]
-        home_odds = [float(row['home_odds']) if row['home_odds'] else None for row in odds_history]
-        away_odds = [float(row['away_odds']) if row['away_odds'] else None for row in odds_history]
+    timestamps = np.array([row['ts'] for row in odds_history], dtype='datetime64[s]')
+    # SQLite liefert REAL bereits als float; fehlende Quoten (NULL/None) werden zu NaN,
+    # matplotlib unterbricht die Linie dort
+    home_odds = np.array([row['home_odds'] for row in odds_history], dtype=np.float64)
+    away_odds = np.array([row['away_odds'] for row in odds_history], dtype=np.float64)
+    
+    with _CHART_LOCK:
+        if _CHART_FIGURE is None:
+            _CHART_FIGURE = Figure(figsize=(10, 6))
+            _CHART_FIGURE.add_subplot()
+        fig = _CHART_FIGURE
+        ax = fig.axes[0]
+        ax.clear()
         
-        plt.plot(timestamps, home_odds, label=f"{game['home_team']} (Home)", marker='o', linewidth=2)
-        plt.plot(timestamps, away_odds, label=f"{game['away_team']} (Away)", marker='s', linewidth=2)
+        ax.plot(timestamps, home_odds, label=f"{game['home_team']} (Home)", marker='o', linewidth=2)
+        ax.plot(timestamps, away_odds, label=f"{game['away_team']} (Away)", marker='s', linewidth=2)
         
-        plt.title(f"Odds Movement: {game['home_team']} vs {game['away_team']}", fontsize=14, fontweight='bold')
-        plt.xlabel("Time")
-        plt.ylabel("Odds")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title(f"Odds Movement: {game['home_team']} vs {game['away_team']}", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Odds")
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis='x', labelrotation=45)
+        fig.tight_layout()
         
         # Save to buffer
         buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-        buffer.seek(0)
-        plt.close()
-        
-        return buffer
+        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    
+    return buffer.getvalue()
+
+def _render_league_bar_chart(teams, league_name) -> bytes:
+    """Render the league win-rate bar chart to PNG bytes (blocking)"""
+    from matplotlib.figure import Figure
+    
+    names = [team['name'] for team in teams]
+    win_rates = [team['win_percentage'] for team in teams]
+    # Eigene Figure statt pyplot: kein globaler Zustand, sicher im Worker-Thread
+    fig = Figure(figsize=(8, 4))
+    ax = fig.add_subplot()
+    bars = ax.barh(names, win_rates, color='skyblue')
+    ax.set_xlabel('Win Rate (%)')
+    ax.set_title(f'Top Teams in {league_name}')
+    ax.set_xlim(0, 100)
+    for bar, rate in zip(bars, win_rates):
+        ax.text(bar.get_width()+1, bar.get_y()+bar.get_height()/2, f'{rate:.1f}%', va='center')
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
 
 # =============================================================================
 # WEBHOOK INTEGRATION (für GitHub Actions)
 # =============================================================================
 
-def send_webhook_notification(webhook_url: str, title: str, description: str, color: int = 0x0099ff):
-    """Send notification via Discord Webhook (für GitHub Actions)"""
-    embed = {
-        "title": title,
-        "description": description,
+# Keep-Alive-Pool: Folge-Notifications sparen TCP/TLS-Handshake zu discord.com.
+# 429/502/503 wiederholt urllib3 selbst (mit Retry-After bzw. Backoff); POST muss dafür
+# explizit erlaubt werden
+_WEBHOOK_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503),
+                       allowed_methods=frozenset({'POST'}), raise_on_status=False)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_WEBHOOK_RETRY))
+# (connect, read) in Sekunden
+WEBHOOK_TIMEOUT = (3.05, 10)
+
+# Discord nimmt bis zu 10 Embeds pro Webhook-Nachricht an
+WEBHOOK_MAX_EMBEDS = 10
+# Discord-Limits für Embed-Titel/-Beschreibung (längere Texte lehnt die API mit 400 ab)
+WEBHOOK_TITLE_LIMIT = 256
+WEBHOOK_DESCRIPTION_LIMIT = 4096
+
+# Kompakt und ohne ASCII-Escapes (Emojis bleiben UTF-8) vorab serialisiert
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _webhook_embed(title: str, description: str, color: int) -> Dict:
+    return {
+        "title": title[:WEBHOOK_TITLE_LIMIT],
+        "description": description[:WEBHOOK_DESCRIPTION_LIMIT],
         "color": color,
         "timestamp": datetime.now().isoformat(),
         "footer": {"text": "Football Data Pipeline"}
     }
-    
-    payload = {"embeds": [embed]}
+
+def _webhook_payload(title: str, description: str, color: int) -> Dict:
+    return {"embeds": [_webhook_embed(title, description, color)]}
+
+def _webhook_body(payload: Dict) -> bytes:
+    return _JSON_ENCODER.encode(payload).encode('utf-8')
+
+def send_webhook_notification(webhook_url: str, title: str, description: str, color: int = 0x0099ff):
+    """Send notification via Discord Webhook (für GitHub Actions)"""
+    body = _webhook_body(_webhook_payload(title, description, color))
     
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = _SESSION.post(webhook_url, data=body, headers=_JSON_HEADERS, timeout=WEBHOOK_TIMEOUT)
         response.raise_for_status()
         print(f"✅ Discord notification sent: {title}")
     except Exception as e:
         print(f"❌ Discord webhook failed: {e}")
 
+def send_webhook_batch(webhook_url: str, items: List[tuple]):
+    """Send several (title, description[, color]) notifications, up to 10 embeds per POST"""
+    embeds = [_webhook_embed(item[0], item[1], item[2] if len(item) > 2 else 0x0099ff) for item in items]
+    
+    for start in range(0, len(embeds), WEBHOOK_MAX_EMBEDS):
+        chunk = embeds[start:start + WEBHOOK_MAX_EMBEDS]
+        try:
+            response = _SESSION.post(webhook_url, data=_webhook_body({"embeds": chunk}),
+                                     headers=_JSON_HEADERS, timeout=WEBHOOK_TIMEOUT)
+            response.raise_for_status()
+            print(f"✅ Discord notification sent: {len(chunk)} embeds")
+        except Exception as e:
+            print(f"❌ Discord webhook failed: {e}")
+
+async def send_webhook_notification_async(session, webhook_url: str, title: str, description: str,
+                                          color: int = 0x0099ff):
+    """Send notification via Discord Webhook on a shared aiohttp.ClientSession (e.g. bot.http_session)"""
+    body = _webhook_body(_webhook_payload(title, description, color))
+    timeout = aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT[1], sock_connect=WEBHOOK_TIMEOUT[0])
+    
+    try:
+        async with session.post(webhook_url, data=body, headers=_JSON_HEADERS, timeout=timeout) as response:
+            response.raise_for_status()
+        print(f"✅ Discord notification sent: {title}")
+    except Exception as e:
+        print(f"❌ Discord webhook failed: {e}")
+
 # Für GitHub Actions Integration
 def github_actions_discord_notifications():
     """
@@ -437,10 +948,15 @@ if __name__ == "__main__":
     DATABASE_PATH = 'data/football_data.db'
     
     if TOKEN:
+        # libuv-Eventloop, falls installiert (bot.run nutzt asyncio.run)
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
         bot = FootballDiscordBot(DATABASE_PATH)
-        print("Discord bot features ready!")
-        print("Set DISCORD_BOT_TOKEN environment variable to run bot")
-        # bot.run(TOKEN)
+        print("🤖 Starting Discord bot...")
+        bot.run(TOKEN)
     else:
         print("Discord integration examples generated!")
         print("Features include:")
@@ -451,55 +967,5 @@ if __name__ == "__main__":
         print("• Trend visualizations")
         print("• Team form analysis")
         print("• GitHub Actions webhook integration")
-        
-        # Example of how to initialize the bot
-        if __name__ == "__main__":
-            # Bot setup example
-            TOKEN = os.getenv('DISCORD_BOT_TOKEN')
-            DATABASE_PATH = 'data/football_data.db'
-            
-            if TOKEN:
-                bot = FootballDiscordBot(DATABASE_PATH)
-                print("🤖 Starting Discord bot...")
-                bot.run(TOKEN)
-            else:
-                print("⚠️ DISCORD_BOT_TOKEN not set - webhook only mode")
-                print("Set DISCORD_WEBHOOK_URL for webhook notifications")
-    
-    @tasks.loop(minutes=15)
-    async def odds_movement_alerts(self):
-        """Alert on significant odds movements (>10% change)"""
-        try:
-            conn = sqlite3.connect(self.database_path)
-            conn.row_factory = sqlite3.Row
-            
-            # Find recent significant odds changes
-            movements = conn.execute("""
-                WITH recent_odds AS (
-                    SELECT *, 
-                           LAG(home_odds) OVER (PARTITION BY fixture_id, market_type, bookmaker 
-                                               ORDER BY collected_at) as prev_home_odds,
-                           LAG(away_odds) OVER (PARTITION BY fixture_id, market_type, bookmaker 
-                                               ORDER BY collected_at) as prev_away_odds
-                    FROM odds_history 
-                    WHERE collected_at >= datetime('now', '-1 hour')
-                )
-                SELECT r.*, f.kickoff_utc, ht.name as home_team, at.name as away_team
-                FROM recent_odds r
-                JOIN fixtures f ON r.fixture_id = f.id
-                JOIN teams ht ON f.home_team_id = ht.id  
-                JOIN teams at ON f.away_team_id = at.id
-                WHERE prev_home_odds IS NOT NULL
-                AND (ABS(home_odds - prev_home_odds) / prev_home_odds > 0.1
-                     OR ABS(away_odds - prev_away_odds) / prev_away_odds > 0.1)
-                AND f.kickoff_utc > datetime('now')
-                ORDER BY r.collected_at DESC
-                LIMIT 10
-            """).fetchall()
-            
-            conn.close()
-            return movements
-            
-        except Exception as e:
-            print(f"Error getting odds movements: {e}")
-            return []
\ No newline at end of file
+        print("⚠️ DISCORD_BOT_TOKEN not set - webhook only mode")
+        print("Set DISCORD_WEBHOOK_URL for webhook notifications")
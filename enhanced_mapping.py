@@ -14,20 +14,318 @@ Intelligentes Team-Name-Mapping zwischen API-Football und The Odds API
 Mit automatischem Lernen und Performance-Tracking
 """
 
+import atexit
+import functools
 import json
 import os
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Sequence
 import difflib
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from itertools import groupby
+from types import MappingProxyType
+from dataclasses import dataclass
 import re
 import logging
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# rapidfuzz (C-Extension) statt difflib für den Fuzzy-Kern, falls installiert
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+# Odds-Antworten direkt aus den Bytes parsen (orjson), sonst stdlib json
+try:
+    from orjson import loads as json_loads # type: ignore
+except ImportError:
+    json_loads = json.loads
+# Ähnlichkeitsmatrix im Batch-Mapping (process.cdist liefert ein numpy-Array)
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Eine Verbindung pro Mapper statt connect/commit/close je Mapping-Versuch
+# (WAL, weniger fsyncs, größerer Page-Cache; wie SQLITE_PRAGMAS in database_integration)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -64000,       # 64 MB
+    'mmap_size': 268435456,     # 256 MB
+}
+
+# Mapping-Versuche gepuffert und per executemany geschrieben (ein Commit je 100 Versuche)
+ATTEMPT_FLUSH_THRESHOLD = 100
+# Nur jeder 100. Exact-Match-Treffer wird als Zeile gespeichert, die übrigen zählt nur das Tagesaggregat
+EXACT_MATCH_SAMPLE_RATE = 100
+
+_INSERT_ATTEMPT_SQL = """
+    INSERT INTO mapping_attempts 
+    (api_football_name, odds_api_name, confidence, strategy_used, success, 
+     processing_time, league_context)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_ALTERNATIVE_SQL = """
+    INSERT INTO mapping_attempt_alternatives (attempt_id, rank, alt_name) VALUES (?, ?, ?)
+"""
+# Lern-/Verifikationsabfragen als Modulkonstanten: der Statement-Cache der Verbindung
+# (cached_statements) hält sie vorbereitet, nur die Parameter werden neu gebunden
+_UPSERT_LEARNED_MAPPING_SQL = """
+    INSERT OR REPLACE INTO team_mappings 
+    (api_football_name, odds_api_name, confidence, strategy_used, league_context)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_UPSERT_VERIFIED_MAPPING_SQL = """
+    INSERT OR REPLACE INTO team_mappings 
+    (api_football_name, odds_api_name, confidence, strategy_used, 
+     verified, league_context)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Nutzt den Index der UNIQUE(api_football_name, odds_api_name, league_context)-Bedingung
+_DELETE_MAPPING_SQL = """
+    DELETE FROM team_mappings 
+    WHERE api_football_name = ? AND odds_api_name = ?
+"""
+_LOOKUP_LEARNED_SQL = """
+    SELECT odds_api_name 
+    FROM team_mappings 
+    WHERE api_football_name = ? AND (verified = 1 OR confidence > 0.9)
+    ORDER BY verified DESC, confidence DESC
+    LIMIT 1
+"""
+_LOOKUP_LEARNED_IN_LEAGUE_SQL = """
+    SELECT odds_api_name 
+    FROM team_mappings 
+    WHERE api_football_name = ? AND league_context = ?
+      AND (verified = 1 OR confidence > 0.9)
+    ORDER BY verified DESC, confidence DESC
+    LIMIT 1
+"""
+# Tagesaggregat je Strategie/Erfolg (date('now') entspricht date(attempted_at) der Zeilen)
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO mapping_daily_rollup 
+    (day, strategy_used, success, attempts, sum_confidence, sum_processing_time)
+    VALUES (date('now'), ?, ?, ?, ?, ?)
+    ON CONFLICT(day, strategy_used, success) DO UPDATE SET
+        attempts = attempts + excluded.attempts,
+        sum_confidence = sum_confidence + excluded.sum_confidence,
+        sum_processing_time = sum_processing_time + excluded.sum_processing_time
+"""
+
+# Fertige MappingResults je (Name, Liga, Odds-Liste), LRU
+RESULT_CACHE_SIZE = 10000
+
+# OddsIndex je Odds-Liste (ein Spieltag nutzt dieselbe Liste für alle Teams)
+ODDS_INDEX_CACHE_SIZE = 64
+
+# Normalisierte Teamnamen je Mapper (Rohname -> normalisiert), ältester Eintrag fliegt zuerst
+NORMALIZE_CACHE_SIZE = 4096
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Strategie-Ergebnis (odds_name, confidence, alternatives); MappingResult entsteht erst am Ende
+StrategyMatch = Tuple[str, float, Sequence[str]]
+_NO_MATCH: StrategyMatch = ("", 0.0, ())
+# Ab dieser Konfidenz gilt ein (Fuzzy-)Ergebnis als Treffer
+MATCH_CONFIDENCE_THRESHOLD = 0.3
+
+# Liga-übergreifender Shard der manuellen/gelernten Mappings
+ALL_LEAGUES = "_ALL"
+
+def _compile_normalization_rules(rules: Dict[str, str]) -> Tuple[Dict[int, str], Optional[re.Pattern], Dict[str, str]]:
+    """Split (lowercase) normalization rules into a str.translate table (single characters)
+    and one case-sensitive alternation pattern (everything else), applied to casefolded names"""
+    char_table = {}
+    patterns = []
+    replacements = {}
+    for pattern, replacement in rules.items():
+        if len(pattern) == 1 and pattern.isalpha():
+            char_table[ord(pattern)] = replacement
+        else:
+            group = f"r{len(patterns)}"
+            patterns.append(f"(?P<{group}>{pattern})")
+            replacements[group] = replacement
+    word_pattern = re.compile('|'.join(patterns)) if patterns else None
+    return char_table, word_pattern, replacements
+
+# Text normalization rules for team names (lowercase, matched against casefolded names)
+_NORMALIZATION_RULES: Dict[str, str] = {
+    # Common abbreviations and expansions
+    r'\bfc\b': '',
+    r'\bcf\b': '',
+    r'\bac\b': '',
+    r'\bsc\b': '',
+    r'\basc\b': '',
+    r'\breal\b': 'real',
+    r'\bclub\b': '',
+    r'\batletico\b': 'atletico',
+    r'\bborussia\b': 'borussia',
+    r'\bolympique\b': '',
+    r'\bsporting\b': '',
+    r'\bunited\b': 'utd',
+    r'\bcity\b': 'city',
+    r'\bhotspur\b': '',
+    r'&': 'and',
+    
+    # Accented characters
+    'é': 'e',
+    'è': 'e',
+    'ê': 'e',
+    'ë': 'e',
+    'á': 'a',
+    'à': 'a',
+    'â': 'a',
+    'ã': 'a',
+    'ä': 'a',
+    'í': 'i',
+    'ì': 'i',
+    'î': 'i',
+    'ï': 'i',
+    'ó': 'o',
+    'ò': 'o',
+    'ô': 'o',
+    'õ': 'o',
+    'ö': 'o',
+    'ú': 'u',
+    'ù': 'u',
+    'û': 'u',
+    'ü': 'u',
+    'ç': 'c',
+    'ñ': 'n',
+}
+# Ein translate-Durchlauf für Akzente + eine Regex-Alternation statt ~40 re.sub-Aufrufen
+_COMPILED_NORMALIZATION_RULES = _compile_normalization_rules(_NORMALIZATION_RULES)
+
+def _normalize_team_name(name: str) -> str:
+    """Casefold, strip accents, apply the rule alternation and collapse whitespace"""
+    accent_table, word_pattern, replacements = _COMPILED_NORMALIZATION_RULES
+    # Einmal casefolden: Regeln und Akzent-Tabelle sind klein geschrieben, kein IGNORECASE nötig
+    normalized = name.strip().casefold().translate(accent_table)
+    
+    # Apply normalization rules
+    if word_pattern:
+        normalized = word_pattern.sub(lambda match: replacements[match.lastgroup], normalized)
+    
+    # Clean up extra spaces
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+# Manually curated team name mappings (api_football_name -> odds_api_name), sharded by league
+_MANUAL_MAPPINGS: Dict[str, Dict[str, str]] = {
+    "Premier League": {
+        "Manchester United": "Manchester Utd",
+        "Manchester City": "Manchester City",
+        "Tottenham Hotspur": "Tottenham",
+        "West Ham United": "West Ham",
+        "Newcastle United": "Newcastle",
+        "Aston Villa": "Aston Villa",
+        "Brighton & Hove Albion": "Brighton",
+        "Crystal Palace": "Crystal Palace",
+        "Wolverhampton Wanderers": "Wolves",
+        "Sheffield United": "Sheffield Utd",
+        "Leicester City": "Leicester",
+        "Nottingham Forest": "Nottm Forest",
+    },
+    "La Liga": {
+        "Real Madrid": "Real Madrid",
+        "FC Barcelona": "Barcelona",
+        "Atletico Madrid": "Atl Madrid",
+        "Real Betis": "Real Betis",
+        "Real Sociedad": "Real Sociedad",
+        "Athletic Club": "Athletic Bilbao",
+        "Villarreal CF": "Villarreal",
+        "Valencia CF": "Valencia",
+        "Sevilla FC": "Sevilla",
+        "Real Mallorca": "Mallorca",
+        "Deportivo Alaves": "Deportivo Alavés",
+        "Cadiz CF": "Cádiz",
+        "Celta Vigo": "Celta Vigo",
+    },
+    "Bundesliga": {
+        "Bayern Munich": "Bayern Munich",
+        "Borussia Dortmund": "Dortmund",
+        "RB Leipzig": "RB Leipzig",
+        "Bayer Leverkusen": "Bayer Leverkusen",
+        "Eintracht Frankfurt": "E. Frankfurt",
+        "Borussia Monchengladbach": "B. Monchengladbach",
+        "VfB Stuttgart": "Stuttgart",
+        "SC Freiburg": "Freiburg",
+        "TSG Hoffenheim": "Hoffenheim",
+        "1. FC Koln": "FC Köln",
+        "Hertha Berlin": "Hertha",
+        "VfL Wolfsburg": "Wolfsburg",
+    },
+    "Serie A": {
+        "Juventus": "Juventus",
+        "AC Milan": "AC Milan",
+        "Inter": "Inter Milan",
+        "AS Roma": "AS Roma",
+        "SSC Napoli": "Napoli",
+        "Lazio": "Lazio",
+        "Atalanta": "Atalanta",
+        "Fiorentina": "Fiorentina",
+        "Torino": "Torino",
+        "Bologna": "Bologna",
+        "Udinese": "Udinese",
+        "Sassuolo": "Sassuolo",
+    },
+    "Ligue 1": {
+        "Paris Saint Germain": "PSG",
+        "Olympique Marseille": "Marseille",
+        "Olympique Lyonnais": "Lyon",
+        "AS Monaco": "Monaco",
+        "Lille": "Lille",
+        "Rennes": "Rennes",
+        "OGC Nice": "Nice",
+        "RC Strasbourg Alsace": "Strasbourg",
+        "Montpellier": "Montpellier",
+    },
+}
+
+def _manual_mapping_indexes(mappings: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Normalized-key index (api name -> odds name) and reverse index (odds name -> api name)"""
+    normalized = {_normalize_team_name(api_name): odds_name for api_name, odds_name in mappings.items()}
+    reverse = {odds_name: api_name for api_name, odds_name in mappings.items()}
+    return normalized, reverse
+
+_MANUAL_MAPPINGS_FLAT = {api_name: odds_name
+                         for mappings in _MANUAL_MAPPINGS.values()
+                         for api_name, odds_name in mappings.items()}
+_MANUAL_MAPPINGS_NORMALIZED, _MANUAL_MAPPINGS_REVERSE = _manual_mapping_indexes(_MANUAL_MAPPINGS_FLAT)
+
+def _flush_mapper_at_exit(mapper_ref: "weakref.ref[EnhancedTeamMapper]"):
+    """atexit hook: flush a mapper that is still alive (the weakref doesn't keep it alive)"""
+    mapper = mapper_ref()
+    if mapper is not None:
+        mapper.flush()
+
+def _similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """difflib ratio in [0, 1] between two (already normalized) team names;
+    0.0 once it is known not to exceed score_cutoff"""
+    # difflib bleibt in jeder Umgebung der maßgebliche Scorer (die Schwellwerte sind darauf kalibriert).
+    # rapidfuzz' Indel-Ratio = 2 * LCS / (len(a) + len(b)) ist eine obere Schranke dafür, weil
+    # Ratcliff/Obershelp nur Blöcke einer gemeinsamen Teilfolge zählt (<= LCS) -> nur als Vorfilter
+    if score_cutoff and fuzz and fuzz.ratio(a, b) <= score_cutoff * 100:
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, a, b)
+    # Billige obere Schranken zuerst (real_quick_ratio >= quick_ratio >= ratio), das volle
+    # Block-Matching nur für Kandidaten, die den Schwellwert noch überschreiten können
+    if score_cutoff and (matcher.real_quick_ratio() <= score_cutoff or
+                         matcher.quick_ratio() <= score_cutoff):
+        return 0.0
+    return matcher.ratio()
+
 @dataclass
 class MappingResult:
     """Result of a team name mapping attempt"""
@@ -39,6 +337,28 @@ class MappingResult:
     alternatives: List[str]
     processing_time: float
 
+    def as_dict(self) -> Dict[str, Any]:
+        """Flat dict for _mapping_metadata (dataclasses.asdict deep-copies every field)"""
+        return {
+            'api_football_name': self.api_football_name,
+            'odds_api_name': self.odds_api_name,
+            'confidence': self.confidence,
+            'strategy_used': self.strategy_used,
+            'match_found': self.match_found,
+            'alternatives': list(self.alternatives),
+            'processing_time': self.processing_time,
+        }
+
+@dataclass
+class OddsIndex:
+    """Per odds-list features shared by all strategies (built once per list)"""
+    original: Tuple[str, ...]
+    normalized: List[str]
+    lengths: List[int]
+    tokens: List[frozenset]
+    as_set: frozenset
+    word_to_teams: Dict[str, List[int]]
+
 @dataclass
 class MappingStats:
     """Statistics for mapping performance"""
@@ -50,6 +370,49 @@ class MappingStats:
     strategy_usage: Dict[str, int]
     last_updated: str
 
+class _LearnedMappings:
+    """api_football_name -> odds_api_name, looked up in the database per (league, name) on first use"""
+    
+    def __init__(self, lookup, stored_names):
+        self._lookup = lookup
+        self._stored_names = stored_names
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+        # Negativ-Filter: nur Namen mit gespeicherter Zuordnung kosten eine Datenbankabfrage
+        self._known_names = stored_names()
+    
+    def _cached(self, league: str, api_football_name: str) -> Optional[str]:
+        key = (league, api_football_name)
+        if key not in self._cache:
+            if api_football_name in self._known_names:
+                self._cache[key] = self._lookup(api_football_name, None if league == ALL_LEAGUES else league)
+            else:
+                self._cache[key] = None
+        return self._cache[key]
+    
+    def get(self, api_football_name: str, default: Optional[str] = None,
+            league_context: str = None) -> Optional[str]:
+        # Liga-Shard zuerst, dann liga-übergreifend (wie bei den manuellen Mappings)
+        value = None
+        if league_context is not None:
+            value = self._cached(league_context, api_football_name)
+        if value is None:
+            value = self._cached(ALL_LEAGUES, api_football_name)
+        return default if value is None else value
+    
+    def set(self, api_football_name: str, odds_api_name: str, league_context: str = None):
+        self._known_names.add(api_football_name)
+        self._cache[(ALL_LEAGUES, api_football_name)] = odds_api_name
+        if league_context is not None:
+            self._cache[(league_context, api_football_name)] = odds_api_name
+    
+    def __setitem__(self, api_football_name: str, odds_api_name: str):
+        self.set(api_football_name, odds_api_name)
+    
+    def __len__(self) -> int:
+        # Nur für Reports: gespeicherte plus in dieser Sitzung gelernte Namen
+        learned = {name for (_, name), value in self._cache.items() if value is not None}
+        return len(learned | self._stored_names())
+
 class EnhancedTeamMapper:
     """
     Enhanced team name mapping with multiple strategies and learning capability
@@ -58,125 +421,163 @@ class EnhancedTeamMapper:
     def __init__(self, db_path: str = 'data/football_data.db', learn_mappings: bool = True):
         self.db_path = db_path
         self.learn_mappings = learn_mappings
-        self.manual_mappings = self._load_manual_mappings()
-        self.learned_mappings = self._load_learned_mappings()
-        self.normalization_rules = self._load_normalization_rules()
-        self.stats = self._load_mapping_stats()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Reentrant: _set_learned_mapping fragt unter dem Lock ggf. die Datenbank ab
+        self._lock = threading.RLock()
+        self._pending_attempts: List[tuple] = []
+        # Nicht als Zeile gespeicherte Exact-Match-Treffer: [Anzahl, Summe Konfidenz, Summe Zeit]
+        self._exact_hit_counter = 0
+        self._unrecorded_exact_hits = [0, 0.0, 0.0]
+        # Restpuffer beim Beenden des Prozesses noch schreiben; über eine weakref, damit der
+        # Hook den Mapper nicht bis zum Prozessende am Leben hält
+        self._atexit_hook = functools.partial(_flush_mapper_at_exit, weakref.ref(self))
+        atexit.register(self._atexit_hook)
         
-        # Initialize database for mapping storage
+        # Initialize database for mapping storage (before loading learned mappings/stats from it)
         self._init_mapping_database()
+        
+        self.manual_mappings = self._load_manual_mappings()  # setzt auch die Manual-Indizes
+        self.learned_mappings = self._load_learned_mappings()
+        self.normalization_rules = _NORMALIZATION_RULES
+        self._normalized_cache: Dict[str, str] = {}
+        self._result_cache: "OrderedDict[tuple, Tuple[str, StrategyMatch]]" = OrderedDict()
+        self._odds_index_cache: Dict[Tuple[str, ...], OddsIndex] = {}
+        self.stats = self._load_mapping_stats()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Shared connection for all mapping reads and writes (opened on first use)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=512)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(''.join(f"PRAGMA {name}={value};" for name, value in SQLITE_PRAGMAS.items()))
+            self._conn = conn
+        return self._conn
+    
+    def flush(self):
+        """Write buffered mapping attempts to the database"""
+        try:
+            with self._lock:
+                self._flush_pending()
+        except Exception as e:
+            logger.error(f"Failed to flush mapping attempts: {e}")
+    
+    def _flush_pending(self):
+        # Aufrufer hält self._lock
+        if not self._pending_attempts and not self._unrecorded_exact_hits[0]:
+            return
+        pending, self._pending_attempts = self._pending_attempts, []
+        unrecorded, self._unrecorded_exact_hits = self._unrecorded_exact_hits, [0, 0.0, 0.0]
+        conn = self._connection()
+        try:
+            conn.executemany(_INSERT_ATTEMPT_SQL, [attempt for attempt, _ in pending])
+            # Innerhalb der Schreibtransaktion vergibt AUTOINCREMENT fortlaufende ids,
+            # die letzte id bestimmt damit die ids des ganzen Batches
+            first_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(pending) + 1
+            conn.executemany(_INSERT_ALTERNATIVE_SQL, [
+                (attempt_id, rank, alt_name)
+                for attempt_id, (_, alternatives) in enumerate(pending, start=first_id)
+                for rank, alt_name in enumerate(alternatives)
+            ])
+            rollup = {("exact_match", True): list(unrecorded)} if unrecorded[0] else {}
+            for (_, _, confidence, strategy, success, processing_time, _), _ in pending:
+                totals = rollup.setdefault((strategy, bool(success)), [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += confidence or 0.0
+                totals[2] += processing_time or 0.0
+            conn.executemany(_UPSERT_ROLLUP_SQL, [key + tuple(totals) for key, totals in rollup.items()])
+            conn.commit()
+        except Exception:
+            # Teil-Batch verwerfen (sonst committet ihn der nächste fremde commit()) und die
+            # Puffer für den nächsten Flush wiederherstellen
+            conn.rollback()
+            self._pending_attempts = pending + self._pending_attempts
+            self._unrecorded_exact_hits = [old + new for old, new in
+                                           zip(unrecorded, self._unrecorded_exact_hits)]
+            raise
+    
+    def close(self):
+        """Flush buffered attempts and close the mapping database connection"""
+        self.flush()
+        atexit.unregister(self._atexit_hook)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def _init_mapping_database(self):
         """Initialize database tables for mapping storage"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS team_mappings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    api_football_name TEXT NOT NULL,
-                    odds_api_name TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    strategy_used TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    verified BOOLEAN DEFAULT 0,
-                    league_context TEXT,
-                    UNIQUE(api_football_name, odds_api_name, league_context)
-                );
+            with self._lock:
+                conn = self._connection()
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS team_mappings (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        api_football_name TEXT NOT NULL,
+                        odds_api_name TEXT NOT NULL,
+                        confidence REAL NOT NULL,
+                        strategy_used TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        verified BOOLEAN DEFAULT 0,
+                        league_context TEXT,
+                        UNIQUE(api_football_name, odds_api_name, league_context)
+                    );
                 
-                CREATE TABLE IF NOT EXISTS mapping_attempts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    api_football_name TEXT NOT NULL,
-                    odds_api_name TEXT,
-                    confidence REAL,
-                    strategy_used TEXT,
-                    success BOOLEAN NOT NULL,
-                    processing_time REAL,
-                    alternatives TEXT, -- JSON array
-                    attempted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    league_context TEXT
-                );
+                    CREATE TABLE IF NOT EXISTS mapping_attempts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        api_football_name TEXT NOT NULL,
+                        odds_api_name TEXT,
+                        confidence REAL,
+                        strategy_used TEXT,
+                        success BOOLEAN NOT NULL,
+                        processing_time REAL,
+                        alternatives TEXT, -- JSON array (alt; neue Versuche: mapping_attempt_alternatives)
+                        attempted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        league_context TEXT
+                    );
+                    
+                    CREATE TABLE IF NOT EXISTS mapping_attempt_alternatives (
+                        attempt_id INTEGER NOT NULL REFERENCES mapping_attempts(id),
+                        rank INTEGER NOT NULL,
+                        alt_name TEXT NOT NULL,
+                        PRIMARY KEY (attempt_id, rank)
+                    ) WITHOUT ROWID;
+                    
+                    -- Tagesaggregat für Report und Statistiken (O(Tage) statt O(Versuche))
+                    CREATE TABLE IF NOT EXISTS mapping_daily_rollup (
+                        day DATE NOT NULL,
+                        strategy_used TEXT,
+                        success BOOLEAN NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        sum_confidence REAL NOT NULL DEFAULT 0,
+                        sum_processing_time REAL NOT NULL DEFAULT 0,
+                        PRIMARY KEY (day, strategy_used, success)
+                    );
                 
-                CREATE INDEX IF NOT EXISTS idx_mappings_api_name ON team_mappings(api_football_name);
-                CREATE INDEX IF NOT EXISTS idx_mappings_odds_name ON team_mappings(odds_api_name);
-                CREATE INDEX IF NOT EXISTS idx_attempts_date ON mapping_attempts(attempted_at);
-            """)
-            conn.commit()
-            conn.close()
+                    CREATE INDEX IF NOT EXISTS idx_mappings_api_name ON team_mappings(api_football_name);
+                    CREATE INDEX IF NOT EXISTS idx_mappings_odds_name ON team_mappings(odds_api_name);
+                    -- Covering-Index für die Report-Abfragen (ersetzt idx_attempts_date)
+                    DROP INDEX IF EXISTS idx_attempts_date;
+                    CREATE INDEX IF NOT EXISTS idx_attempts_success_strategy 
+                        ON mapping_attempts(attempted_at, success, strategy_used, confidence);
+                    
+                    -- Einmaliges Backfill bestehender Versuche
+                    INSERT INTO mapping_daily_rollup 
+                    (day, strategy_used, success, attempts, sum_confidence, sum_processing_time)
+                    SELECT date(attempted_at), strategy_used, success, COUNT(*), 
+                           TOTAL(confidence), TOTAL(processing_time)
+                    FROM mapping_attempts
+                    WHERE NOT EXISTS (SELECT 1 FROM mapping_daily_rollup)
+                    GROUP BY date(attempted_at), strategy_used, success;
+                """)
+                conn.commit()
             logger.info("Mapping database initialized")
         except Exception as e:
             logger.error(f"Failed to initialize mapping database: {e}")
     
-    def _load_manual_mappings(self) -> Dict[str, str]:
-        """Load manually curated team name mappings"""
-        manual_mappings = {
-            # Premier League
-            "Manchester United": "Manchester Utd",
-            "Manchester City": "Manchester City",
-            "Tottenham Hotspur": "Tottenham",
-            "West Ham United": "West Ham",
-            "Newcastle United": "Newcastle",
-            "Aston Villa": "Aston Villa",
-            "Brighton & Hove Albion": "Brighton",
-            "Crystal Palace": "Crystal Palace",
-            "Wolverhampton Wanderers": "Wolves",
-            "Sheffield United": "Sheffield Utd",
-            "Leicester City": "Leicester",
-            "Nottingham Forest": "Nottm Forest",
-            
-            # La Liga
-            "Real Madrid": "Real Madrid",
-            "FC Barcelona": "Barcelona",
-            "Atletico Madrid": "Atl Madrid",
-            "Real Betis": "Real Betis",
-            "Real Sociedad": "Real Sociedad",
-            "Athletic Club": "Athletic Bilbao",
-            "Villarreal CF": "Villarreal",
-            "Valencia CF": "Valencia",
-            "Sevilla FC": "Sevilla",
-            "Real Mallorca": "Mallorca",
-            "Deportivo Alaves": "Deportivo Alavés",
-            "Cadiz CF": "Cádiz",
-            "Celta Vigo": "Celta Vigo",
-            
-            # Bundesliga
-            "Bayern Munich": "Bayern Munich",
-            "Borussia Dortmund": "Dortmund",
-            "RB Leipzig": "RB Leipzig",
-            "Bayer Leverkusen": "Bayer Leverkusen",
-            "Eintracht Frankfurt": "E. Frankfurt",
-            "Borussia Monchengladbach": "B. Monchengladbach",
-            "VfB Stuttgart": "Stuttgart",
-            "SC Freiburg": "Freiburg",
-            "TSG Hoffenheim": "Hoffenheim",
-            "1. FC Koln": "FC Köln",
-            "Hertha Berlin": "Hertha",
-            "VfL Wolfsburg": "Wolfsburg",
-            
-            # Serie A
-            "Juventus": "Juventus",
-            "AC Milan": "AC Milan",
-            "Inter": "Inter Milan",
-            "AS Roma": "AS Roma",
-            "SSC Napoli": "Napoli",
-            "Lazio": "Lazio",
-            "Atalanta": "Atalanta",
-            "Fiorentina": "Fiorentina",
-            "Torino": "Torino",
-            "Bologna": "Bologna",
-            "Udinese": "Udinese",
-            "Sassuolo": "Sassuolo",
-            
-            # Ligue 1
-            "Paris Saint Germain": "PSG",
-            "Olympique Marseille": "Marseille",
-            "Olympique Lyonnais": "Lyon",
-            "AS Monaco": "Monaco",
-            "Lille": "Lille",
-            "Rennes": "Rennes",
-            "OGC Nice": "Nice",
-            "RC Strasbourg Alsace": "Strasbourg",
-            "Montpellier": "Montpellier",
-        }
+    def _load_manual_mappings(self) -> Dict[str, Dict[str, str]]:
+        """Load manually curated team name mappings, sharded by league (plus the _ALL catch-all)"""
+        manual_mappings = {league: dict(mappings) for league, mappings in _MANUAL_MAPPINGS.items()}
+        file_loaded = False
         
         # Try to load additional mappings from file
         try:
@@ -184,122 +585,106 @@ class EnhancedTeamMapper:
             if os.path.exists(mapping_file):
                 with open(mapping_file, 'r', encoding='utf-8') as f:
                     file_mappings = json.load(f)
-                manual_mappings.update(file_mappings)
+                # Verschachtelte Einträge {"Liga": {...}} landen im Liga-Shard, flache nur in _ALL
+                file_loaded = True
+                manual_mappings.setdefault(ALL_LEAGUES, {})
+                for key, value in file_mappings.items():
+                    if isinstance(value, dict):
+                        manual_mappings.setdefault(key, {}).update(value)
+                    else:
+                        manual_mappings[ALL_LEAGUES][key] = value
                 logger.info(f"Loaded {len(file_mappings)} additional manual mappings")
         except Exception as e:
             logger.warning(f"Could not load manual mappings file: {e}")
         
+        # _ALL enthält alle Shards (Liga-Einträge zuerst, flache Datei-Einträge überschreiben)
+        flat = {}
+        for league, mappings in manual_mappings.items():
+            if league != ALL_LEAGUES:
+                flat.update(mappings)
+        flat.update(manual_mappings.get(ALL_LEAGUES, {}))
+        manual_mappings[ALL_LEAGUES] = flat
+        
+        # Indizes der eingebauten Tabelle stehen schon beim Import bereit, nur Datei-Overrides neu bauen
+        if file_loaded:
+            self._manual_by_normalized, self._manual_reverse = _manual_mapping_indexes(flat)
+        else:
+            self._manual_by_normalized, self._manual_reverse = \
+                _MANUAL_MAPPINGS_NORMALIZED, _MANUAL_MAPPINGS_REVERSE
         return manual_mappings
     
-    def _load_learned_mappings(self) -> Dict[str, str]:
-        """Load previously learned team name mappings from database"""
-        learned = {}
+    def _load_learned_mappings(self) -> _LearnedMappings:
+        """Previously learned team name mappings, loaded lazily per team name"""
+        # Kein Voll-Load beim Start: jeder Name kostet eine indizierte Abfrage beim ersten Nachschlagen
+        return _LearnedMappings(self._lookup_learned_mapping, self._stored_learned_names)
+    
+    def _lookup_learned_mapping(self, api_football_name: str, league_context: str = None) -> Optional[str]:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.execute("""
-                SELECT api_football_name, odds_api_name 
-                FROM team_mappings 
-                WHERE verified = 1 OR confidence > 0.9
-                ORDER BY confidence DESC
-            """)
-            
-            for row in cursor.fetchall():
-                learned[row[0]] = row[1]
-                
-            conn.close()
-            logger.info(f"Loaded {len(learned)} learned mappings from database")
+            with self._lock:
+                if league_context is None:
+                    row = self._connection().execute(
+                        _LOOKUP_LEARNED_SQL, (api_football_name,)).fetchone()
+                else:
+                    row = self._connection().execute(
+                        _LOOKUP_LEARNED_IN_LEAGUE_SQL, (api_football_name, league_context)).fetchone()
+            return row[0] if row else None
         except Exception as e:
-            logger.warning(f"Could not load learned mappings: {e}")
-        
-        return learned
+            logger.warning(f"Could not load learned mapping for {api_football_name}: {e}")
+            return None
     
-    def _load_normalization_rules(self) -> Dict[str, str]:
-        """Load text normalization rules for team names"""
-        return {
-            # Common abbreviations and expansions
-            r'\bFC\b': '',
-            r'\bCF\b': '',
-            r'\bAC\b': '',
-            r'\bSC\b': '',
-            r'\bASC\b': '',
-            r'\bReal\b': 'Real',
-            r'\bClub\b': '',
-            r'\bAtletico\b': 'Atletico',
-            r'\bBorussia\b': 'Borussia',
-            r'\bOlympique\b': '',
-            r'\bSporting\b': '',
-            r'\bUnited\b': 'Utd',
-            r'\bCity\b': 'City',
-            r'\bHotspur\b': '',
-            r'&': 'and',
-            
-            # Accented characters
-            'é': 'e',
-            'è': 'e',
-            'ê': 'e',
-            'ë': 'e',
-            'á': 'a',
-            'à': 'a',
-            'â': 'a',
-            'ã': 'a',
-            'ä': 'a',
-            'í': 'i',
-            'ì': 'i',
-            'î': 'i',
-            'ï': 'i',
-            'ó': 'o',
-            'ò': 'o',
-            'ô': 'o',
-            'õ': 'o',
-            'ö': 'o',
-            'ú': 'u',
-            'ù': 'u',
-            'û': 'u',
-            'ü': 'u',
-            'ç': 'c',
-            'ñ': 'n',
-        }
+    def _stored_learned_names(self) -> set:
+        try:
+            with self._lock:
+                cursor = self._connection().execute("""
+                    SELECT DISTINCT api_football_name 
+                    FROM team_mappings 
+                    WHERE verified = 1 OR confidence > 0.9
+                """)
+                return {row[0] for row in cursor}
+        except Exception as e:
+            logger.warning(f"Could not load learned mappings: {e}")
+            return set()
     
     def _load_mapping_stats(self) -> MappingStats:
         """Load mapping statistics from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_attempts,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                    SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
-                    AVG(CASE WHEN success = 1 THEN confidence END) as avg_confidence
-                FROM mapping_attempts
-            """)
-            
-            row = cursor.fetchone()
-            if row and row[0] > 0:
-                total, successful, failed, avg_conf = row
-                success_rate = successful / total if total > 0 else 0.0
-                
-                # Get strategy usage
+            with self._lock:
+                conn = self._connection()
                 cursor = conn.execute("""
-                    SELECT strategy_used, COUNT(*) 
-                    FROM mapping_attempts 
-                    WHERE success = 1 
-                    GROUP BY strategy_used
+                    SELECT 
+                        COALESCE(SUM(attempts), 0) as total_attempts,
+                        SUM(CASE WHEN success = 1 THEN attempts ELSE 0 END) as successful,
+                        SUM(CASE WHEN success = 0 THEN attempts ELSE 0 END) as failed,
+                        SUM(CASE WHEN success = 1 THEN sum_confidence END) 
+                            / SUM(CASE WHEN success = 1 THEN attempts END) as avg_confidence
+                    FROM mapping_daily_rollup
                 """)
-                strategy_usage = dict(cursor.fetchall())
+            
+                row = cursor.fetchone()
+                if row and row[0] > 0:
+                    total, successful, failed, avg_conf = row
+                    success_rate = successful / total if total > 0 else 0.0
                 
-                stats = MappingStats(
-                    total_attempts=total,
-                    successful_mappings=successful,
-                    failed_mappings=failed,
-                    success_rate=success_rate,
-                    avg_confidence=avg_conf or 0.0,
-                    strategy_usage=strategy_usage,
-                    last_updated=datetime.now().isoformat()
-                )
-            else:
-                stats = MappingStats(0, 0, 0, 0.0, 0.0, {}, datetime.now().isoformat())
+                    # Get strategy usage
+                    cursor = conn.execute("""
+                        SELECT strategy_used, SUM(attempts) 
+                        FROM mapping_daily_rollup 
+                        WHERE success = 1 
+                        GROUP BY strategy_used
+                    """)
+                    strategy_usage = dict(cursor.fetchall())
                 
-            conn.close()
+                    stats = MappingStats(
+                        total_attempts=total,
+                        successful_mappings=successful,
+                        failed_mappings=failed,
+                        success_rate=success_rate,
+                        avg_confidence=avg_conf or 0.0,
+                        strategy_usage=strategy_usage,
+                        last_updated=datetime.now().isoformat()
+                    )
+                else:
+                    stats = MappingStats(0, 0, 0, 0.0, 0.0, {}, datetime.now().isoformat())
             return stats
             
         except Exception as e:
@@ -311,15 +696,15 @@ class EnhancedTeamMapper:
         if not name:
             return ""
         
-        normalized = name.strip()
-        
-        # Apply normalization rules
-        for pattern, replacement in self.normalization_rules.items():
-            normalized = re.sub(pattern, replacement, normalized, flags=re.IGNORECASE)
+        cached = self._normalized_cache.get(name)
+        if cached is not None:
+            return cached
         
-        # Clean up extra spaces and convert to lowercase
-        normalized = re.sub(r'\s+', ' ', normalized).strip().lower()
+        normalized = _normalize_team_name(name)
         
+        if len(self._normalized_cache) >= NORMALIZE_CACHE_SIZE:
+            self._normalized_cache.pop(next(iter(self._normalized_cache)))
+        self._normalized_cache[name] = normalized
         return normalized
     
     def find_team_mapping(self, api_football_name: str, odds_api_teams: List[str], 
@@ -335,321 +720,355 @@ class EnhancedTeamMapper:
         Returns:
             MappingResult with best match and metadata
         """
-        start_time = datetime.now()
-        
-        # Strategy 1: Exact Match
-        result = self._strategy_exact_match(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 1.0:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        start_time = time.perf_counter()
         
-        # Strategy 2: Manual Mapping Table
-        result = self._strategy_manual_mapping(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.95:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        # Gleiche Anfrage (Name, Liga, Odds-Liste) -> gleiches Ergebnis, solange sich die
+        # gelernten Mappings für den Namen nicht ändern
+        odds_key = tuple(odds_api_teams)
+        cache_key = (api_football_name, league_context, odds_key)
+        matched = self._cached_result(cache_key)
+        if matched is None:
+            matched = self._match_strategies(api_football_name, odds_key, league_context)
+            self._cache_result(cache_key, matched)
         
-        # Strategy 3: Learned Mappings
-        result = self._strategy_learned_mapping(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.9:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        result = self._mapping_result(api_football_name, matched, time.perf_counter() - start_time)
+        self._record_mapping_attempt(result, league_context)
+        return result
+    
+    def find_team_mappings_batch(self, api_football_names: List[str], odds_api_teams: List[str],
+                                 league_context: str = None) -> List[MappingResult]:
+        """
+        Map several team names against the same odds list (e.g. a whole fixture list)
         
-        # Strategy 4: Normalized String Matching
-        result = self._strategy_normalized_matching(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.85:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        Strategies 1-6 run per name; the fuzzy tier pre-filters all remaining names in one
+        rapidfuzz similarity matrix before difflib scores the candidates.
+        processing_time is the batch average per name.
+        """
+        start_time = time.perf_counter()
+        odds_key = tuple(odds_api_teams)
+        index = self._odds_index(odds_key)
         
-        # Strategy 5: Substring Matching
-        result = self._strategy_substring_matching(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.75:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        results: List[Optional[Tuple[str, StrategyMatch]]] = []
+        # Name -> Positionen, die noch die Fuzzy-Stufe brauchen (doppelte Namen nur einmal bewerten)
+        fuzzy_positions: Dict[str, List[int]] = {}
+        for position, api_name in enumerate(api_football_names):
+            cached = None
+            if api_name not in fuzzy_positions:
+                cache_key = (api_name, league_context, odds_key)
+                cached = self._cached_result(cache_key)
+                if cached is None:
+                    cached = self._match_before_fuzzy(api_name, index, league_context)
+                    if cached is not None:
+                        self._cache_result(cache_key, cached)
+            if cached is None:
+                fuzzy_positions.setdefault(api_name, []).append(position)
+            results.append(cached)
         
-        # Strategy 6: Word-based Matching
-        result = self._strategy_word_based_matching(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.7:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
-            self._record_mapping_attempt(result, league_context)
-            return result
+        if fuzzy_positions:
+            fuzzy_names = list(fuzzy_positions)
+            for api_name, match in zip(fuzzy_names, self._fuzzy_batch(fuzzy_names, index)):
+                cached = ("fuzzy_matching", match)
+                self._cache_result((api_name, league_context, odds_key), cached)
+                for position in fuzzy_positions[api_name]:
+                    results[position] = cached
         
-        # Strategy 7: Fuzzy String Matching
-        result = self._strategy_fuzzy_matching(api_football_name, odds_api_teams)
-        if result.match_found and result.confidence >= 0.6:
-            result.processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = (time.perf_counter() - start_time) / max(len(api_football_names), 1)
+        mapped = []
+        for api_name, cached in zip(api_football_names, results):
+            result = self._mapping_result(api_name, cached, processing_time)
             self._record_mapping_attempt(result, league_context)
-            return result
-        
-        # No match found - return best attempt from fuzzy matching
-        result.processing_time = (datetime.now() - start_time).total_seconds()
-        self._record_mapping_attempt(result, league_context)
-        return result
+            mapped.append(result)
+        return mapped
     
-    def _strategy_exact_match(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 1: Exact string matching"""
-        for odds_name in odds_teams:
-            if api_name == odds_name:
-                return MappingResult(
-                    api_football_name=api_name,
-                    odds_api_name=odds_name,
-                    confidence=1.0,
-                    strategy_used="exact_match",
-                    match_found=True,
-                    alternatives=[],
-                    processing_time=0.0
-                )
-        
+    def reverse_manual_mapping(self, odds_api_name: str) -> Optional[str]:
+        """API-Football name for an Odds API name from the manual mapping table (None if unknown)"""
+        return self._manual_reverse.get(odds_api_name)
+    
+    @staticmethod
+    def _mapping_result(api_name: str, matched: Tuple[str, StrategyMatch],
+                        processing_time: float) -> MappingResult:
+        strategy, (odds_name, confidence, alternatives) = matched
         return MappingResult(
             api_football_name=api_name,
-            odds_api_name="",
-            confidence=0.0,
-            strategy_used="exact_match",
-            match_found=False,
-            alternatives=[],
-            processing_time=0.0
+            odds_api_name=odds_name,
+            confidence=confidence,
+            strategy_used=strategy,
+            match_found=confidence >= MATCH_CONFIDENCE_THRESHOLD,
+            alternatives=list(alternatives),
+            processing_time=processing_time
         )
     
-    def _strategy_manual_mapping(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 2: Manual mapping table lookup"""
-        mapped_name = self.manual_mappings.get(api_name)
-        
-        if mapped_name and mapped_name in odds_teams:
-            return MappingResult(
-                api_football_name=api_name,
-                odds_api_name=mapped_name,
-                confidence=0.95,
-                strategy_used="manual_mapping",
-                match_found=True,
-                alternatives=[],
-                processing_time=0.0
-            )
+    def _cached_result(self, cache_key: tuple) -> Optional[Tuple[str, StrategyMatch]]:
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+        return cached
+    
+    def _cache_result(self, cache_key: tuple, result: Tuple[str, StrategyMatch]):
+        self._result_cache[cache_key] = result
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def _match_strategies(self, api_football_name: str, odds_api_teams: Tuple[str, ...],
+                          league_context: str = None) -> Tuple[str, StrategyMatch]:
+        """Run the strategy chain and return (strategy, match) of the first match that clears its threshold"""
+        index = self._odds_index(odds_api_teams)
+        matched = self._match_before_fuzzy(api_football_name, index, league_context)
+        if matched is not None:
+            return matched
         
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name="",
-            confidence=0.0,
-            strategy_used="manual_mapping",
-            match_found=False,
-            alternatives=[],
-            processing_time=0.0
-        )
+        # Strategy 7: Fuzzy String Matching
+        # (also the best attempt when no strategy matched)
+        return "fuzzy_matching", self._strategy_fuzzy_matching(api_football_name, index)
     
-    def _strategy_learned_mapping(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 3: Previously learned mappings"""
-        learned_name = self.learned_mappings.get(api_name)
-        
-        if learned_name and learned_name in odds_teams:
-            return MappingResult(
-                api_football_name=api_name,
-                odds_api_name=learned_name,
-                confidence=0.9,
-                strategy_used="learned_mapping",
-                match_found=True,
-                alternatives=[],
-                processing_time=0.0
+    def _match_before_fuzzy(self, api_football_name: str, index: OddsIndex,
+                            league_context: str = None) -> Optional[Tuple[str, StrategyMatch]]:
+        """Strategies 1-6; None if none of them clears its threshold"""
+        # Strategy 1: Exact Match
+        match = self._strategy_exact_match(api_football_name, index.as_set)
+        if match[1] >= 1.0:
+            return "exact_match", match
+        
+        # Strategy 2: Manual Mapping Table
+        match = self._strategy_manual_mapping(api_football_name, index.as_set, league_context)
+        if match[1] >= 0.95:
+            return "manual_mapping", match
+        
+        # Strategy 3: Learned Mappings
+        match = self._strategy_learned_mapping(api_football_name, index.as_set, league_context)
+        if match[1] >= 0.9:
+            return "learned_mapping", match
+        
+        # Strategies 4-6: Normalized, Substring and Word-based Matching (one pass)
+        return self._strategy_single_pass(api_football_name, index)
+    
+    def _odds_index(self, odds_key: Tuple[str, ...]) -> OddsIndex:
+        """Normalize, measure and tokenize an odds list once (cached per list content)"""
+        index = self._odds_index_cache.get(odds_key)
+        if index is None:
+            normalized = [self.normalize_team_name(odds_name) for odds_name in odds_key]
+            tokens = [frozenset(name.split()) for name in normalized]
+            # Inverted index word -> positions in the odds list
+            word_to_teams: Dict[str, List[int]] = {}
+            for position, words in enumerate(tokens):
+                for word in words:
+                    word_to_teams.setdefault(word, []).append(position)
+            index = OddsIndex(
+                original=odds_key,
+                normalized=normalized,
+                lengths=[len(name) for name in normalized],
+                tokens=tokens,
+                as_set=frozenset(odds_key),
+                word_to_teams=word_to_teams
             )
+            self._odds_index_cache[odds_key] = index
+            if len(self._odds_index_cache) > ODDS_INDEX_CACHE_SIZE:
+                self._odds_index_cache.pop(next(iter(self._odds_index_cache)))
+        return index
+    
+    def _strategy_exact_match(self, api_name: str, odds_set: frozenset) -> StrategyMatch:
+        """Strategy 1: Exact string matching"""
+        if api_name in odds_set:
+            return api_name, 1.0, ()
         
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name="",
-            confidence=0.0,
-            strategy_used="learned_mapping",
-            match_found=False,
-            alternatives=[],
-            processing_time=0.0
-        )
+        return _NO_MATCH
     
-    def _strategy_normalized_matching(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 4: Normalized string matching"""
-        normalized_api = self.normalize_team_name(api_name)
+    def _strategy_manual_mapping(self, api_name: str, odds_set: frozenset,
+                                 league_context: str = None) -> StrategyMatch:
+        """Strategy 2: Manual mapping table lookup (league shard first, then _ALL)"""
+        mapped_name = self.manual_mappings.get(league_context, {}).get(api_name)
+        if mapped_name is None:
+            mapped_name = self.manual_mappings[ALL_LEAGUES].get(api_name)
+        if mapped_name is None:
+            # Schreibvarianten (Groß-/Kleinschreibung, Leerzeichen, Akzente) über den normalisierten Schlüssel
+            mapped_name = self._manual_by_normalized.get(self.normalize_team_name(api_name))
         
-        best_match = ""
-        best_confidence = 0.0
+        if mapped_name and mapped_name in odds_set:
+            return mapped_name, 0.95, ()
         
-        for odds_name in odds_teams:
-            normalized_odds = self.normalize_team_name(odds_name)
-            
-            if normalized_api == normalized_odds:
-                confidence = 0.85
-                if confidence > best_confidence:
-                    best_match = odds_name
-                    best_confidence = confidence
+        return _NO_MATCH
+    
+    def _strategy_learned_mapping(self, api_name: str, odds_set: frozenset,
+                                  league_context: str = None) -> StrategyMatch:
+        """Strategy 3: Previously learned mappings"""
+        learned_name = self.learned_mappings.get(api_name, league_context=league_context)
         
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name=best_match,
-            confidence=best_confidence,
-            strategy_used="normalized_matching",
-            match_found=best_confidence > 0,
-            alternatives=[],
-            processing_time=0.0
-        )
+        if learned_name and learned_name in odds_set:
+            return learned_name, 0.9, ()
+        
+        return _NO_MATCH
     
-    def _strategy_substring_matching(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 5: Substring matching"""
+    def _strategy_single_pass(self, api_name: str, index: OddsIndex) -> Optional[Tuple[str, StrategyMatch]]:
+        """Strategies 4-6 in one pass over the odds list; first tier that clears its threshold wins"""
         normalized_api = self.normalize_team_name(api_name)
+        api_length = len(normalized_api)
+        api_words = set(normalized_api.split())
+        api_word_count = len(api_words)
+        
+        # Strategy 6: Schnittmengen zählt der invertierte Index (Wörter je Team sind eindeutig),
+        # die Vereinigung folgt als |A| + |B| - |A ∩ B|; alle anderen Teams haben Jaccard 0
+        intersections: Dict[int, int] = {}
+        for word in api_words:
+            for position in index.word_to_teams.get(word, ()):
+                intersections[position] = intersections.get(position, 0) + 1
         
-        best_match = ""
-        best_confidence = 0.0
-        alternatives = []
+        substring_match = ""
+        substring_confidence = 0.0
+        substring_alternatives = []
+        word_match = ""
+        word_confidence = 0.0
+        word_alternatives = []
         
-        for odds_name in odds_teams:
-            normalized_odds = self.normalize_team_name(odds_name)
+        for position, normalized_odds in enumerate(index.normalized):
+            # Strategy 4: Normalized string matching (höchste Stufe, der erste Treffer gewinnt)
+            if normalized_api == normalized_odds:
+                return "normalized_matching", (index.original[position], 0.85, ())
             
-            # Check if API name contains odds name or vice versa
-            if normalized_api in normalized_odds or normalized_odds in normalized_api:
+            # Strategy 5: API name contains odds name or vice versa
+            if api_length > 0 and (normalized_api in normalized_odds or normalized_odds in normalized_api):
                 # Calculate confidence based on length ratio
-                if len(normalized_api) > 0:
-                    overlap = min(len(normalized_api), len(normalized_odds))
-                    total = max(len(normalized_api), len(normalized_odds))
-                    confidence = (overlap / total) * 0.75
-                    
-                    if confidence > best_confidence:
-                        if best_match:
-                            alternatives.append(best_match)
-                        best_match = odds_name
-                        best_confidence = confidence
-                    elif confidence > 0.5:
-                        alternatives.append(odds_name)
-        
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name=best_match,
-            confidence=best_confidence,
-            strategy_used="substring_matching",
-            match_found=best_confidence > 0,
-            alternatives=alternatives[:3],  # Limit alternatives
-            processing_time=0.0
-        )
-    
-    def _strategy_word_based_matching(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 6: Word-based matching"""
-        api_words = set(self.normalize_team_name(api_name).split())
-        
-        best_match = ""
-        best_confidence = 0.0
-        alternatives = []
-        
-        for odds_name in odds_teams:
-            odds_words = set(self.normalize_team_name(odds_name).split())
+                odds_length = index.lengths[position]
+                confidence = (min(api_length, odds_length) / max(api_length, odds_length)) * 0.75
+                
+                if confidence > substring_confidence:
+                    if substring_match:
+                        substring_alternatives.append(substring_match)
+                    substring_match = index.original[position]
+                    substring_confidence = confidence
+                elif confidence > 0.5:
+                    substring_alternatives.append(index.original[position])
             
-            if api_words and odds_words:
-                # Calculate Jaccard similarity
-                intersection = len(api_words.intersection(odds_words))
-                union = len(api_words.union(odds_words))
+            # Strategy 6: Jaccard similarity of the word sets
+            intersection = intersections.get(position)
+            if intersection:
+                union = api_word_count + len(index.tokens[position]) - intersection
+                confidence = (intersection / union) * 0.7
                 
-                if union > 0:
-                    jaccard_similarity = intersection / union
-                    confidence = jaccard_similarity * 0.7
-                    
-                    if confidence > best_confidence and confidence > 0.3:
-                        if best_match:
-                            alternatives.append(best_match)
-                        best_match = odds_name
-                        best_confidence = confidence
-                    elif confidence > 0.3:
-                        alternatives.append(odds_name)
+                if confidence > word_confidence and confidence > 0.3:
+                    if word_match:
+                        word_alternatives.append(word_match)
+                    word_match = index.original[position]
+                    word_confidence = confidence
+                elif confidence > 0.3:
+                    word_alternatives.append(index.original[position])
         
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name=best_match,
-            confidence=best_confidence,
-            strategy_used="word_based_matching",
-            match_found=best_confidence > 0,
-            alternatives=alternatives[:3],
-            processing_time=0.0
-        )
+        if substring_confidence >= 0.75:
+            return "substring_matching", (substring_match, substring_confidence, substring_alternatives[:3])
+        if word_confidence >= 0.7:
+            return "word_based_matching", (word_match, word_confidence, word_alternatives[:3])
+        return None
     
-    def _strategy_fuzzy_matching(self, api_name: str, odds_teams: List[str]) -> MappingResult:
-        """Strategy 7: Fuzzy string matching using difflib"""
+    def _strategy_fuzzy_matching(self, api_name: str, index: OddsIndex) -> StrategyMatch:
+        """Strategy 7: Fuzzy string matching (difflib, rapidfuzz only pre-filters candidates)"""
         normalized_api = self.normalize_team_name(api_name)
         
-        best_matches = []
+        if process:
+            # Ein C-Aufruf über die ganze Liste: Indel-Ratio >= difflib-Ratio, unter 40 kann
+            # kein Kandidat die Schwelle erreichen
+            matches = process.extract(normalized_api, index.normalized,
+                                      scorer=fuzz.ratio, limit=None, score_cutoff=40)
+            positions = sorted(position for _, _, position in matches)
+        else:
+            api_length = len(normalized_api)
+            # ratio() <= 2 * min / (la + lb): zu unterschiedliche Längen erreichen 0.4 nie
+            positions = [position for position, odds_length in enumerate(index.lengths)
+                         if 2 * min(api_length, odds_length) >= 0.4 * (api_length + odds_length)]
         
-        for odds_name in odds_teams:
-            normalized_odds = self.normalize_team_name(odds_name)
-            
-            # Use difflib's sequence matcher
-            similarity = difflib.SequenceMatcher(None, normalized_api, normalized_odds).ratio()
+        return self._fuzzy_result(self._fuzzy_matches(normalized_api, index, positions))
+    
+    @staticmethod
+    def _fuzzy_matches(normalized_api: str, index: OddsIndex, positions) -> List[Tuple[str, float]]:
+        """(odds name, difflib ratio) of the candidate positions above 0.4, best first"""
+        best_matches = []
+        for position in positions:
+            similarity = _similarity(normalized_api, index.normalized[position], score_cutoff=0.4)
             
             if similarity > 0.4:  # Minimum threshold
-                best_matches.append((odds_name, similarity))
+                best_matches.append((index.original[position], similarity))
         
-        # Sort by similarity
+        # Sort by similarity (stabil: bei Gleichstand gewinnt die frühere Position)
         best_matches.sort(key=lambda x: x[1], reverse=True)
+        return best_matches
+    
+    def _fuzzy_batch(self, api_names: List[str], index: OddsIndex) -> List[StrategyMatch]:
+        """Strategy 7 for many names at once: one N x M rapidfuzz matrix (OpenMP-parallel) as pre-filter"""
+        if not process or np is None or not index.normalized:
+            return [self._strategy_fuzzy_matching(api_name, index) for api_name in api_names]
+        
+        normalized_apis = [self.normalize_team_name(api_name) for api_name in api_names]
+        # Werte unter score_cutoff setzt cdist auf 0; difflib bewertet danach nur die Kandidaten
+        scores = process.cdist(normalized_apis, index.normalized, scorer=fuzz.ratio,
+                               score_cutoff=40, dtype=np.float64, workers=-1)
         
+        return [self._fuzzy_result(self._fuzzy_matches(normalized_api, index,
+                                                       np.flatnonzero(row >= 40).tolist()))
+                for normalized_api, row in zip(normalized_apis, scores)]
+    
+    @staticmethod
+    def _fuzzy_result(best_matches: List[Tuple[str, float]]) -> StrategyMatch:
         if best_matches:
             best_match, similarity = best_matches[0]
             confidence = similarity * 0.6  # Scale down for fuzzy matching
             alternatives = [match[0] for match in best_matches[1:4]]  # Top 3 alternatives
-            
-            return MappingResult(
-                api_football_name=api_name,
-                odds_api_name=best_match,
-                confidence=confidence,
-                strategy_used="fuzzy_matching",
-                match_found=confidence >= 0.3,
-                alternatives=alternatives,
-                processing_time=0.0
-            )
+            return best_match, confidence, alternatives
         
-        return MappingResult(
-            api_football_name=api_name,
-            odds_api_name="",
-            confidence=0.0,
-            strategy_used="fuzzy_matching",
-            match_found=False,
-            alternatives=[],
-            processing_time=0.0
-        )
+        return _NO_MATCH
+    
+    def _set_learned_mapping(self, api_football_name: str, odds_api_name: str,
+                             league_context: str = None):
+        if self.learned_mappings.get(api_football_name, league_context=league_context) == odds_api_name:
+            return
+        self.learned_mappings.set(api_football_name, odds_api_name, league_context)
+        # Gecachte Ergebnisse für diesen Namen wären jetzt veraltet (learned_mapping greift vor 4-7)
+        for key in [key for key in self._result_cache if key[0] == api_football_name]:
+            del self._result_cache[key]
     
     def _record_mapping_attempt(self, result: MappingResult, league_context: str = None):
         """Record mapping attempt in database for learning and statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("""
-                INSERT INTO mapping_attempts 
-                (api_football_name, odds_api_name, confidence, strategy_used, success, 
-                 processing_time, alternatives, league_context)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result.api_football_name,
-                result.odds_api_name if result.match_found else None,
-                result.confidence,
-                result.strategy_used,
-                result.match_found,
-                result.processing_time,
-                json.dumps(result.alternatives),
-                league_context
-            ))
-            
-            # If high confidence match and learning enabled, store as learned mapping
-            if (self.learn_mappings and result.match_found and 
-                result.confidence >= 0.8 and result.strategy_used != "learned_mapping"):
+            with self._lock:
+                # Exact Matches sind der billige Normalfall: nur Stichprobe als Zeile, Rest ins
+                # Tagesaggregat (gelernt wird dabei nichts, Tier 1 greift ohnehin vor Tier 3)
+                if result.strategy_used == "exact_match" and result.match_found:
+                    self._exact_hit_counter += 1
+                    if self._exact_hit_counter % EXACT_MATCH_SAMPLE_RATE != 0:
+                        self._unrecorded_exact_hits[0] += 1
+                        self._unrecorded_exact_hits[1] += result.confidence
+                        self._unrecorded_exact_hits[2] += result.processing_time
+                        return
                 
-                conn.execute("""
-                    INSERT OR REPLACE INTO team_mappings 
-                    (api_football_name, odds_api_name, confidence, strategy_used, league_context)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
+                self._pending_attempts.append(((
                     result.api_football_name,
-                    result.odds_api_name,
+                    result.odds_api_name if result.match_found else None,
                     result.confidence,
                     result.strategy_used,
+                    result.match_found,
+                    result.processing_time,
                     league_context
-                ))
+                ), result.alternatives))
                 
-                # Update learned mappings cache
-                self.learned_mappings[result.api_football_name] = result.odds_api_name
-            
-            conn.commit()
-            conn.close()
+                # If high confidence match and learning enabled, store as learned mapping
+                # (selten, daher sofort statt gepuffert)
+                if (self.learn_mappings and result.match_found and 
+                    result.confidence >= 0.8 and result.strategy_used != "learned_mapping"):
+                    
+                    conn = self._connection()
+                    conn.execute(_UPSERT_LEARNED_MAPPING_SQL, (
+                        result.api_football_name,
+                        result.odds_api_name,
+                        result.confidence,
+                        result.strategy_used,
+                        league_context
+                    ))
+                
+                    conn.commit()
+                    
+                    # Update learned mappings cache
+                    self._set_learned_mapping(result.api_football_name, result.odds_api_name,
+                                              league_context)
+                
+                if len(self._pending_attempts) >= ATTEMPT_FLUSH_THRESHOLD:
+                    self._flush_pending()
             
         except Exception as e:
             logger.error(f"Failed to record mapping attempt: {e}")
@@ -657,75 +1076,88 @@ class EnhancedTeamMapper:
     def get_mapping_report(self, days: int = 7) -> Dict[str, Any]:
         """Generate mapping performance report"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            
-            # Get statistics for the last N days
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            with self._lock:
+                self._flush_pending()
+                conn = self._connection()
+                
+                # Get statistics for the last N days
+                cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+                # Tagesaggregat: ganze Kalendertage (UTC) ab dem Stichtag
+                cutoff_day = f'-{days} days'
             
-            # Overall statistics
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_attempts,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                    AVG(CASE WHEN success = 1 THEN confidence END) as avg_confidence,
-                    AVG(processing_time) as avg_processing_time
-                FROM mapping_attempts 
-                WHERE attempted_at >= ?
-            """, (cutoff_date,))
+                # Overall statistics
+                cursor = conn.execute("""
+                    SELECT 
+                        COALESCE(SUM(attempts), 0) as total_attempts,
+                        SUM(CASE WHEN success = 1 THEN attempts ELSE 0 END) as successful,
+                        SUM(CASE WHEN success = 1 THEN sum_confidence END) 
+                            / SUM(CASE WHEN success = 1 THEN attempts END) as avg_confidence,
+                        SUM(sum_processing_time) / SUM(attempts) as avg_processing_time
+                    FROM mapping_daily_rollup 
+                    WHERE day >= date('now', ?)
+                """, (cutoff_day,))
             
-            stats = dict(cursor.fetchone())
-            success_rate = (stats['successful'] / stats['total_attempts'] 
-                          if stats['total_attempts'] > 0 else 0.0)
+                stats = dict(cursor.fetchone())
+                success_rate = (stats['successful'] / stats['total_attempts'] 
+                              if stats['total_attempts'] > 0 else 0.0)
             
-            # Strategy performance
-            cursor = conn.execute("""
-                SELECT strategy_used, 
-                       COUNT(*) as attempts,
-                       SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successes,
-                       AVG(CASE WHEN success = 1 THEN confidence END) as avg_confidence
-                FROM mapping_attempts 
-                WHERE attempted_at >= ?
-                GROUP BY strategy_used
-                ORDER BY successes DESC
-            """, (cutoff_date,))
+                # Strategy performance
+                cursor = conn.execute("""
+                    SELECT strategy_used, 
+                           SUM(attempts) as attempts,
+                           SUM(CASE WHEN success = 1 THEN attempts ELSE 0 END) as successes,
+                           SUM(CASE WHEN success = 1 THEN sum_confidence END) 
+                               / SUM(CASE WHEN success = 1 THEN attempts END) as avg_confidence
+                    FROM mapping_daily_rollup 
+                    WHERE day >= date('now', ?)
+                    GROUP BY strategy_used
+                    ORDER BY successes DESC
+                """, (cutoff_day,))
             
-            strategy_stats = []
-            for row in cursor.fetchall():
-                row_dict = dict(row)
-                row_dict['success_rate'] = (row_dict['successes'] / row_dict['attempts'] 
-                                          if row_dict['attempts'] > 0 else 0.0)
-                strategy_stats.append(row_dict)
+                strategy_stats = []
+                for row in cursor.fetchall():
+                    row_dict = dict(row)
+                    row_dict['success_rate'] = (row_dict['successes'] / row_dict['attempts'] 
+                                              if row_dict['attempts'] > 0 else 0.0)
+                    strategy_stats.append(row_dict)
             
-            # Failed mappings for review
-            cursor = conn.execute("""
-                SELECT api_football_name, alternatives, league_context, COUNT(*) as failure_count
-                FROM mapping_attempts 
-                WHERE success = 0 AND attempted_at >= ?
-                GROUP BY api_football_name, alternatives, league_context
-                ORDER BY failure_count DESC
-                LIMIT 20
-            """, (cutoff_date,))
+                # Failed mappings for review
+                # (Alternativen je Versuch in Rang-Reihenfolge, mit char(31) verbunden)
+                cursor = conn.execute("""
+                    SELECT m.api_football_name,
+                           (SELECT GROUP_CONCAT(alt_name, char(31)) FROM (
+                                SELECT alt_name FROM mapping_attempt_alternatives
+                                WHERE attempt_id = m.id ORDER BY rank
+                           )) as alt_names,
+                           m.league_context, COUNT(*) as failure_count
+                    FROM mapping_attempts m
+                    WHERE m.success = 0 AND m.attempted_at >= ?
+                    GROUP BY m.api_football_name, alt_names, m.league_context
+                    ORDER BY failure_count DESC
+                    LIMIT 20
+                """, (cutoff_date,))
             
-            failed_mappings = []
-            for row in cursor.fetchall():
-                row_dict = dict(row)
-                row_dict['alternatives'] = json.loads(row_dict['alternatives'] or '[]')
-                failed_mappings.append(row_dict)
+                failed_mappings = []
+                for row in cursor.fetchall():
+                    failed_mappings.append({
+                        'api_football_name': row['api_football_name'],
+                        'alternatives': row['alt_names'].split('\x1f') if row['alt_names'] else [],
+                        'league_context': row['league_context'],
+                        'failure_count': row['failure_count']
+                    })
             
-            # Recent successful mappings
-            cursor = conn.execute("""
-                SELECT api_football_name, odds_api_name, confidence, strategy_used, 
-                       attempted_at, league_context
-                FROM mapping_attempts 
-                WHERE success = 1 AND attempted_at >= ?
-                ORDER BY attempted_at DESC
-                LIMIT 10
-            """, (cutoff_date,))
+                # Recent successful mappings
+                cursor = conn.execute("""
+                    SELECT api_football_name, odds_api_name, confidence, strategy_used, 
+                           attempted_at, league_context
+                    FROM mapping_attempts 
+                    WHERE success = 1 AND attempted_at >= ?
+                    ORDER BY attempted_at DESC
+                    LIMIT 10
+                """, (cutoff_date,))
             
-            recent_successes = [dict(row) for row in cursor.fetchall()]
+                recent_successes = [dict(row) for row in cursor.fetchall()]
             
-            conn.close()
             
             report = {
                 'report_date': datetime.now().isoformat(),
@@ -741,7 +1173,7 @@ class EnhancedTeamMapper:
                 'failed_mappings': failed_mappings,
                 'recent_successes': recent_successes,
                 'learned_mappings_count': len(self.learned_mappings),
-                'manual_mappings_count': len(self.manual_mappings)
+                'manual_mappings_count': len(self.manual_mappings[ALL_LEAGUES])
             }
             
             return report
@@ -754,36 +1186,134 @@ class EnhancedTeamMapper:
                       is_correct: bool, league_context: str = None):
         """Manually verify a mapping result for learning"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            if is_correct:
-                # Add to verified mappings
-                conn.execute("""
-                    INSERT OR REPLACE INTO team_mappings 
-                    (api_football_name, odds_api_name, confidence, strategy_used, 
-                     verified, league_context)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (api_football_name, odds_api_name, 1.0, "manual_verification", 
-                      1, league_context))
+            with self._lock:
+                conn = self._connection()
                 
-                # Update learned mappings cache
-                self.learned_mappings[api_football_name] = odds_api_name
+                if is_correct:
+                    # Add to verified mappings
+                    conn.execute(_UPSERT_VERIFIED_MAPPING_SQL, (
+                        api_football_name, odds_api_name, 1.0, "manual_verification",
+                        1, league_context))
                 
-            else:
-                # Mark as incorrect to avoid future suggestions
-                conn.execute("""
-                    DELETE FROM team_mappings 
-                    WHERE api_football_name = ? AND odds_api_name = ?
-                """, (api_football_name, odds_api_name))
-            
-            conn.commit()
-            conn.close()
+                    # Update learned mappings cache
+                    self._set_learned_mapping(api_football_name, odds_api_name, league_context)
+                
+                else:
+                    # Mark as incorrect to avoid future suggestions
+                    conn.execute(_DELETE_MAPPING_SQL, (api_football_name, odds_api_name))
+                
+                conn.commit()
             
             logger.info(f"Mapping verification recorded: {api_football_name} -> {odds_api_name} ({'correct' if is_correct else 'incorrect'})")
             
         except Exception as e:
             logger.error(f"Failed to verify mapping: {e}")
 
+    def verify_mappings_bulk(self, rows: Sequence[Tuple[str, str, bool, Optional[str]]]):
+        """Verify many (api_football_name, odds_api_name, is_correct, league_context) rows in one transaction"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                # Eine Transaktion (ein WAL-Commit) für alle Zeilen; aufeinanderfolgende Zeilen
+                # gleicher Art per executemany, die Reihenfolge der Verifikationen bleibt erhalten
+                with conn:
+                    for is_correct, group in groupby(rows, key=lambda row: bool(row[2])):
+                        group = list(group)
+                        if is_correct:
+                            conn.executemany(_UPSERT_VERIFIED_MAPPING_SQL, [
+                                (api_name, odds_name, 1.0, "manual_verification", 1, league)
+                                for api_name, odds_name, _, league in group])
+                        else:
+                            conn.executemany(_DELETE_MAPPING_SQL, [
+                                (api_name, odds_name) for api_name, odds_name, _, _ in group])
+                
+                for api_name, odds_name, is_correct, league in rows:
+                    if is_correct:
+                        self._set_learned_mapping(api_name, odds_name, league)
+            
+            logger.info(f"Mapping verifications recorded: {len(rows)}")
+            
+        except Exception as e:
+            logger.error(f"Failed to verify mappings: {e}")
+
+# League -> The Odds API sport key (unveränderlich, einmal auf Modulebene)
+ODDS_SPORTS_MAP = MappingProxyType({
+    'Premier League': 'soccer_epl',
+    'La Liga': 'soccer_spain_la_liga', 
+    'Bundesliga': 'soccer_germany_bundesliga',
+    'Serie A': 'soccer_italy_serie_a',
+    'Ligue 1': 'soccer_france_ligue_one',
+    'Champions League': 'soccer_uefa_champs_league',
+    'Europa League': 'soccer_uefa_europa_league',
+    'Copa Libertadores': 'soccer_conmebol_copa_libertadores',
+    'Brasileirão Serie A': 'soccer_brazil_campeonato',
+    'Liga Profesional Argentina': 'soccer_argentina_primera_division',
+    'Eredivisie': 'soccer_netherlands_eredivisie',
+    'Primeira Liga': 'soccer_portugal_primeira_liga',
+    'Championship': 'soccer_efl_champ',
+    'MLS': 'soccer_usa_mls',
+    'Liga MX': 'soccer_mexico_ligamx'
+})
+
+# Keep-Alive-Pool: Folge-Polls sparen TCP/TLS-Handshake zu api.the-odds-api.com.
+# 429 wird bewusst nicht wiederholt (Quota), sondern wie bisher gemeldet
+_ODDS_RETRY = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                    raise_on_status=False)
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_ODDS_RETRY))
+
+ODDS_API_PARAMS = {
+    'regions': 'eu,us,au',
+    'markets': 'h2h,spreads,totals',
+    'oddsFormat': 'decimal',
+    'dateFormat': 'iso'
+}
+# Ein Odds-Abruf je Sport und Poll-Zyklus: alle Fixtures einer Liga teilen sich die Antwort
+ODDS_CACHE_TTL = 60  # Sekunden
+_odds_cache: Dict[str, Tuple[float, Dict[Tuple[str, str], dict], Tuple[str, ...]]] = {}
+_odds_cache_lock = threading.Lock()
+
+def _fetch_odds(sport: str, api_key: str) -> Tuple[int, Optional[Dict[Tuple[str, str], dict]], Tuple[str, ...]]:
+    """(status_code, games by (home, away), team names) of the odds endpoint for a sport, cached for ODDS_CACHE_TTL"""
+    with _odds_cache_lock:
+        cached = _odds_cache.get(sport)
+    if cached and time.monotonic() - cached[0] < ODDS_CACHE_TTL:
+        return 200, cached[1], cached[2]
+    
+    odds_url = f"https://api.the-odds-api.com/v4/sports/{sport}/odds/"
+    response = _HTTP.get(odds_url, params={'apiKey': api_key, **ODDS_API_PARAMS}, timeout=15)
+    if response.status_code != 200:
+        return response.status_code, None, ()
+    
+    odds_data = json_loads(response.content)
+    # Spiele einmal je Antwort nach (home, away) indexieren: O(1)-Suche je Fixture statt Scan.
+    # setdefault behält wie der frühere Scan das erste Spiel zu einer Paarung
+    games_by_pair: Dict[Tuple[str, str], dict] = {}
+    for game in odds_data:
+        games_by_pair.setdefault((game.get('home_team', ''), game.get('away_team', '')), game)
+    # Teamnamen einmal je Antwort: ein Durchlauf, ohne Duplikate, in Reihenfolge des Auftretens.
+    # Als Tupel trifft es bei allen Fixtures denselben OddsIndex-Cache-Eintrag
+    available_teams = tuple(dict.fromkeys(
+        team for game in odds_data
+        for team in (game.get('home_team'), game.get('away_team')) if team
+    ))
+    with _odds_cache_lock:
+        _odds_cache[sport] = (time.monotonic(), games_by_pair, available_teams)
+    return 200, games_by_pair, available_teams
+
+# Prozessweiter Standard-Mapper: Ergebnis-, Index- und Normalisierungs-Caches bleiben über
+# Polls, Phasen und Spiele hinweg warm (statt eines neuen Mappers je Aufruf)
+_default_mapper: Optional[EnhancedTeamMapper] = None
+_default_mapper_lock = threading.Lock()
+
+def get_default_mapper() -> EnhancedTeamMapper:
+    """Shared EnhancedTeamMapper for callers that don't manage their own"""
+    global _default_mapper
+    with _default_mapper_lock:
+        if _default_mapper is None:
+            _default_mapper = EnhancedTeamMapper()
+        return _default_mapper
+
 def collect_odds_data_enhanced(data: Dict, phase: str, mapper: EnhancedTeamMapper = None):
     """
     Enhanced version of collect_odds_data with intelligent team mapping
@@ -791,122 +1321,74 @@ def collect_odds_data_enhanced(data: Dict, phase: str, mapper: EnhancedTeamMappe
     This replaces the existing collect_odds_data function in the workflow
     """
     try:
-        import requests
-        import os
-        
         if not mapper:
-            mapper = EnhancedTeamMapper()
+            mapper = get_default_mapper()
             
         odds_api_key = os.getenv('ODDS_API_KEY')
         if not odds_api_key:
-            print("  ⚠️ No Odds API key configured")
+            logger.warning("No Odds API key configured")
             return
         
         game_info = data['game_info']
         league_name = game_info['league']
         
-        # Enhanced league mapping with more coverage
-        odds_sports_map = {
-            'Premier League': 'soccer_epl',
-            'La Liga': 'soccer_spain_la_liga', 
-            'Bundesliga': 'soccer_germany_bundesliga',
-            'Serie A': 'soccer_italy_serie_a',
-            'Ligue 1': 'soccer_france_ligue_one',
-            'Champions League': 'soccer_uefa_champs_league',
-            'Europa League': 'soccer_uefa_europa_league',
-            'Copa Libertadores': 'soccer_conmebol_copa_libertadores',
-            'Brasileirão Serie A': 'soccer_brazil_campeonato',
-            'Liga Profesional Argentina': 'soccer_argentina_primera_division',
-            'Eredivisie': 'soccer_netherlands_eredivisie',
-            'Primeira Liga': 'soccer_portugal_primeira_liga',
-            'Championship': 'soccer_efl_champ',
-            'MLS': 'soccer_usa_mls',
-            'Liga MX': 'soccer_mexico_ligamx'
-        }
-        
-        sport = odds_sports_map.get(league_name)
-        if not sport:
-            print(f"  ⚠️ No odds mapping for {league_name}")
+        sport = ODDS_SPORTS_MAP.get(league_name)
+        if sport is None:
+            logger.warning("No odds mapping for %s", league_name)
             return
         
-        odds_url = f"https://api.the-odds-api.com/v4/sports/{sport}/odds/"
-        odds_params = {
-            'apiKey': odds_api_key,
-            'regions': 'eu,us,au',
-            'markets': 'h2h,spreads,totals',
-            'oddsFormat': 'decimal',
-            'dateFormat': 'iso'
-        }
-        
-        response = requests.get(odds_url, params=odds_params, timeout=15)
-        if response.status_code == 200:
-            odds_data = response.json()
-            
-            # Extract available team names from odds API
-            available_teams = []
-            for game in odds_data:
-                if game.get('home_team'):
-                    available_teams.append(game['home_team'])
-                if game.get('away_team'):
-                    available_teams.append(game['away_team'])
-            
-            # Use enhanced mapping for home team
-            home_result = mapper.find_team_mapping(
-                game_info['home_team'],
+        status_code, games_by_pair, available_teams = _fetch_odds(sport, odds_api_key)
+        if status_code == 200:
+            # Use enhanced mapping for home and away team (one odds index for both)
+            home_result, away_result = mapper.find_team_mappings_batch(
+                [game_info['home_team'], game_info['away_team']],
                 available_teams,
                 league_context=league_name
             )
             
-            # Use enhanced mapping for away team  
-            away_result = mapper.find_team_mapping(
-                game_info['away_team'],
-                available_teams,
-                league_context=league_name
-            )
-            
-            print(f"  🎯 Home team mapping: {home_result.api_football_name} -> {home_result.odds_api_name} (confidence: {home_result.confidence:.2f}, strategy: {home_result.strategy_used})")
-            print(f"  🎯 Away team mapping: {away_result.api_football_name} -> {away_result.odds_api_name} (confidence: {away_result.confidence:.2f}, strategy: {away_result.strategy_used})")
+            # Lazy %-Formatierung: unterhalb von DEBUG wird die Meldung gar nicht erst gebaut
+            logger.debug("Home team mapping: %s -> %s (confidence: %.2f, strategy: %s)",
+                         home_result.api_football_name, home_result.odds_api_name,
+                         home_result.confidence, home_result.strategy_used)
+            logger.debug("Away team mapping: %s -> %s (confidence: %.2f, strategy: %s)",
+                         away_result.api_football_name, away_result.odds_api_name,
+                         away_result.confidence, away_result.strategy_used)
             
             # Find matching game using enhanced mappings
             matching_game = None
-            for game in odds_data:
-                game_home = game.get('home_team', '')
-                game_away = game.get('away_team', '')
-                
-                home_match = (home_result.match_found and 
-                             home_result.odds_api_name == game_home)
-                away_match = (away_result.match_found and 
-                             away_result.odds_api_name == game_away)
-                
-                if home_match and away_match:
-                    matching_game = game
-                    # Store additional mapping metadata
-                    matching_game['_mapping_metadata'] = {
-                        'home_mapping': asdict(home_result),
-                        'away_mapping': asdict(away_result)
-                    }
-                    break
+            game = None
+            if home_result.match_found and away_result.match_found:
+                game = games_by_pair.get((home_result.odds_api_name, away_result.odds_api_name))
+            
+            if game is not None:
+                # Kopie: die Antwort liegt im Odds-Cache und wird von anderen Fixtures geteilt
+                matching_game = dict(game)
+                # Store additional mapping metadata
+                matching_game['_mapping_metadata'] = {
+                    'home_mapping': home_result.as_dict(),
+                    'away_mapping': away_result.as_dict()
+                }
             
             if matching_game:
                 data['data'][f'odds_{phase}'] = matching_game
-                print(f"  ✅ Odds collected for {phase} with enhanced mapping")
+                logger.debug("Odds collected for %s with enhanced mapping", phase)
             else:
-                print(f"  ⚠️ No matching game found despite enhanced mapping attempts")
+                logger.warning("No matching game found despite enhanced mapping attempts")
                 
                 # Store mapping attempts for analysis
                 data['data'][f'mapping_attempts_{phase}'] = {
-                    'home_mapping': asdict(home_result),
-                    'away_mapping': asdict(away_result),
-                    'available_teams': available_teams[:10]  # Limit for storage
+                    'home_mapping': home_result.as_dict(),
+                    'away_mapping': away_result.as_dict(),
+                    'available_teams': list(available_teams[:10])  # Limit for storage
                 }
                 
-        elif response.status_code == 429:
-            print(f"  ⚠️ Odds API rate limited")
+        elif status_code == 429:
+            logger.warning("Odds API rate limited")
         else:
-            print(f"  ⚠️ Odds API error: {response.status_code}")
+            logger.warning("Odds API error: %s", status_code)
             
     except Exception as e:
-        print(f"  ⚠️ Enhanced odds collection error: {e}")
+        logger.warning("Enhanced odds collection error: %s", e)
 
 # CLI and testing utilities
 if __name__ == "__main__":
@@ -937,6 +1419,28 @@ if __name__ == "__main__":
         if result.alternatives:
             print(f"   🔄 Alternatives: {result.alternatives}")
     
+    # Fuzzy-Regression: rapidfuzz filtert nur vor, Treffer und Alternativen kommen immer von difflib.
+    # Mit fuzz.ratio als Scorer wurde z.B. "Spurs" fälschlich auf "PSG" gemappt.
+    fuzzy_regressions = [
+        ("Spurs", ["PSG", "Stuttgart", "Wolfsburg"], False, ["Wolfsburg"]),
+        ("SL Benfica", ["Valencia", "Real Betis", "Sevilla", "Nice", "Leicester"],
+         True, ["Real Betis", "Nice", "Leicester"]),
+        ("Bayern München", ["Bayern Munich", "Bayer Leverkusen", "Barcelona", "B. Monchengladbach"],
+         True, ["Bayer Leverkusen", "B. Monchengladbach"]),
+    ]
+    
+    print("\n🧪 Fuzzy Matching Regressions")
+    print("=" * 50)
+    failed = 0
+    for api_name, odds_teams, match_found, alternatives in fuzzy_regressions:
+        result = mapper.find_team_mapping(api_name, odds_teams, "Test League")
+        ok = result.match_found == match_found and result.alternatives == alternatives
+        failed += not ok
+        print(f"   {'✅' if ok else '❌'} {api_name}: {result.odds_api_name} "
+              f"({result.confidence:.3f}), alternatives {result.alternatives}")
+    if failed:
+        raise SystemExit(f"{failed} fuzzy matching regression(s) failed")
+    
     # Generate and display mapping report
     print("\n📋 Mapping Performance Report")
     print("=" * 50)
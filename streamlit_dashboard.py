@@ -6,15 +6,43 @@ Visualisierung für Teams, Spieler, Statistiken und Spiele
 import streamlit as st
 import pandas as pd
 import sqlite3
+import threading
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import timedelta
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+# Eine langlebige Verbindung je Dashboard statt connect/close je Abfrage
+# (wie SQLITE_PRAGMAS in database_integration)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -64000,       # 64 MB
+    'mmap_size': 268435456,     # 256 MB
+}
+
+DATABASE_PATH = 'data/football_data.db'
+# Gültigkeit der gecachten Liga-/Team-Listen (Sekunden)
+QUERY_CACHE_TTL = 300
+# Overview-Kacheln und Verläufe: die Daten werden ohnehin nur alle 30 Minuten gesammelt
+COLLECTION_CACHE_TTL = 1800
+# Spiele je Seite im Live-Games-Tab (jedes Spiel ist ein Expander mit Metriken)
+LIVE_GAMES_PAGE_SIZE = 20
+# Team-Performance-Panels (Spalte -> Titel) und ihre Linienfarben
+PERFORMANCE_PANELS = {
+    'win_percentage': 'Win Percentage',
+    'goals_for': 'Goals Scored',
+    'goals_against': 'Goals Conceded',
+    'matches_played': 'Matches Played',
+}
+PERFORMANCE_PANEL_COLORS = ['green', 'blue', 'red', 'purple']
+# Punkte je Quotenverlauf im Chart (LTTB-Downsampling darüber, Form der Kurve bleibt erhalten)
+ODDS_CHART_MAX_POINTS = 500
+
 # Page config
 st.set_page_config(
     page_title="⚽ Football Analytics Dashboard",
@@ -27,55 +55,181 @@ class FootballDashboard:
     def __init__(self, database_path: str):
         self.database_path = database_path
         self.conn = None
+        # st.cache_resource teilt die Instanz (und die Verbindung) über alle Sessions/Threads
+        self._lock = threading.Lock()
         self.connect_db()
     
     def connect_db(self):
         """Connect to database"""
         try:
-            self.conn = sqlite3.connect(self.database_path)
-            self.conn.row_factory = sqlite3.Row
+            conn = sqlite3.connect(self.database_path, check_same_thread=False,
+                                   isolation_level=None, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(''.join(f"PRAGMA {name}={value};" for name, value in SQLITE_PRAGMAS.items()))
+            # Kein DDL: Tabellen, Indizes und Statistiken legt der Schema-Schritt an (database_schema.sql)
+            self.conn = conn
         except Exception as e:
             st.error(f"Database connection failed: {e}")
     
     def execute_query(self, query, params: tuple = None) -> pd.DataFrame:
-        with sqlite3.connect(self.database_path) as conn:
-            conn.row_factory = sqlite3.Row
-            return pd.read_sql_query(query, conn, params=params)
-    
-    def get_leagues(self) -> pd.DataFrame:
-        """Get available leagues"""
-        return self.execute_query("""
-            SELECT DISTINCT l.id, l.name, l.country, l.season,
-                   COUNT(DISTINCT f.id) as total_games
-            FROM leagues l
-            LEFT JOIN fixtures f ON l.id = f.league_id
-            GROUP BY l.id, l.name, l.country, l.season
-            ORDER BY total_games DESC
-        """)
+        with self._lock:
+            if self.conn is None:
+                self.connect_db()
+            return pd.read_sql_query(query, self.conn, params=params)
     
-    def get_teams(self, league_id: Optional[int] = None) -> pd.DataFrame:
-        """Get teams, optionally filtered by league"""
+    def fetch_one(self, query, params: tuple = ()) -> Optional[sqlite3.Row]:
+        """Single row without DataFrame construction (KPIs, latest stats, next game)"""
+        with self._lock:
+            if self.conn is None:
+                self.connect_db()
+            return self.conn.execute(query, params).fetchone()
+
+# Initialize dashboard
+@st.cache_resource
+def init_dashboard(database_path: str = DATABASE_PATH):
+    return FootballDashboard(database_path)
+
+# Jede Widget-Änderung löst einen kompletten Rerun aus: Liga-/Team-Listen je Filter memoisieren
+@st.cache_data(ttl=QUERY_CACHE_TTL, show_spinner=False)
+def get_leagues(database_path: str) -> pd.DataFrame:
+    """Get available leagues"""
+    return init_dashboard(database_path).execute_query("""
+        SELECT DISTINCT l.id, l.name, l.country, l.season,
+               COUNT(DISTINCT f.id) as total_games
+        FROM leagues l
+        LEFT JOIN fixtures f ON l.id = f.league_id
+        GROUP BY l.id, l.name, l.country, l.season
+        ORDER BY total_games DESC
+    """)
+
+@st.cache_data(ttl=QUERY_CACHE_TTL, show_spinner=False)
+def get_teams(database_path: str, league_id: Optional[int] = None) -> pd.DataFrame:
+    """Get teams, optionally filtered by league"""
+    dashboard = init_dashboard(database_path)
+    # (Team, Liga)-Paare als UNION zweier Selects statt JOIN ... ON (home OR away):
+    # das OR verhindert die Nutzung der home_team_id-/away_team_id-/league_id-Indizes
+    if league_id:
         query = """
             SELECT DISTINCT t.*, l.name as league_name
-            FROM teams t
-            LEFT JOIN fixtures f ON (t.id = f.home_team_id OR t.id = f.away_team_id)
-            LEFT JOIN leagues l ON f.league_id = l.id
+            FROM (
+                SELECT home_team_id AS team_id, league_id FROM fixtures WHERE league_id = ?
+                UNION
+                SELECT away_team_id, league_id FROM fixtures WHERE league_id = ?
+            ) f
+            JOIN teams t ON t.id = f.team_id
+            JOIN leagues l ON l.id = f.league_id
+            ORDER BY t.name
         """
-        params = None
-        
-        if league_id:
-            query += " WHERE l.id = ?"
-            params = (league_id,)
-        
-        query += " ORDER BY t.name"
-        return self.execute_query(query, params)
+        return dashboard.execute_query(query, (league_id, league_id))
+    
+    query = """
+        SELECT DISTINCT t.*, l.name as league_name
+        FROM teams t
+        LEFT JOIN (
+            SELECT home_team_id AS team_id, league_id FROM fixtures
+            UNION
+            SELECT away_team_id, league_id FROM fixtures
+        ) f ON t.id = f.team_id
+        LEFT JOIN leagues l ON f.league_id = l.id
+        ORDER BY t.name
+    """
+    return dashboard.execute_query(query)
 
-# Initialize dashboard
-@st.cache_resource
-def init_dashboard():
-    return FootballDashboard('data/football_data.db')
+@st.cache_data(ttl=COLLECTION_CACHE_TTL, show_spinner=False)
+def get_overview_kpis(database_path: str) -> Dict[str, int]:
+    """Overview KPI counts in one round trip"""
+    # Die Verbindung ist per Lock serialisiert, parallele Einzelabfragen würden nur
+    # nacheinander warten; ohne DataFrame für eine Zeile
+    row = init_dashboard(database_path).fetch_one("""
+        SELECT (SELECT COUNT(*) FROM fixtures) as total_games,
+               (SELECT COUNT(DISTINCT league_id) FROM fixtures) as active_leagues,
+               (SELECT COUNT(*) FROM odds_history) as total_odds,
+               (SELECT COUNT(*) FROM team_events
+                WHERE detected_at >= datetime('now', '-7 days')) as recent_events
+    """)
+    # dict statt sqlite3.Row: st.cache_data muss das Ergebnis pickeln
+    return dict(row)
+
+@st.cache_data(ttl=COLLECTION_CACHE_TTL, show_spinner=False)
+def get_overview_charts(database_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(collection_trends, league_activity) of the last 30 days"""
+    dashboard = init_dashboard(database_path)
+    # odds_history speichert nur geänderte Quoten (mind. eine Zeile je Phase), records zählt also
+    # Änderungen je Phase und nicht mehr jeden einzelnen Collection-Lauf
+    collection_trends = dashboard.execute_query("""
+        SELECT DATE(collected_at) as date, 
+               collection_phase,
+               COUNT(*) as records
+        FROM odds_history 
+        WHERE collected_at >= datetime('now', '-30 days')
+        GROUP BY DATE(collected_at), collection_phase
+        ORDER BY date DESC
+    """)
+    league_activity = dashboard.execute_query("""
+        SELECT l.name, l.country, COUNT(f.id) as games
+        FROM leagues l
+        LEFT JOIN fixtures f ON l.id = f.league_id
+        WHERE f.kickoff_utc >= datetime('now', '-30 days')
+        GROUP BY l.id, l.name, l.country
+        ORDER BY games DESC
+        LIMIT 10
+    """)
+    return collection_trends, league_activity
+
+@st.cache_data(ttl=COLLECTION_CACHE_TTL, show_spinner=False)
+def get_odds_history(database_path: str, fixture_id: int) -> pd.DataFrame:
+    """h2h odds history of a fixture, collected_at parsed"""
+    odds_history = init_dashboard(database_path).execute_query("""
+        SELECT collected_at, home_odds, draw_odds, away_odds, 
+               bookmaker, collection_phase
+        FROM odds_history 
+        WHERE fixture_id = ? AND market_type = 'h2h'
+        ORDER BY collected_at
+    """, (fixture_id,))
+    # Explizit parsen: unlesbare Zeitstempel sollen auffallen statt still zu NaT zu werden
+    odds_history['collected_at'] = pd.to_datetime(odds_history['collected_at'], format='ISO8601', utc=True)
+    return odds_history
 
-dashboard = init_dashboard()
+@st.cache_data(ttl=COLLECTION_CACHE_TTL, show_spinner=False)
+def get_performance_history(database_path: str, team_id: int) -> pd.DataFrame:
+    """Team statistics over time, collection_date parsed"""
+    performance_history = init_dashboard(database_path).execute_query("""
+        SELECT collection_date, win_percentage, goals_for, goals_against, matches_played
+        FROM team_statistics 
+        WHERE team_id = ?
+        ORDER BY collection_date
+    """, (team_id,))
+    performance_history['collection_date'] = pd.to_datetime(performance_history['collection_date'],
+                                                            format='ISO8601')
+    return performance_history
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the Largest-Triangle-Three-Buckets downsample of (x, y) to n_out points"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # Erster und letzter Punkt bleiben, dazwischen n_out - 2 gleich große Buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Dritter Dreieckspunkt: Mittel des nächsten Buckets (bzw. der letzte Punkt)
+        if bucket == n_out - 3:
+            next_x, next_y = x[n - 1], y[n - 1]
+        else:
+            next_end = edges[bucket + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        
+        area = np.abs((x[selected] - next_x) * (y[start:end] - y[selected]) -
+                      (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+dashboard = init_dashboard(DATABASE_PATH)
 
 # =============================================================================
 # SIDEBAR - Navigation & Filters
@@ -94,7 +248,7 @@ page = st.sidebar.selectbox(
 st.sidebar.markdown("---")
 
 # Global filters
-leagues_df = dashboard.get_leagues()
+leagues_df = get_leagues(DATABASE_PATH)
 selected_league = st.sidebar.selectbox(
     "🏆 Select League",
     options=[None] + leagues_df['name'].tolist(),
@@ -103,7 +257,8 @@ selected_league = st.sidebar.selectbox(
 
 league_id = None
 if selected_league:
-    league_id = leagues_df[leagues_df['name'] == selected_league]['id'].iloc[0]
+    # int() statt numpy.int64: hashbar für st.cache_data und bindbar für sqlite3
+    league_id = int(leagues_df[leagues_df['name'] == selected_league]['id'].iloc[0])
 
 # Time range filter
 time_range = st.sidebar.selectbox(
@@ -124,43 +279,29 @@ if page == "🏠 Overview":
     # Key metrics row
     col1, col2, col3, col4 = st.columns(4)
     
+    metrics = get_overview_kpis(DATABASE_PATH)
+    
     # Total games
-    total_games = dashboard.execute_query("SELECT COUNT(*) as count FROM fixtures").iloc[0]['count']
-    col1.metric("🎯 Total Games", f"{total_games:,}")
+    col1.metric("🎯 Total Games", f"{metrics['total_games']:,}")
     
     # Active leagues
-    active_leagues = dashboard.execute_query("SELECT COUNT(DISTINCT league_id) as count FROM fixtures").iloc[0]['count']
-    col2.metric("🏆 Active Leagues", f"{active_leagues}")
+    col2.metric("🏆 Active Leagues", f"{metrics['active_leagues']}")
     
     # Total odds records
-    total_odds = dashboard.execute_query("SELECT COUNT(*) as count FROM odds_history").iloc[0]['count']
-    col3.metric("📊 Odds Records", f"{total_odds:,}")
+    col3.metric("📊 Odds Records", f"{metrics['total_odds']:,}")
     
     # Recent events
-    recent_events = dashboard.execute_query("""
-        SELECT COUNT(*) as count FROM team_events 
-        WHERE detected_at >= datetime('now', '-7 days')
-    """).iloc[0]['count']
-    col4.metric("🚨 Recent Events", f"{recent_events}")
+    col4.metric("🚨 Recent Events", f"{metrics['recent_events']}")
     
     st.markdown("---")
     
     # Charts row
+    collection_trends, league_activity = get_overview_charts(DATABASE_PATH)
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📈 Data Collection Trends")
         
-        collection_trends = dashboard.execute_query("""
-            SELECT DATE(collected_at) as date, 
-                   collection_phase,
-                   COUNT(*) as records
-            FROM odds_history 
-            WHERE collected_at >= datetime('now', '-30 days')
-            GROUP BY DATE(collected_at), collection_phase
-            ORDER BY date DESC
-        """)
-        
         if not collection_trends.empty:
             fig = px.bar(collection_trends, x='date', y='records', 
                         color='collection_phase',
@@ -173,16 +314,6 @@ if page == "🏠 Overview":
     with col2:
         st.subheader("🏆 League Activity")
         
-        league_activity = dashboard.execute_query("""
-            SELECT l.name, l.country, COUNT(f.id) as games
-            FROM leagues l
-            LEFT JOIN fixtures f ON l.id = f.league_id
-            WHERE f.kickoff_utc >= datetime('now', '-30 days')
-            GROUP BY l.id, l.name, l.country
-            ORDER BY games DESC
-            LIMIT 10
-        """)
-        
         if not league_activity.empty:
             fig = px.pie(league_activity, values='games', names='name',
                         title="Games by League (Last 30 Days)")
@@ -198,19 +329,55 @@ elif page == "🎯 Live Games":
     tab1, tab2, tab3 = st.tabs(["⏰ Next 24h", "📅 This Week", "🔍 Custom Range"])
     
     with tab1:
+        # Seitenweise: höchstens LIVE_GAMES_PAGE_SIZE Expander je Rerun
+        page_index = st.session_state.setdefault('live_games_page', 0)
+        page_offset = page_index * LIVE_GAMES_PAGE_SIZE
+        
+        # Ein Query statt drei je Spiel (N+1): letzte Team-Statistik aus team_latest_stats,
+        # letzte h2h-Quote per ROW_NUMBER = 1, beschränkt auf die Spiele der aktuellen Seite.
+        # COUNT(*) OVER () wird vor LIMIT ausgewertet und liefert die Gesamtzahl
         upcoming_games = dashboard.execute_query("""
-            SELECT f.*, ht.name as home_team, at.name as away_team, l.name as league,
-                   (julianday(f.kickoff_utc) - julianday('now')) * 24 as hours_until
-            FROM fixtures f
-            JOIN teams ht ON f.home_team_id = ht.id
-            JOIN teams at ON f.away_team_id = at.id  
-            JOIN leagues l ON f.league_id = l.id
-            WHERE f.kickoff_utc BETWEEN datetime('now') AND datetime('now', '+24 hours')
-            AND f.status = 'scheduled'
-            ORDER BY f.kickoff_utc
-        """)
+            WITH upcoming AS (
+                SELECT f.id, f.kickoff_utc, f.home_team_id, f.away_team_id,
+                       ht.name as home_team, at.name as away_team, l.name as league,
+                       (julianday(f.kickoff_utc) - julianday('now')) * 24 as hours_until,
+                       COUNT(*) OVER () as total_games
+                FROM fixtures f
+                JOIN teams ht ON f.home_team_id = ht.id
+                JOIN teams at ON f.away_team_id = at.id  
+                JOIN leagues l ON f.league_id = l.id
+                WHERE f.kickoff_utc BETWEEN datetime('now') AND datetime('now', '+24 hours')
+                AND f.status = 'scheduled'
+                ORDER BY f.kickoff_utc
+                LIMIT ? OFFSET ?
+            ),
+            latest_odds AS (
+                SELECT fixture_id, home_odds, draw_odds, away_odds, bookmaker,
+                       ROW_NUMBER() OVER (PARTITION BY fixture_id ORDER BY collected_at DESC) as rn
+                FROM odds_history
+                WHERE market_type = 'h2h' AND fixture_id IN (SELECT id FROM upcoming)
+            )
+            SELECT u.*,
+                   hs.team_id as home_stats_team_id, hs.win_percentage as home_win_percentage,
+                   hs.goals_for || '-' || hs.goals_against as home_goals,
+                   aws.team_id as away_stats_team_id, aws.win_percentage as away_win_percentage,
+                   aws.goals_for || '-' || aws.goals_against as away_goals,
+                   lo.home_odds, lo.draw_odds, lo.away_odds, lo.bookmaker
+            FROM upcoming u
+            LEFT JOIN team_latest_stats hs ON hs.team_id = u.home_team_id
+            LEFT JOIN team_latest_stats aws ON aws.team_id = u.away_team_id
+            LEFT JOIN latest_odds lo ON lo.fixture_id = u.id AND lo.rn = 1
+            ORDER BY u.kickoff_utc
+        """, (LIVE_GAMES_PAGE_SIZE, page_offset))
+        
+        if upcoming_games.empty and page_index > 0:
+            # Seite existiert nicht mehr (Spiele haben inzwischen begonnen): zurück zur ersten
+            st.session_state['live_games_page'] = 0
+            st.rerun()
         
         if not upcoming_games.empty:
+            # Anstoßzeiten einmal vektorisiert parsen statt fromisoformat je Spiel
+            upcoming_games['kickoff_dt'] = pd.to_datetime(upcoming_games['kickoff_utc'], format='ISO8601', utc=True)
             for _, game in upcoming_games.iterrows():
                 with st.expander(f"🏆 {game['league']}: {game['home_team']} vs {game['away_team']}", expanded=True):
                     
@@ -218,22 +385,14 @@ elif page == "🎯 Live Games":
                     
                     with col1:
                         st.markdown(f"**🏠 {game['home_team']}**")
-                        # Get latest home team stats
-                        home_stats = dashboard.execute_query("""
-                            SELECT win_percentage, goals_for, goals_against, matches_played
-                            FROM team_statistics 
-                            WHERE team_id = ?
-                            ORDER BY collection_date DESC LIMIT 1
-                        """, (game['home_team_id'],))
-                        
-                        if not home_stats.empty:
-                            stats = home_stats.iloc[0]
-                            st.metric("Win Rate", f"{stats['win_percentage']:.1f}%")
-                            st.metric("Goals", f"{stats['goals_for']}-{stats['goals_against']}")
+                        # Latest home team stats
+                        if pd.notna(game['home_stats_team_id']):
+                            st.metric("Win Rate", f"{game['home_win_percentage']:.1f}%")
+                            st.metric("Goals", game['home_goals'])
                     
                     with col2:
                         st.markdown("**⚽ VS ⚽**")
-                        kickoff_time = datetime.fromisoformat(game['kickoff_utc'].replace(' ', 'T'))
+                        kickoff_time = game['kickoff_dt']
                         st.markdown(f"**⏰ {kickoff_time.strftime('%H:%M')}**")
                         st.markdown(f"📅 {kickoff_time.strftime('%d.%m.%Y')}")
                         
@@ -245,35 +404,31 @@ elif page == "🎯 Live Games":
                     
                     with col3:
                         st.markdown(f"**✈️ {game['away_team']}**")
-                        # Get latest away team stats
-                        away_stats = dashboard.execute_query("""
-                            SELECT win_percentage, goals_for, goals_against, matches_played
-                            FROM team_statistics 
-                            WHERE team_id = ?
-                            ORDER BY collection_date DESC LIMIT 1
-                        """, (game['away_team_id'],))
-                        
-                        if not away_stats.empty:
-                            stats = away_stats.iloc[0]
-                            st.metric("Win Rate", f"{stats['win_percentage']:.1f}%")
-                            st.metric("Goals", f"{stats['goals_for']}-{stats['goals_against']}")
-                    
-                    # Latest odds
-                    latest_odds = dashboard.execute_query("""
-                        SELECT home_odds, draw_odds, away_odds, bookmaker, collected_at
-                        FROM odds_history 
-                        WHERE fixture_id = ? AND market_type = 'h2h'
-                        ORDER BY collected_at DESC LIMIT 1
-                    """, (game['id'],))
+                        # Latest away team stats
+                        if pd.notna(game['away_stats_team_id']):
+                            st.metric("Win Rate", f"{game['away_win_percentage']:.1f}%")
+                            st.metric("Goals", game['away_goals'])
                     
-                    if not latest_odds.empty:
-                        odds = latest_odds.iloc[0]
+                    # Latest odds (bookmaker ist NOT NULL: gesetzt genau dann, wenn es eine Quote gibt)
+                    if pd.notna(game['bookmaker']):
                         st.markdown("**🎲 Latest Odds**")
                         odds_col1, odds_col2, odds_col3, odds_col4 = st.columns(4)
-                        odds_col1.metric("🏠 Home", f"{odds['home_odds']:.2f}")
-                        odds_col2.metric("🤝 Draw", f"{odds['draw_odds']:.2f}")
-                        odds_col3.metric("✈️ Away", f"{odds['away_odds']:.2f}")
-                        odds_col4.markdown(f"*{odds['bookmaker']}*")
+                        odds_col1.metric("🏠 Home", f"{game['home_odds']:.2f}")
+                        odds_col2.metric("🤝 Draw", f"{game['draw_odds']:.2f}")
+                        odds_col3.metric("✈️ Away", f"{game['away_odds']:.2f}")
+                        odds_col4.markdown(f"*{game['bookmaker']}*")
+            
+            total_games = int(upcoming_games['total_games'].iloc[0])
+            if total_games > LIVE_GAMES_PAGE_SIZE:
+                shown_until = page_offset + len(upcoming_games)
+                prev_col, info_col, next_col = st.columns([1, 2, 1])
+                if prev_col.button("⬅️ Previous", disabled=page_index == 0):
+                    st.session_state['live_games_page'] = page_index - 1
+                    st.rerun()
+                info_col.caption(f"Games {page_offset + 1}-{shown_until} of {total_games}")
+                if next_col.button("Next ➡️", disabled=shown_until >= total_games):
+                    st.session_state['live_games_page'] = page_index + 1
+                    st.rerun()
         else:
             st.info("No games in the next 24 hours")
 
@@ -281,18 +436,18 @@ elif page == "📈 Odds Analysis":
     st.title("📈 Odds Movement Analysis")
     
     # Team selector for odds analysis
-    teams_df = dashboard.get_teams(league_id)
+    teams_df = get_teams(DATABASE_PATH, league_id)
     selected_team = st.selectbox(
         "🏆 Select Team for Odds Analysis",
         options=teams_df['name'].tolist() if not teams_df.empty else []
     )
     
     if selected_team and not teams_df.empty:
-        team_id = teams_df[teams_df['name'] == selected_team]['id'].iloc[0]
+        team_id = int(teams_df[teams_df['name'] == selected_team]['id'].iloc[0])
         
         # Get team's next game with odds data
-        next_game = dashboard.execute_query("""
-            SELECT f.*, ht.name as home_team, at.name as away_team, l.name as league
+        game = dashboard.fetch_one("""
+            SELECT f.id, f.kickoff_utc, ht.name as home_team, at.name as away_team, l.name as league
             FROM fixtures f
             JOIN teams ht ON f.home_team_id = ht.id
             JOIN teams at ON f.away_team_id = at.id
@@ -303,46 +458,35 @@ elif page == "📈 Odds Analysis":
             ORDER BY f.kickoff_utc LIMIT 1
         """, (team_id, team_id))
         
-        if not next_game.empty:
-            game = next_game.iloc[0]
+        if game is not None:
             st.subheader(f"🎯 {game['home_team']} vs {game['away_team']}")
             st.caption(f"📅 {game['kickoff_utc']} • 🏆 {game['league']}")
             
             # Odds history
-            odds_history = dashboard.execute_query("""
-                SELECT collected_at, home_odds, draw_odds, away_odds, 
-                       bookmaker, collection_phase
-                FROM odds_history 
-                WHERE fixture_id = ? AND market_type = 'h2h'
-                ORDER BY collected_at
-            """, (game['id'],))
+            odds_history = get_odds_history(DATABASE_PATH, game['id'])
             
             if not odds_history.empty:
-                # Convert to datetime
-                odds_history['collected_at'] = pd.to_datetime(odds_history['collected_at'])
-                
                 # Odds movement chart
                 fig = go.Figure()
                 
-                # Group by bookmaker for cleaner visualization
-                for bookmaker in odds_history['bookmaker'].unique():
-                    bm_data = odds_history[odds_history['bookmaker'] == bookmaker]
+                # Group by bookmaker for cleaner visualization (WebGL-Traces, lange Verläufe per
+                # LTTB auf ODDS_CHART_MAX_POINTS reduziert)
+                for bookmaker, bm_data in odds_history.groupby('bookmaker', sort=False):
+                    times = bm_data['collected_at']
+                    # astype auf der Series: to_numpy() liefert bei tz-aware Spalten Timestamp-Objekte
+                    x_ns = times.astype('int64').to_numpy(dtype=float)
                     
-                    fig.add_trace(go.Scatter(
-                        x=bm_data['collected_at'],
-                        y=bm_data['home_odds'],
-                        name=f"{game['home_team']} ({bookmaker})",
-                        line=dict(width=2),
-                        mode='lines+markers'
-                    ))
-                    
-                    fig.add_trace(go.Scatter(
-                        x=bm_data['collected_at'],
-                        y=bm_data['away_odds'],
-                        name=f"{game['away_team']} ({bookmaker})",
-                        line=dict(width=2, dash='dash'),
-                        mode='lines+markers'
-                    ))
+                    for column, team, dash in (('home_odds', game['home_team'], None),
+                                               ('away_odds', game['away_team'], 'dash')):
+                        values = bm_data[column].to_numpy(dtype=float)
+                        keep = lttb_indices(x_ns, values, ODDS_CHART_MAX_POINTS)
+                        fig.add_trace(go.Scattergl(
+                            x=times.iloc[keep],
+                            y=values[keep],
+                            name=f"{team} ({bookmaker})",
+                            line=dict(width=2, dash=dash),
+                            mode='lines+markers'
+                        ))
                 
                 fig.update_layout(
                     title="📊 Odds Movement Over Time",
@@ -356,7 +500,7 @@ elif page == "📈 Odds Analysis":
                 
                 # Odds summary table
                 st.subheader("📋 Current Odds Summary")
-                latest_odds = odds_history.sort_values('collected_at').groupby('bookmaker').tail(1)
+                latest_odds = odds_history.sort_values('collected_at').drop_duplicates('bookmaker', keep='last')
                 
                 summary_df = latest_odds[['bookmaker', 'home_odds', 'draw_odds', 'away_odds', 'collection_phase']].copy()
                 summary_df.columns = ['Bookmaker', game['home_team'], 'Draw', game['away_team'], 'Data Phase']
@@ -366,32 +510,32 @@ elif page == "📈 Odds Analysis":
                 # Odds movement alerts
                 st.subheader("🚨 Significant Movements")
                 
-                # Calculate percentage changes
-                for bookmaker in odds_history['bookmaker'].unique():
-                    bm_data = odds_history[odds_history['bookmaker'] == bookmaker].sort_values('collected_at')
-                    if len(bm_data) >= 2:
-                        first_home = bm_data.iloc[0]['home_odds']
-                        last_home = bm_data.iloc[-1]['home_odds']
-                        first_away = bm_data.iloc[0]['away_odds']
-                        last_away = bm_data.iloc[-1]['away_odds']
-                        
-                        home_change = ((last_home - first_home) / first_home) * 100 if first_home else 0
-                        away_change = ((last_away - first_away) / first_away) * 100 if first_away else 0
-                        
-                        if abs(home_change) > 5 or abs(away_change) > 5:
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.metric(
-                                    f"{game['home_team']} ({bookmaker})",
-                                    f"{last_home:.2f}",
-                                    f"{home_change:+.1f}%"
-                                )
-                            with col2:
-                                st.metric(
-                                    f"{game['away_team']} ({bookmaker})",
-                                    f"{last_away:.2f}", 
-                                    f"{away_change:+.1f}%"
-                                )
+                # Calculate percentage changes: erste/letzte Quote je Bookmaker vektorisiert
+                # (odds_history ist per SQL nach collected_at sortiert)
+                odds_columns = ['home_odds', 'away_odds']
+                first = (odds_history.drop_duplicates('bookmaker', keep='first')
+                         .set_index('bookmaker')[odds_columns])
+                last = (odds_history.drop_duplicates('bookmaker', keep='last')
+                        .set_index('bookmaker')[odds_columns].reindex(first.index))
+                change = ((last - first) / first * 100).where(first != 0, 0)
+                
+                counts = odds_history['bookmaker'].value_counts()
+                significant = (counts.reindex(first.index) >= 2) & (change.abs() > 5).any(axis=1)
+                
+                for bookmaker in first.index[significant]:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric(
+                            f"{game['home_team']} ({bookmaker})",
+                            f"{last.at[bookmaker, 'home_odds']:.2f}",
+                            f"{change.at[bookmaker, 'home_odds']:+.1f}%"
+                        )
+                    with col2:
+                        st.metric(
+                            f"{game['away_team']} ({bookmaker})",
+                            f"{last.at[bookmaker, 'away_odds']:.2f}", 
+                            f"{change.at[bookmaker, 'away_odds']:+.1f}%"
+                        )
             else:
                 st.info("No odds data available for this game")
         else:
@@ -400,7 +544,7 @@ elif page == "📈 Odds Analysis":
 elif page == "⚽ Team Analysis":
     st.title("⚽ Team Performance Analysis")
     
-    teams_df = dashboard.get_teams(league_id)
+    teams_df = get_teams(DATABASE_PATH, league_id)
     if teams_df.empty:
         st.error("No teams found")
         st.stop()
@@ -411,20 +555,19 @@ elif page == "⚽ Team Analysis":
     )
     
     if selected_team:
-        team_id = teams_df[teams_df['name'] == selected_team]['id'].iloc[0]
+        team_id = int(teams_df[teams_df['name'] == selected_team]['id'].iloc[0])
         
         # Team overview
         col1, col2, col3 = st.columns(3)
         
         # Latest statistics
-        latest_stats = dashboard.execute_query("""
-            SELECT * FROM team_statistics 
+        stats = dashboard.fetch_one("""
+            SELECT win_percentage, goals_for, goals_against, matches_played
+            FROM team_latest_stats 
             WHERE team_id = ?
-            ORDER BY collection_date DESC LIMIT 1
         """, (team_id,))
         
-        if not latest_stats.empty:
-            stats = latest_stats.iloc[0]
+        if stats is not None:
             
             with col1:
                 st.metric("🏆 Win Rate", f"{stats['win_percentage']:.1f}%")
@@ -443,50 +586,26 @@ elif page == "⚽ Team Analysis":
         # Performance over time
         st.subheader("📈 Performance Trends")
         
-        performance_history = dashboard.execute_query("""
-            SELECT collection_date, win_percentage, goals_for, goals_against, matches_played
-            FROM team_statistics 
-            WHERE team_id = ?
-            ORDER BY collection_date
-        """, (team_id,))
+        performance_history = get_performance_history(DATABASE_PATH, team_id)
         
         if not performance_history.empty:
-            fig = make_subplots(
-                rows=2, cols=2,
-                subplot_titles=('Win Percentage', 'Goals Scored', 'Goals Conceded', 'Matches Played'),
-                specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                       [{"secondary_y": False}, {"secondary_y": False}]]
+            # Long-Format + Facetten statt vier einzeln gebauter Subplot-Traces
+            perf_long = performance_history.melt(
+                id_vars='collection_date', value_vars=list(PERFORMANCE_PANELS),
+                var_name='metric', value_name='value'
             )
+            perf_long['metric'] = perf_long['metric'].map(PERFORMANCE_PANELS)
+            panel_titles = list(PERFORMANCE_PANELS.values())
             
-            performance_history['collection_date'] = pd.to_datetime(performance_history['collection_date'])
-            
-            fig.add_trace(
-                go.Scatter(x=performance_history['collection_date'], 
-                          y=performance_history['win_percentage'],
-                          name="Win %", line=dict(color='green')),
-                row=1, col=1
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=performance_history['collection_date'], 
-                          y=performance_history['goals_for'],
-                          name="Goals For", line=dict(color='blue')),
-                row=1, col=2
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=performance_history['collection_date'], 
-                          y=performance_history['goals_against'],
-                          name="Goals Against", line=dict(color='red')),
-                row=2, col=1
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=performance_history['collection_date'], 
-                          y=performance_history['matches_played'],
-                          name="Matches", line=dict(color='purple')),
-                row=2, col=2
-            )
+            fig = px.line(perf_long, x='collection_date', y='value',
+                          color='metric', facet_col='metric', facet_col_wrap=2,
+                          category_orders={'metric': panel_titles},
+                          color_discrete_sequence=PERFORMANCE_PANEL_COLORS,
+                          render_mode='webgl')
+            # Wie bei make_subplots: eigene y-Achse je Panel, Panel-Titel ohne "metric="
+            fig.update_yaxes(matches=None, showticklabels=True, title_text=None)
+            fig.update_xaxes(title_text=None)
+            fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split('=', 1)[-1]))
             
             fig.update_layout(height=500, showlegend=False)
             st.plotly_chart(fig, use_container_width=True)
@@ -496,49 +615,52 @@ elif page == "⚽ Team Analysis":
         
         with col1:
             st.subheader("📅 Recent Results")
+            # Gegner, Icon und Ergebnis (aus Sicht des Teams) direkt in SQL, ?1 = team_id
             recent_fixtures = dashboard.execute_query("""
-                SELECT f.*, ht.name as home_team, at.name as away_team,
-                       CASE WHEN f.home_team_id = ? THEN 'home' ELSE 'away' END as venue
+                SELECT CASE WHEN f.home_team_id = ?1 THEN at.name ELSE ht.name END as opponent,
+                       CASE WHEN f.home_team_id = ?1 THEN '🏠' ELSE '✈️' END as venue_icon,
+                       CASE WHEN f.home_team_id = ?1 THEN f.home_score || '-' || f.away_score
+                            ELSE f.away_score || '-' || f.home_score END as result
                 FROM fixtures f
                 JOIN teams ht ON f.home_team_id = ht.id
                 JOIN teams at ON f.away_team_id = at.id
-                WHERE (f.home_team_id = ? OR f.away_team_id = ?)
+                WHERE (f.home_team_id = ?1 OR f.away_team_id = ?1)
                 AND f.kickoff_utc < datetime('now')
                 AND f.home_score IS NOT NULL
                 ORDER BY f.kickoff_utc DESC LIMIT 5
-            """, (team_id, team_id, team_id))
+            """, (team_id,))
             
-            for _, fixture in recent_fixtures.iterrows():
-                opponent = fixture['away_team'] if fixture['venue'] == 'home' else fixture['home_team']
-                venue_icon = "🏠" if fixture['venue'] == 'home' else "✈️"
-                
-                if fixture['venue'] == 'home':
-                    result = f"{fixture['home_score']}-{fixture['away_score']}"
-                else:
-                    result = f"{fixture['away_score']}-{fixture['home_score']}"
-                
-                st.text(f"{venue_icon} vs {opponent}: {result}")
+            # Eine Tabelle statt eines st.text-Elements je Spiel
+            if not recent_fixtures.empty:
+                st.dataframe(
+                    recent_fixtures[['venue_icon', 'opponent', 'result']].rename(
+                        columns={'venue_icon': 'Venue', 'opponent': 'Opponent', 'result': 'Result'}),
+                    use_container_width=True, hide_index=True
+                )
         
         with col2:
             st.subheader("🔮 Upcoming Games")
             upcoming_fixtures = dashboard.execute_query("""
-                SELECT f.*, ht.name as home_team, at.name as away_team,
-                       CASE WHEN f.home_team_id = ? THEN 'home' ELSE 'away' END as venue
+                SELECT f.kickoff_utc,
+                       CASE WHEN f.home_team_id = ?1 THEN at.name ELSE ht.name END as opponent,
+                       CASE WHEN f.home_team_id = ?1 THEN '🏠' ELSE '✈️' END as venue_icon
                 FROM fixtures f
                 JOIN teams ht ON f.home_team_id = ht.id
                 JOIN teams at ON f.away_team_id = at.id
-                WHERE (f.home_team_id = ? OR f.away_team_id = ?)
+                WHERE (f.home_team_id = ?1 OR f.away_team_id = ?1)
                 AND f.kickoff_utc > datetime('now')
                 ORDER BY f.kickoff_utc LIMIT 5
-            """, (team_id, team_id, team_id))
+            """, (team_id,))
             
-            for _, fixture in upcoming_fixtures.iterrows():
-                opponent = fixture['away_team'] if fixture['venue'] == 'home' else fixture['home_team']
-                venue_icon = "🏠" if fixture['venue'] == 'home' else "✈️"
-                kickoff = datetime.fromisoformat(fixture['kickoff_utc'].replace(' ', 'T'))
-                
-                st.text(f"{venue_icon} vs {opponent}")
-                st.caption(f"📅 {kickoff.strftime('%d.%m.%Y %H:%M')}")
+            if not upcoming_fixtures.empty:
+                upcoming_fixtures['kickoff'] = pd.to_datetime(
+                    upcoming_fixtures['kickoff_utc'], format='ISO8601', utc=True
+                ).dt.strftime('%d.%m.%Y %H:%M')
+                st.dataframe(
+                    upcoming_fixtures[['venue_icon', 'opponent', 'kickoff']].rename(
+                        columns={'venue_icon': 'Venue', 'opponent': 'Opponent', 'kickoff': '📅 Kickoff'}),
+                    use_container_width=True, hide_index=True
+                )
 
 elif page == "🔍 Event Impact":
     st.title("🔍 Event Impact Analysis")
@@ -548,16 +670,37 @@ elif page == "🔍 Event Impact":
     event_types = ['injury', 'suspension', 'transfer', 'lineup_change']
     selected_event_type = st.selectbox("🎯 Event Type", event_types)
     
-    # Recent events
+    # Recent events mit Quoten-Auswirkung in einem Query statt einer Odds-Abfrage je Event:
+    # Quoten der Spiele im Fenster [start_date - 3, start_date + 7] vor/nach detected_at mitteln,
+    # je Zeile die Quote des Teams (home_odds wenn Heimteam, sonst away_odds)
     recent_events = dashboard.execute_query("""
-        SELECT te.*, t.name as team_name, p.name as player_name
-        FROM team_events te
-        JOIN teams t ON te.team_id = t.id
-        LEFT JOIN players p ON te.player_id = p.id
-        WHERE te.event_type = ?
-        AND te.detected_at >= datetime('now', '-30 days')
-        ORDER BY te.detected_at DESC
-        LIMIT 20
+        WITH events AS (
+            SELECT te.id, te.team_id, te.start_date, te.end_date, te.severity, te.event_description,
+                   te.detected_at, t.name as team_name, p.name as player_name
+            FROM team_events te
+            JOIN teams t ON te.team_id = t.id
+            LEFT JOIN players p ON te.player_id = p.id
+            WHERE te.event_type = ?
+            AND te.detected_at >= datetime('now', '-30 days')
+            ORDER BY te.detected_at DESC
+            LIMIT 20
+        )
+        SELECT e.*,
+               COUNT(oh.id) as odds_rows,
+               SUM(CASE WHEN oh.collected_at < e.detected_at THEN 1 ELSE 0 END) as before_rows,
+               SUM(CASE WHEN oh.collected_at >= e.detected_at THEN 1 ELSE 0 END) as after_rows,
+               AVG(CASE WHEN oh.collected_at < e.detected_at THEN
+                   CASE WHEN f.home_team_id = e.team_id THEN oh.home_odds ELSE oh.away_odds END
+               END) as before_odds,
+               AVG(CASE WHEN oh.collected_at >= e.detected_at THEN
+                   CASE WHEN f.home_team_id = e.team_id THEN oh.home_odds ELSE oh.away_odds END
+               END) as after_odds
+        FROM events e
+        LEFT JOIN fixtures f ON (f.home_team_id = e.team_id OR f.away_team_id = e.team_id)
+            AND date(f.kickoff_utc) BETWEEN date(e.start_date, '-3 days') AND date(e.start_date, '+7 days')
+        LEFT JOIN odds_history oh ON oh.fixture_id = f.id
+        GROUP BY e.id
+        ORDER BY e.detected_at DESC
     """, (selected_event_type,))
     
     if not recent_events.empty:
@@ -579,47 +722,21 @@ elif page == "🔍 Event Impact":
                     if event['end_date']:
                         st.text(f"🔄 Expected Return: {event['end_date']}")
                 
-                # Find odds impact around this event
-                event_date = event['start_date']
-                odds_impact = dashboard.execute_query("""
-                    SELECT oh.*, f.kickoff_utc, f.home_team_id, f.away_team_id,
-                           ht.name as home_team, at.name as away_team
-                    FROM odds_history oh
-                    JOIN fixtures f ON oh.fixture_id = f.id
-                    JOIN teams ht ON f.home_team_id = ht.id
-                    JOIN teams at ON f.away_team_id = at.id
-                    WHERE (f.home_team_id = ? OR f.away_team_id = ?)
-                    AND date(f.kickoff_utc) BETWEEN date(?, '-3 days') AND date(?, '+7 days')
-                    ORDER BY oh.collected_at
-                """, (event['team_id'], event['team_id'], event_date, event_date))
-                
-                if not odds_impact.empty:
+                # Odds impact around this event
+                if event['odds_rows']:
                     st.text("📈 Odds movement around this event:")
                     
                     # Simple before/after analysis
-                    before_event = odds_impact[odds_impact['collected_at'] < event['detected_at']]
-                    after_event = odds_impact[odds_impact['collected_at'] >= event['detected_at']]
-                    
-                    if not before_event.empty and not after_event.empty:
-                        # Team's odds (home or away)
-                        is_home_team = odds_impact.iloc[0]['home_team_id'] == event['team_id']
-                        
-                        if is_home_team:
-                            before_odds = before_event['home_odds'].mean()
-                            after_odds = after_event['home_odds'].mean()
-                            team_position = "home"
-                        else:
-                            before_odds = before_event['away_odds'].mean()
-                            after_odds = after_event['away_odds'].mean()
-                            team_position = "away"
+                    before_odds = event['before_odds']
+                    after_odds = event['after_odds']
+                    if (event['before_rows'] and event['after_rows'] and
+                            pd.notna(before_odds) and pd.notna(after_odds) and before_odds and after_odds):
+                        change_pct = ((after_odds - before_odds) / before_odds) * 100
                         
-                        if before_odds and after_odds:
-                            change_pct = ((after_odds - before_odds) / before_odds) * 100
-                            
-                            impact_col1, impact_col2, impact_col3 = st.columns(3)
-                            impact_col1.metric("Before Event", f"{before_odds:.2f}")
-                            impact_col2.metric("After Event", f"{after_odds:.2f}")
-                            impact_col3.metric("Change", f"{change_pct:+.1f}%")
+                        impact_col1, impact_col2, impact_col3 = st.columns(3)
+                        impact_col1.metric("Before Event", f"{before_odds:.2f}")
+                        impact_col2.metric("After Event", f"{after_odds:.2f}")
+                        impact_col3.metric("Change", f"{change_pct:+.1f}%")
                 else:
                     st.text("No odds data available around this event")
     else:
@@ -648,6 +765,7 @@ st.sidebar.success("✅ Dashboard Ready!")
 # Add refresh button
 if st.sidebar.button("🔄 Refresh Data"):
     st.cache_resource.clear()
+    st.cache_data.clear()
     st.rerun()
 
 # =============================================================================
@@ -660,9 +778,9 @@ if __name__ == "__main__":
     
     # Show last database update
     try:
-        last_update = dashboard.execute_query("""
+        last_update = dashboard.fetch_one("""
             SELECT MAX(collected_at) as last_update FROM odds_history
-        """).iloc[0]['last_update']
+        """)['last_update']
         
         if last_update:
             st.caption(f"📅 Last data update: {last_update}")
@@ -3,6 +3,14 @@ import sqlite3
 import os
 from datetime import datetime
 
+VALIDATION_COUNTS_SQL = """
+    SELECT (SELECT COUNT(*) FROM fixtures),
+           (SELECT COUNT(*) FROM odds_history),
+           (SELECT COUNT(*) FROM teams),
+           (SELECT COUNT(*) FROM leagues),
+           (SELECT MAX(collected_at) FROM odds_history)
+"""
+
 def validate_pipeline_data():
     db_path = 'data/football_data.db'
     
@@ -16,33 +24,26 @@ def validate_pipeline_data():
     
     conn = sqlite3.connect(db_path)
     
+    # Alle Zählungen und die neuesten Daten in einer Abfrage
+    fixtures, odds, teams, leagues, latest = conn.execute(VALIDATION_COUNTS_SQL).fetchone()
+    
     # Fixtures prüfen
-    fixtures = conn.execute("SELECT COUNT(*) FROM fixtures").fetchone()[0]
     print(f"⚽ Fixtures: {fixtures}")
     
     # Odds History prüfen  
-    odds = conn.execute("SELECT COUNT(*) FROM odds_history").fetchone()[0]
     print(f"📊 Odds Records: {odds}")
     
     # Teams prüfen
-    teams = conn.execute("SELECT COUNT(*) FROM teams").fetchone()[0] 
     print(f"🏆 Teams: {teams}")
     
     # Leagues prüfen
-    leagues = conn.execute("SELECT COUNT(*) FROM leagues").fetchone()[0]
     print(f"🎯 Leagues: {leagues}")
     
     # Neueste Daten
-    try:
-        latest = conn.execute("""
-            SELECT MAX(collected_at) FROM odds_history
-        """).fetchone()[0]
-        if latest:
-            print(f"📅 Latest Data: {latest}")
-        else:
-            print("📅 Latest Data: Keine Daten gefunden")
-    except:
-        print("📅 Latest Data: Tabelle leer")
+    if latest:
+        print(f"📅 Latest Data: {latest}")
+    else:
+        print("📅 Latest Data: Keine Daten gefunden")
     
     # Top 5 upcoming games
     print("\n🎯 Next Games:")